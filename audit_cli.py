@@ -0,0 +1,350 @@
+"""
+GUI 없이 SEO Audit을 실행하는 명령줄 도구입니다. (cron, 서버 배치 실행용)
+
+사용 예:
+    python audit_cli.py --ticket SEO-123 --urls-file urls.txt --workers 8
+    cat urls.txt | python audit_cli.py --ticket SEO-123 --urls-file - --formats html,json
+    python audit_cli.py --ticket SEO-123 https://www.laneige.com/kr/ko/ https://www.hera.com/kr/ko/
+    python audit_cli.py --resume --queue audit_reports/SEO-audit_Report_SEO-123_..._250101.queue.sqlite3
+    python audit_cli.py --ticket SEO-123 --site https://www.laneige.com/kr/ko/ --per-section 20 --workers 8
+    python audit_cli.py --status --queue audit_reports/SEO-audit_Report_SEO-123_..._250101.queue.sqlite3
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from audit_history import get_audit_history
+from audit_log import AuditLog, StreamLogWriter
+from duplicate_index import DuplicateIndex, duplicate_summary
+from excel_export import write_xlsx_report
+from audit_stats import RunStats, stats_sidecar_path
+from audit_engine import AuditEngine, DEFAULT_MAX_WORKERS, DEFAULT_PER_HOST_LIMIT
+from http_client import configure_http_client, http_counters_delta, DEFAULT_MAX_RETRIES
+from image_registry import ImageRegistry, get_image_prober, image_summary
+from job_queue import JobQueue, job_queue_path
+from page_cache import DEFAULT_PAGE_CACHE_DIR
+from report_generator import LiveReportWriter, generate_html_report, live_report_dir
+from result_store import ResultStore, result_store_path
+from site_crawl import SitemapSampler, iter_site_urls, DEFAULT_SECTION_DEPTH
+from sitemap_management import load_sitemap_mapping
+from utils import build_report_filename
+
+OUTPUT_FORMATS = ("html", "json", "csv", "xlsx")
+
+
+def read_urls(urls_file, extra_urls):
+    """파일(또는 '-'이면 stdin)과 인자로 받은 URL을 합쳐, 빈 줄/주석(#)/중복을 제외하고 순서대로 반환합니다."""
+    lines = list(extra_urls)
+    if urls_file == "-":
+        lines.extend(sys.stdin.read().splitlines())
+    elif urls_file:
+        with open(urls_file, "r", encoding="utf-8") as f:
+            lines.extend(f.read().splitlines())
+
+    urls = []
+    seen = set()
+    for line in lines:
+        url = line.strip()
+        if not url or url.startswith("#") or url in seen:
+            continue
+        seen.add(url)
+        urls.append(url)
+    return urls
+
+
+def write_results_json(path, ticket_name, results, elapsed):
+    """결과를 하나씩 받아 기록합니다. (results는 ResultStore.iter_results() 같은 iterator여도 됨)"""
+    with open(path, "w", encoding="utf-8") as f:
+        header = json.dumps({"ticket": ticket_name, "elapsed_seconds": round(elapsed, 3)},
+                            ensure_ascii=False, indent=2)
+        f.write(header[:-2] + ',\n  "results": [')
+        count = 0
+        for result in results:
+            item = json.dumps({
+                "url": result["url"],
+                "error": result["error"],
+                "meta": result["meta"],
+                "alt_data": result["alt_data"],
+            }, ensure_ascii=False, indent=2, default=str)
+            f.write(("," if count else "") + "\n" + "\n".join("    " + line for line in item.splitlines()))
+            count += 1
+        f.write("\n  ]\n}" if count else "]\n}")
+
+
+def print_status(job_queue, partial_report=False):
+    """실행 중이거나 중단된 큐의 진행 상황을 출력하고, partial_report면 완료된 URL로 중간 리포트를 만듭니다."""
+    meta = job_queue.meta()
+    if not meta:
+        print(f"[ERROR] No audit in {job_queue.path}", file=sys.stderr)
+        return 2
+    counts = job_queue.counts()
+    total = sum(counts.values())
+    print(f"[INFO] {meta['ticket']}: {counts['done']} done, {counts['failed']} failed, "
+          f"{counts['running']} running, {counts['pending']} pending ({total} URLs)", file=sys.stderr)
+    for _, url, error in job_queue.failures():
+        print(f"[WARN] Failed: {url} ({error})", file=sys.stderr)
+    if partial_report:
+        if not counts["done"]:
+            print("[WARN] No completed URLs yet.", file=sys.stderr)
+            return 0
+        partial_path = os.path.splitext(meta["report_path"])[0] + ".partial.html"
+        result_store = ResultStore(result_store_path(meta["report_path"]))
+        # 중간 리포트는 비교만 하고 다음 비교 기준은 바꾸지 않음
+        run_diff = get_audit_history().compare(meta["ticket"], result_store.iter_results(), record=False)
+        duplicates = DuplicateIndex()
+        duplicates.update_from_store(result_store)
+        # 이미지 용량은 새로 요청하지 않고 실행 중에 확인해 캐시에 저장된 것만 사용
+        images = ImageRegistry(get_image_prober())
+        images.update_from_store(result_store)
+        generate_html_report(meta["ticket"], None, None, None, partial_path, result_store=result_store,
+                             run_diff=run_diff, duplicates=duplicates.clusters(), images=images.summary(probe=False))
+        result_store.close()
+        print(partial_path)
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="SEO Audit을 GUI 없이 실행합니다.")
+    parser.add_argument("urls", nargs="*", help="Audit할 URL (--urls-file과 함께 사용 가능)")
+    parser.add_argument("--ticket", help="티켓 이름 (리포트 파일명에 사용). --resume이면 큐에 기록된 값 사용")
+    parser.add_argument("--urls-file", help="한 줄에 URL 하나씩 적힌 파일. '-'이면 stdin에서 읽음")
+    parser.add_argument("--workers", type=int, default=DEFAULT_MAX_WORKERS, help="동시에 Audit할 URL 수")
+    parser.add_argument("--per-host", type=int, default=DEFAULT_PER_HOST_LIMIT, help="호스트당 최대 동시 요청 수")
+    parser.add_argument("--rate-limit", type=float, help="호스트당 초당 최대 요청 수 (기본: 제한 없음)")
+    parser.add_argument("--retries", type=int, default=DEFAULT_MAX_RETRIES, help="일시적인 오류(5xx, 429, 연결 오류) 재시도 횟수")
+    parser.add_argument("--output-dir", default="./audit_reports", help="리포트와 결과 파일을 저장할 폴더")
+    parser.add_argument("--formats", default="html,json,xlsx",
+                        help=f"생성할 결과 형식 (쉼표 구분: {', '.join(OUTPUT_FORMATS)})")
+    parser.add_argument("--compact-report", action="store_true", help="데이터 기반 경량 HTML 리포트 생성")
+    parser.add_argument("--no-page-cache", action="store_true", help="디스크 페이지 캐시를 사용하지 않음")
+    parser.add_argument("--log-file", help="실행 로그를 stderr 대신 파일에 기록")
+    parser.add_argument("--queue", help="작업 큐 파일 (기본: 리포트 옆 <리포트명>.queue.sqlite3)")
+    parser.add_argument("--resume", action="store_true",
+                        help="중단된 Audit을 큐에서 이어서 실행. 같은 큐로 여러 프로세스를 실행하면 URL을 나눠 처리함")
+    parser.add_argument("--retry-failed", action="store_true", help="--resume과 같지만 실패한 URL도 다시 실행")
+    parser.add_argument("--full-audit", action="store_true",
+                        help="내용이 바뀌지 않은 페이지도 이전 결과를 재사용하지 않고 모두 다시 분석")
+    parser.add_argument("--no-live-report", action="store_true",
+                        help="실행 중에 완료된 URL부터 볼 수 있는 <리포트명>.live/index.html을 만들지 않음 "
+                             "(같은 큐를 여러 워커가 나눠 처리할 때 추가 워커에 지정)")
+    parser.add_argument("--no-image-probe", action="store_true",
+                        help="이미지 용량/해상도/형식을 확인하지 않음 (공통 이미지를 한 번만 표시하는 것은 그대로 적용)")
+    parser.add_argument("--status", action="store_true",
+                        help="--queue의 진행 상황(완료/실패/남은 URL 수)만 출력. --partial-report와 함께 쓰면 완료된 URL로 중간 리포트 생성")
+    parser.add_argument("--partial-report", action="store_true", help="--status와 함께: <리포트명>.partial.html 생성")
+    crawl = parser.add_argument_group("사이트 전체 Audit (사이트맵의 URL 사용)")
+    crawl.add_argument("--site", help="이 URL이 속한 사이트의 사이트맵(sitemap_mapping.json 또는 robots.txt)에서 URL 목록을 가져옴")
+    crawl.add_argument("--sample-pattern", action="append", default=[],
+                       help="경로 glob 패턴에 맞는 URL만 사용 (여러 번 지정 가능, 예: '*/products/*')")
+    crawl.add_argument("--per-section", type=int, help="섹션(사이트 기준 경로 다음 첫 경로 단계)별 최대 URL 수 (무작위 샘플)")
+    crawl.add_argument("--section-depth", type=int, default=DEFAULT_SECTION_DEPTH, help="섹션을 나눌 경로 단계 수")
+    crawl.add_argument("--max-urls", type=int, help="Audit할 최대 URL 수")
+    crawl.add_argument("--sample-seed", type=int, default=0, help="섹션별 무작위 샘플의 seed (같은 값이면 같은 URL 선택)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    formats = [f.strip() for f in args.formats.split(",") if f.strip()]
+    unknown = [f for f in formats if f not in OUTPUT_FORMATS]
+    if unknown:
+        print(f"[ERROR] Unknown output format: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    if args.status:
+        if not args.queue or not os.path.exists(args.queue):
+            print("[ERROR] --status requires an existing --queue file.", file=sys.stderr)
+            return 2
+        return print_status(JobQueue(args.queue), args.partial_report)
+
+    urls = read_urls(args.urls_file, args.urls)
+    resume = args.resume or args.retry_failed
+    if args.site and (urls or resume):
+        print("[ERROR] --site cannot be combined with URLs or --resume.", file=sys.stderr)
+        return 2
+    if not urls and not args.site and not (resume and args.queue):
+        print("[ERROR] No URLs provided for audit.", file=sys.stderr)
+        return 2
+    if not args.ticket and not (resume and args.queue):
+        print("[ERROR] --ticket is required (or --queue when resuming).", file=sys.stderr)
+        return 2
+
+    http_client = configure_http_client(per_host_rate=args.rate_limit, max_retries=args.retries)
+    http_before = http_client.snapshot()
+
+    if resume:
+        queue_path = args.queue or job_queue_path(
+            os.path.join(args.output_dir, build_report_filename(args.ticket, urls[0])))
+        job_queue = JobQueue(queue_path)
+        meta = job_queue.meta()
+        if not meta:
+            print(f"[ERROR] No audit to resume in {queue_path}", file=sys.stderr)
+            return 2
+        # 큐에는 중복 URL이 한 번만 들어가므로 입력 목록도 같은 방식으로 중복을 제거해 비교
+        if urls and list(dict.fromkeys(urls)) != job_queue.urls():
+            print("[ERROR] URLs differ from the queued audit. Run without --resume to start over.", file=sys.stderr)
+            return 2
+        ticket, report_path = meta["ticket"], meta["report_path"]
+        recovered = job_queue.recover()
+        retried = job_queue.retry_failed() if args.retry_failed else 0
+        counts = job_queue.counts()
+        print(f"[INFO] Resuming {queue_path}: {counts['done']} done, {counts['failed']} failed, "
+              f"{counts['pending'] + counts['running']} remaining ({recovered} recovered, {retried} retried)",
+              file=sys.stderr)
+    else:
+        ticket = args.ticket
+        os.makedirs(args.output_dir, exist_ok=True)
+        report_path = os.path.join(args.output_dir, build_report_filename(ticket, args.site or urls[0]))
+        job_queue = JobQueue(args.queue or job_queue_path(report_path))
+    base_path = os.path.splitext(report_path)[0]
+    # URL이 끝날 때마다 결과를 파일에 기록하고 큐에 완료로 표시 (중단되면 --resume으로 남은 URL만 실행)
+    result_store = ResultStore(result_store_path(report_path))
+    if not resume:
+        result_store.clear()
+        if args.site:
+            # 사이트맵 URL을 메모리에 모으지 않고 바로 큐에 넣음 (중복은 큐에서 제거)
+            sampler = SitemapSampler(args.sample_pattern, args.per_section, args.max_urls, args.section_depth,
+                                     args.sample_seed)
+            site_log = AuditLog()
+            site_writer = StreamLogWriter(site_log, sys.stderr).start()
+            try:
+                count = job_queue.reset(iter_site_urls(args.site, load_sitemap_mapping(), site_log, sampler),
+                                        ticket=ticket, report_path=report_path)
+            finally:
+                site_writer.close()
+            if not count:
+                print(f"[ERROR] No URLs found in the sitemap for {args.site}", file=sys.stderr)
+                return 2
+            print(f"[INFO] Queued {count} URLs from the sitemap of {args.site}", file=sys.stderr)
+        else:
+            job_queue.reset(urls, ticket=ticket, report_path=report_path)
+
+    log_stream = open(args.log_file, "a", encoding="utf-8") if args.log_file else sys.stderr
+    audit_log = AuditLog()
+    stats = RunStats()
+    log_writer = StreamLogWriter(audit_log, log_stream).start()
+    try:
+        engine = AuditEngine(load_sitemap_mapping(), audit_log,
+                             max_workers=args.workers, per_host_limit=args.per_host,
+                             page_cache_dir=None if args.no_page_cache else DEFAULT_PAGE_CACHE_DIR,
+                             stats=stats, result_store=result_store,
+                             history=get_audit_history(), reuse_unchanged=not args.full_audit)
+
+        counts = job_queue.counts()
+        completed = counts["done"] + counts["failed"]
+        # 전체 URL 수는 중복이 제거된 큐 기준
+        total = sum(counts.values())
+        live_report = None
+        if not args.no_live_report and "html" in formats:
+            live_report = LiveReportWriter(ticket, live_report_dir(report_path), total)
+            if live_report.start(result_store):
+                print(f"[INFO] Live report (updates as URLs finish): {live_report.index_path}", file=sys.stderr)
+            else:
+                live_report = None
+        # 페이지 간 중복 Title/Description/H1 색인은 결과가 들어오는 대로 만듦
+        duplicates = DuplicateIndex()
+        # Audit 전체의 고유 이미지 목록. 처음 보는 이미지는 결과가 들어오는 대로 용량/해상도 확인을 시작
+        images = ImageRegistry(None if args.no_image_probe else get_image_prober())
+
+        def on_result(index, result):
+            nonlocal completed
+            completed += 1
+            if live_report is not None:
+                live_report.add(index, result)
+            duplicates.add(index, result)
+            images.add(index, result)
+            status = "FAILED" if result["error"] else "unchanged" if result.get("reused") else "done"
+            print(f"[{completed}/{total}] {status}: {result['url']}", file=sys.stderr, flush=True)
+
+        started = time.time()
+        totals = engine.run_queue(job_queue, on_result=on_result)
+        elapsed = time.time() - started
+    finally:
+        log_writer.close()
+        if args.log_file:
+            log_stream.close()
+
+    throughput = totals["audited"] / elapsed * 60 if elapsed > 0 else 0.0
+    print(f"[INFO] Audited {totals['audited']} URLs in {elapsed:.1f}s ({throughput:.1f} URLs/min), "
+          f"{totals['failed']} failed, {totals['reused']} unchanged since the last audit",
+          file=sys.stderr)
+    if not job_queue.try_finish():
+        # 다른 프로세스가 아직 URL을 처리 중이면 마지막으로 끝나는 프로세스가 리포트를 만듦
+        counts = job_queue.counts()
+        print(f"[INFO] {counts['pending'] + counts['running']} URLs are still being audited by other workers; "
+              f"the last worker writes the report.", file=sys.stderr)
+        result_store.close()
+        return 0
+
+    written = [result_store.path, job_queue.path]
+    # 같은 티켓의 이전 리포트와 이슈를 비교하고, 이번 결과를 다음 비교 기준으로 저장
+    run_diff = get_audit_history().compare(ticket, result_store.iter_results())
+    if run_diff:
+        print(f"[INFO] Compared with the previous audit of {ticket}: {run_diff['fixed']} fixed, "
+              f"{run_diff['new']} new, {run_diff['unchanged']} unchanged issues", file=sys.stderr)
+    with stats.stage("duplicate_index"):
+        # 이어서 실행했거나 다른 워커가 처리한 URL도 포함
+        duplicates.update_from_store(result_store)
+        duplicate_groups = duplicates.clusters()
+    if duplicate_groups:
+        print(f"[INFO] Duplicate content across pages: {duplicate_summary(duplicate_groups)}", file=sys.stderr)
+    with stats.stage("image_probe"):
+        images.update_from_store(result_store)
+        image_info = images.summary()
+    if image_info:
+        print(f"[INFO] Images: {image_summary(image_info)}", file=sys.stderr)
+
+    if "json" in formats:
+        write_results_json(base_path + ".json", ticket, result_store.iter_results(), elapsed)
+        written.append(base_path + ".json")
+
+    if "html" in formats or "csv" in formats or "xlsx" in formats:
+        if not result_store.count():
+            print("[ERROR] No audit results generated.", file=sys.stderr)
+        else:
+            if "csv" in formats:
+                with stats.stage("write_csv"):
+                    result_store.write_csv(base_path + "_seo.csv", base_path + "_alt.csv")
+                written.extend([base_path + "_seo.csv", base_path + "_alt.csv"])
+            if "html" in formats:
+                with stats.stage("generate_html_report"):
+                    generate_html_report(ticket, None, None, None, report_path,
+                                         compact=True if args.compact_report else None,
+                                         run_stats=stats.summary(), result_store=result_store,
+                                         run_diff=run_diff, duplicates=duplicate_groups, images=image_info)
+                written.append(report_path)
+            if "xlsx" in formats:
+                try:
+                    with stats.stage("write_xlsx"):
+                        write_xlsx_report(None, base_path + ".xlsx", result_store=result_store, images=image_info)
+                    written.append(base_path + ".xlsx")
+                except ImportError:
+                    print("[WARN] openpyxl is not installed; skipping the .xlsx export.", file=sys.stderr)
+    if live_report is not None:
+        live_report.finish(report_path if report_path in written else None)
+        written.append(live_report.index_path)
+    result_store.close()
+
+    stats.write_json(stats_sidecar_path(report_path))
+    written.append(stats_sidecar_path(report_path))
+
+    failures = job_queue.failures()
+    for _, url, error in failures:
+        print(f"[WARN] Failed: {url} ({error})", file=sys.stderr)
+    if failures:
+        print(f"[INFO] {len(failures)} of {total} URLs failed. Retry them with --retry-failed --queue {job_queue.path}",
+              file=sys.stderr)
+    http = http_counters_delta(http_before, http_client.snapshot())
+    print(f"[INFO] HTTP: {http['requests']} requests, {http['bytes'] / (1024 * 1024):.1f} MB, "
+          f"{http['retries']} retries, {http['throttled_seconds']:.1f}s waiting for rate limits", file=sys.stderr)
+    for path in written:
+        print(path)
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
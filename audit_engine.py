@@ -0,0 +1,218 @@
+import queue
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from audit_history import page_fingerprint
+from audit_log import AuditLog, log_event
+from audit_stats import activate_run_stats, stage
+from link_checker import check_page_links
+from page_cache import DEFAULT_MAX_DOCUMENTS, PageCache, activate_page_cache
+from seo_core import generate_metadata
+from utils import collect_alt_texts
+
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_PER_HOST_LIMIT = 2
+
+
+def audit_single_url(url, sitemap_mapping, log_output):
+    """
+    URL 하나에 대해 메타데이터와 Alt Text를 수집합니다.
+    Broken Link 항목은 Audit 전체에서 링크 상태를 공유하는 check_page_links 결과로 채웁니다.
+    예외가 발생해도 다른 URL 처리에 영향을 주지 않도록 결과 dict의 'error'에 담아 반환합니다.
+    """
+    result = {"url": url, "meta": {}, "alt_data": [], "error": None}
+    try:
+        with stage("generate_metadata", url):
+            result["meta"] = generate_metadata(url, sitemap_mapping, log_output)
+        result["meta"]["Broken Link"] = check_page_links(url, log_output)
+        with stage("collect_alt_texts", url):
+            result["alt_data"] = collect_alt_texts(url, log_output)
+    except Exception as e:
+        result["error"] = str(e)
+        log_event(log_output, "ERROR", f"Audit failed for {url}: {e}")
+    return result
+
+
+def audit_url_incremental(url, sitemap_mapping, log_output, history, reuse=True):
+    """
+    audit_single_url과 같지만, 페이지 지문(audit_history.page_fingerprint)이 이전 분석 때와 같으면
+    분석을 건너뛰고 저장된 결과를 재사용합니다. (재사용한 결과는 'reused'가 True)
+    새로 분석한 결과는 다음 실행을 위해 history에 저장합니다. reuse=False이면 저장만 합니다.
+    """
+    try:
+        with stage("page_fingerprint", url):
+            fingerprint = page_fingerprint(url, sitemap_mapping)
+    except Exception as e:
+        # 페이지를 가져오지 못하면 전체 분석을 실행해 기존과 같은 방식으로 오류를 남김
+        log_event(log_output, "WARN", f"Could not fingerprint {url}, running a full audit: {e}")
+        fingerprint = None
+
+    if reuse and fingerprint:
+        try:
+            previous = history.lookup(url, fingerprint)
+        except Exception as e:
+            # 이력을 읽지 못하면(database is locked 등) 재사용하지 않고 전체 분석
+            log_event(log_output, "WARN", f"Could not read the audit history for {url}, running a full audit: {e}")
+            previous = None
+        if previous is not None:
+            log_event(log_output, "INFO", f"Unchanged since the last audit, reusing results: {url}")
+            return {"url": url, "meta": previous["meta"], "alt_data": previous["alt_data"], "error": None,
+                    "reused": True}
+
+    result = audit_single_url(url, sitemap_mapping, log_output)
+    if fingerprint:
+        try:
+            history.record(url, fingerprint, result)
+        except Exception as e:
+            # 이력 저장에 실패해도 이번 결과는 그대로 사용 (다음 실행에서 재사용만 하지 못함)
+            log_event(log_output, "WARN", f"Could not save the audit history for {url}: {e}")
+    return result
+
+
+class AuditEngine:
+    """
+    작업 큐(JobQueue)의 URL을 워커 풀에서 동시에 Audit합니다. (run_queue)
+    전체 동시 실행 수(max_workers)와 호스트별 동시 실행 수(per_host_limit)를 함께 제한하며,
+    URL이 끝날 때마다 on_result 콜백으로 결과를 전달합니다.
+    실행 동안 PageCache를 활성화해 페이지별 다운로드/파싱을 검사 간에 공유하고(URL이 끝나면 메모리에서 내보냄),
+    stats(RunStats)가 있으면 URL별 단계 시간과 전송량을 기록합니다.
+    result_store(ResultStore)가 있으면 URL이 끝날 때마다 결과를 저장소에 기록하며, 엔진은 결과를 보관하지 않습니다.
+    history(AuditHistory)가 있으면 내용이 바뀌지 않은 페이지는 이전 분석 결과를 재사용합니다.
+    (reuse_unchanged=False이면 모두 다시 분석하고 결과만 history에 저장)
+    log_output은 워커 스레드에서 사용되므로 AuditLog(또는 None)만 받습니다.
+    GUI는 AuditLog를 TkLogDrain으로 메인 스레드에서 비워 위젯에 출력합니다.
+    """
+
+    def __init__(self, sitemap_mapping, log_output=None,
+                 max_workers=DEFAULT_MAX_WORKERS, per_host_limit=DEFAULT_PER_HOST_LIMIT,
+                 page_cache_dir=None, stats=None, result_store=None, history=None, reuse_unchanged=True):
+        if log_output is not None and not isinstance(log_output, AuditLog):
+            raise TypeError("AuditEngine log_output must be an AuditLog; "
+                            "drain it into Tk widgets on the main thread with TkLogDrain")
+        self.sitemap_mapping = sitemap_mapping
+        self.log_output = log_output
+        self.page_cache_dir = page_cache_dir
+        self.stats = stats
+        self.result_store = result_store
+        self.history = history
+        self.reuse_unchanged = reuse_unchanged
+        self.max_workers = max(1, int(max_workers))
+        self.per_host_limit = max(1, int(per_host_limit))
+
+    def _process(self, index, url):
+        # 예상하지 못한 예외도 이 URL의 error로 남겨 다른 URL과 실행 전체에 영향을 주지 않음
+        try:
+            if self.history is not None:
+                result = audit_url_incremental(url, self.sitemap_mapping, self.log_output, self.history,
+                                               self.reuse_unchanged)
+            else:
+                result = audit_single_url(url, self.sitemap_mapping, self.log_output)
+        except Exception as e:
+            log_event(self.log_output, "ERROR", f"Audit failed for {url}: {e}")
+            result = {"url": url, "meta": {}, "alt_data": [], "error": str(e)}
+        return index, result
+
+    def run_queue(self, job_queue, on_result=None, on_start=None):
+        """
+        job_queue(JobQueue)에서 URL을 가져가며 더 가져갈 URL이 없을 때까지 Audit합니다.
+        워커가 빌 때마다 필요한 만큼만 가져가므로 여러 프로세스가 같은 큐를 나눠 처리할 수 있습니다.
+        결과는 result_store에 기록한 뒤 큐에 done/failed로 표시하고, index는 큐의 position입니다.
+        on_start(index, url)는 작업이 시작될 때, on_result(index, result)는 완료되는 순서대로
+        호출됩니다 (UI 스레드가 아님).
+        사이트 전체 크롤링처럼 URL이 많아도 메모리가 늘지 않도록 URL별 결과는 보관하지 않고,
+        이 프로세스가 처리한 URL 수 {"audited", "failed", "reused"}만 반환합니다.
+        """
+        totals = {"audited": 0, "failed": 0, "reused": 0}
+
+        def on_job_result(position, result):
+            job_queue.complete(position, result["error"])
+            totals["audited"] += 1
+            if result["error"]:
+                totals["failed"] += 1
+            elif result.get("reused"):
+                totals["reused"] += 1
+            if on_result:
+                on_result(position, result)
+
+        self._run(job_queue.claim, on_job_result, on_start)
+        return totals
+
+    def _run(self, claim, on_result, on_start):
+        # 진행 중인 URL의 페이지만 메모리에 있으면 되므로 캐시 크기는 워커 수에 비례해 제한
+        page_cache = PageCache(cache_dir=self.page_cache_dir,
+                               max_documents=max(DEFAULT_MAX_DOCUMENTS, 2 * self.max_workers))
+        previous_cache = activate_page_cache(page_cache)
+        previous_stats = activate_run_stats(self.stats)
+        try:
+            self._run_pool(claim, on_result, on_start, page_cache)
+        finally:
+            activate_run_stats(previous_stats)
+            activate_page_cache(previous_cache)
+            page_cache.clear()
+
+    def _run_pool(self, claim, on_result, on_start, page_cache):
+        pending = OrderedDict()
+        active_per_host = {}
+        queued = 0
+        exhausted = False
+
+        def enqueue(new_jobs):
+            nonlocal queued
+            for index, url in new_jobs:
+                host = urlparse(url).netloc.lower()
+                pending.setdefault(host, deque()).append((index, url))
+                active_per_host.setdefault(host, 0)
+                queued += 1
+
+        done_queue = queue.Queue()
+        in_flight = 0
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            def fill():
+                nonlocal in_flight, queued, exhausted
+                if not exhausted and queued < self.max_workers:
+                    # 큐에서는 워커 수만큼만 미리 가져옴 (나머지는 다른 프로세스가 가져갈 수 있도록)
+                    claimed = claim(self.max_workers - queued)
+                    exhausted = not claimed
+                    enqueue(claimed)
+                # 호스트를 돌아가며 하나씩 제출해 특정 호스트가 워커를 독점하지 않도록 함
+                submitted = True
+                while submitted and in_flight < self.max_workers:
+                    submitted = False
+                    for host, host_jobs in pending.items():
+                        if in_flight >= self.max_workers:
+                            break
+                        if host_jobs and active_per_host[host] < self.per_host_limit:
+                            index, url = host_jobs.popleft()
+                            active_per_host[host] += 1
+                            in_flight += 1
+                            queued -= 1
+                            if on_start:
+                                on_start(index, url)
+                            future = pool.submit(self._process, index, url)
+                            future.add_done_callback(done_queue.put)
+                            submitted = True
+
+            fill()
+            while in_flight:
+                index, result = done_queue.get().result()
+                in_flight -= 1
+                active_per_host[urlparse(result["url"]).netloc.lower()] -= 1
+                if self.result_store is not None:
+                    try:
+                        self.result_store.add(index, result)
+                    except Exception as e:
+                        # 저장하지 못한 URL은 실패로 표시해 --retry-failed로 다시 실행할 수 있게 함
+                        log_event(self.log_output, "ERROR", f"Could not save the result of {result['url']}: {e}")
+                        result = {**result, "error": f"Could not save the result: {e}"}
+                if on_result:
+                    try:
+                        on_result(index, result)
+                    except Exception as e:
+                        # 큐에 완료로 표시하지 못한 URL은 lease가 끝나면 recover()로 다시 실행됨
+                        log_event(self.log_output, "ERROR", f"Could not record the result of {result['url']}: {e}")
+                # 결과를 넘긴 URL의 페이지(본문, 파싱 트리)는 더 이상 필요하지 않음
+                page_cache.discard(result["url"])
+                fill()
+
@@ -0,0 +1,209 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from page_cache import fetch_document, normalize_cache_key
+from page_rules import TRACK_END, TRACK_TEXT, PageRule, register_rule
+from report_generator import build_alt_row, build_seo_row
+from result_store import result_seo_records
+from sitemap_index import get_sitemap_index
+from sitemap_management import extract_base_url, find_sitemap_url
+
+DEFAULT_HISTORY_PATH = os.path.join("audit_cache", "audit_history.sqlite3")
+# 지문에 들어가는 내용이나 계산 방식, 또는 재사용하는 검사 결과의 기준이 바뀌면 올려서 이전 결과를 재사용하지 않도록 함
+# (2: 숨겨진 조상 요소 안의 이미지를 Alt Text 검사에서 제외)
+FINGERPRINT_VERSION = 2
+# 내용이 같아도 이 기간(초)이 지난 결과는 다시 분석 (링크 상태처럼 페이지 밖에서 바뀌는 검사 결과 갱신)
+REUSE_MAX_AGE = 7 * 24 * 60 * 60
+# 지문에 포함하는 <head> 태그
+_HEAD_TAGS = ("title", "meta", "link", "base")
+# 지문에 본문을 포함하는 스크립트 (이미지 갤러리, 구조화 데이터)
+_FINGERPRINT_SCRIPT_TYPES = ("text/x-magento-init", "application/ld+json")
+
+
+class FingerprintRule(PageRule):
+    """
+    Audit 결과에 영향을 주는 부분(<head> 메타데이터, H1, 이미지, 링크, 갤러리/구조화 데이터 스크립트)만
+    순서대로 해시에 넣는 페이지 검사 규칙입니다. 광고, 추천 상품, CSRF 토큰처럼 Audit과 관계없는 본문 변경은 무시합니다.
+    """
+
+    tags = ("html", "head", "body", "script", "h1", "img", "a") + _HEAD_TAGS
+
+    def __init__(self):
+        self.digest = hashlib.sha256()
+        self._in_head = False
+
+    def _add(self, *values):
+        self.digest.update("\x1f".join(values).encode("utf-8", errors="replace") + b"\x1e")
+
+    def start(self, tag, values, hidden):
+        if tag == "html":
+            self._add("html", values.get("lang", ""))
+        elif tag == "head":
+            self._in_head = True
+            return TRACK_END
+        elif tag == "body":
+            self._in_head = False
+        if (self._in_head and tag in _HEAD_TAGS) or tag in ("img", "a", "h1"):
+            self._add(tag, *(f"{name}={values[name]}" for name in sorted(values)))
+        if tag in ("title", "h1") or (tag == "script" and values.get("type") in _FINGERPRINT_SCRIPT_TYPES):
+            return TRACK_TEXT
+        return None
+
+    def end(self, tag, text):
+        if tag == "head":
+            self._in_head = False
+        else:
+            self._add(f"/{tag}", " ".join(text.split()))
+
+    def result(self):
+        return self.digest.hexdigest()
+
+
+register_rule("fingerprint", FingerprintRule)
+
+
+def page_fingerprint(url, sitemap_mapping):
+    """
+    페이지 중 Audit 결과를 결정하는 내용(HTTP 상태, <head> 메타데이터, H1, 이미지 목록, 링크 목록,
+    사이트맵 포함 여부)의 해시를 반환합니다. 페이지는 fetch_document로 가져오고 다른 검사와 같은
+    한 번의 문서 순회(page_rules) 결과를 사용하므로, 내용이 바뀌어 다시 분석할 때도 다운로드와 파싱은 한 번만 합니다.
+    네트워크 오류는 그대로 전달됩니다.
+    """
+    document = fetch_document(url)
+    digest = hashlib.sha256(f"v{FINGERPRINT_VERSION}\x1e{document.status_code}\x1e".encode("utf-8"))
+    digest.update(document.headers.get("X-Robots-Tag", "").encode("utf-8"))
+    digest.update(f"\x1e{document.rule_result('fingerprint')}".encode("utf-8"))
+
+    sitemap_url = find_sitemap_url(extract_base_url(url), sitemap_mapping, None)
+    in_sitemap = bool(sitemap_url and get_sitemap_index().lookup(sitemap_url, url))
+    digest.update(f"\x1esitemap={sitemap_url or ''}:{in_sitemap}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def result_issues(result):
+    """
+    결과 하나의 이슈 목록. 리포트에서 'issue'로 표시되는 SEO 항목은 "항목: Comment",
+    Alt Text가 없는 이미지는 "Alt Text: 이미지 URL"로 나타냅니다.
+    """
+    issues = []
+    for record in result_seo_records(result):
+        row = build_seo_row(record)
+        if row["comment_status"] == "issue":
+            issues.append(f"{row['factor']}: {row['comment']}")
+    for alt in result["alt_data"]:
+        row = build_alt_row(alt)
+        if row["comment_status"] == "issue":
+            issues.append(f"Alt Text: {row['image_url']}")
+    return sorted(set(issues))
+
+
+class AuditHistory:
+    """
+    이전 Audit 결과를 실행 간에 보관하는 SQLite 저장소입니다.
+    - pages: URL별 마지막 분석 결과와 페이지 지문. 지문이 같으면 다시 분석하지 않고 결과를 재사용합니다.
+    - ticket_issues: 티켓별로 마지막 리포트에 있던 URL별 이슈. 다음 리포트의 비교 기준(수정됨/새 이슈/그대로)입니다.
+    """
+
+    def __init__(self, db_path=DEFAULT_HISTORY_PATH, max_age=REUSE_MAX_AGE):
+        self.db_path = db_path
+        self.max_age = max_age
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS pages (
+                    url TEXT PRIMARY KEY,
+                    fingerprint TEXT NOT NULL,
+                    meta TEXT NOT NULL,
+                    alt_data TEXT NOT NULL,
+                    audited_at REAL NOT NULL
+                ) WITHOUT ROWID""")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS ticket_issues (
+                    ticket TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    issues TEXT NOT NULL,
+                    audited_at REAL NOT NULL,
+                    PRIMARY KEY (ticket, url)
+                ) WITHOUT ROWID""")
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def lookup(self, url, fingerprint):
+        """지문이 같고 max_age 안에 분석한 결과가 있으면 {"meta", "alt_data"}를, 없으면 None을 반환합니다."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT meta, alt_data FROM pages WHERE url = ? AND fingerprint = ? AND audited_at >= ?",
+                (normalize_cache_key(url), fingerprint, time.time() - self.max_age)).fetchone()
+        if row is None:
+            return None
+        return {"meta": json.loads(row[0]), "alt_data": json.loads(row[1])}
+
+    def record(self, url, fingerprint, result):
+        """새로 분석한 결과를 지문과 함께 저장합니다. (실패한 결과는 저장하지 않음)"""
+        if result["error"]:
+            return
+        row = (normalize_cache_key(url), fingerprint,
+               json.dumps(result["meta"], ensure_ascii=False, default=str),
+               json.dumps(result["alt_data"], ensure_ascii=False, default=str), time.time())
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO pages (url, fingerprint, meta, alt_data, audited_at) VALUES (?, ?, ?, ?, ?)",
+                row)
+
+    def compare(self, ticket, results, record=True):
+        """
+        results(ResultStore.iter_results() 등)의 이슈를 같은 티켓의 이전 리포트와 비교해 요약을 반환합니다.
+        record=True이면 이번 이슈를 다음 비교의 기준으로 저장합니다. (중간 리포트는 False)
+        실패한 URL은 비교하지 않고 이전 기준을 그대로 둡니다.
+        이전 기준이 있는 URL이 하나도 없으면 None을 반환합니다.
+        """
+        totals = {"fixed": 0, "new": 0, "unchanged": 0}
+        pages = []
+        compared = 0
+        now = time.time()
+        with self._connect() as conn:
+            for result in results:
+                if result["error"]:
+                    continue
+                issues = result_issues(result)
+                row = conn.execute("SELECT issues FROM ticket_issues WHERE ticket = ? AND url = ?",
+                                   (ticket, result["url"])).fetchone()
+                if record:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO ticket_issues (ticket, url, issues, audited_at) VALUES (?, ?, ?, ?)",
+                        (ticket, result["url"], json.dumps(issues, ensure_ascii=False), now))
+                if row is None:
+                    continue
+                compared += 1
+                previous = set(json.loads(row[0]))
+                fixed = sorted(previous.difference(issues))
+                new = [issue for issue in issues if issue not in previous]
+                totals["fixed"] += len(fixed)
+                totals["new"] += len(new)
+                totals["unchanged"] += len(issues) - len(new)
+                if fixed or new:
+                    pages.append({"url": result["url"], "fixed": fixed, "new": new,
+                                  "unchanged": len(issues) - len(new)})
+        if not compared:
+            return None
+        return {"pages_compared": compared, "pages_changed": len(pages), "pages": pages, **totals}
+
+
+_default_history = None
+_default_history_lock = threading.Lock()
+
+
+def get_audit_history():
+    """프로세스 전체에서 공유하는 기본 AuditHistory를 반환합니다."""
+    global _default_history
+    with _default_history_lock:
+        if _default_history is None:
+            _default_history = AuditHistory()
+        return _default_history
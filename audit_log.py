@@ -0,0 +1,152 @@
+import queue
+import re
+import threading
+import time
+from collections import namedtuple
+
+LOG_LEVELS = ("INFO", "WARN", "ERROR")
+_LEVEL_PREFIX = re.compile(r"^\s*\[(INFO|WARN|ERROR)\]")
+
+# raw=True이면 message를 가공하지 않고 그대로 출력 (기존 log_output.insert 호출 호환용)
+LogEvent = namedtuple("LogEvent", ["timestamp", "level", "message", "raw"])
+
+
+def format_event(event):
+    if event.raw:
+        return event.message
+    return f"[{event.level}] {event.message}\n"
+
+
+class AuditLog:
+    """
+    Audit 코드가 로그 이벤트를 남기는 스레드 안전한 큐입니다.
+    이벤트를 화면이나 파일에 쓰는 일은 TkLogDrain / StreamLogWriter가 따로 처리하므로
+    Audit 함수는 어느 스레드에서 실행되어도 Tk 위젯을 직접 건드리지 않습니다.
+    """
+
+    def __init__(self):
+        self.queue = queue.Queue()
+
+    def post(self, level, message):
+        self.queue.put(LogEvent(time.time(), level, message, False))
+
+    def info(self, message):
+        self.post("INFO", message)
+
+    def warn(self, message):
+        self.post("WARN", message)
+
+    def error(self, message):
+        self.post("ERROR", message)
+
+    # seo_core 등 log_output.insert(tk.END, text, tag) / log_output.see(tk.END)를 호출하는 코드 호환
+    def insert(self, index, text, tag=None):
+        level = tag
+        if level not in LOG_LEVELS:
+            match = _LEVEL_PREFIX.match(text)
+            level = match.group(1) if match else None
+        self.queue.put(LogEvent(time.time(), level, text, True))
+
+    def see(self, index):
+        pass
+
+    def drain(self, max_events=None):
+        """쌓인 이벤트를 최대 max_events개까지 꺼내 리스트로 반환합니다."""
+        events = []
+        while max_events is None or len(events) < max_events:
+            try:
+                events.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return events
+
+
+def log_event(log_output, level, message):
+    """
+    log_output이 있을 때만 이벤트를 남깁니다.
+    AuditLog가 아닌 객체(insert/see만 있는 위젯 등)를 넘겨도 기존 방식대로 기록합니다.
+    """
+    if log_output is None:
+        return
+    post = getattr(log_output, "post", None)
+    if post is not None:
+        post(level, message)
+    else:
+        log_output.insert("end", f"[{level}] {message}\n", level)
+        log_output.see("end")
+
+
+class TkLogDrain:
+    """
+    GUI 타이머로 AuditLog를 주기적으로 비우고, 모인 이벤트를 한 번에 로그 위젯에 추가합니다.
+    같은 태그가 연속된 줄은 insert 한 번으로 묶고, 스크롤(see)도 배치마다 한 번만 합니다.
+    """
+
+    def __init__(self, root, widget, audit_log, interval_ms=100, max_batch=1000):
+        self.root = root
+        self.widget = widget
+        self.audit_log = audit_log
+        self.interval_ms = interval_ms
+        self.max_batch = max_batch
+
+    def start(self):
+        self.root.after(self.interval_ms, self._tick)
+
+    def flush(self):
+        events = self.audit_log.drain(self.max_batch)
+        if not events:
+            return
+        self.widget.config(state='normal')
+        pending_tag, pending_text = None, []
+        for event in events:
+            if event.level != pending_tag and pending_text:
+                self._insert("".join(pending_text), pending_tag)
+                pending_text = []
+            pending_tag = event.level
+            pending_text.append(format_event(event))
+        if pending_text:
+            self._insert("".join(pending_text), pending_tag)
+        self.widget.see("end")
+        self.widget.config(state='disabled')
+
+    def _insert(self, text, tag):
+        if tag:
+            self.widget.insert("end", text, tag)
+        else:
+            self.widget.insert("end", text)
+
+    def _tick(self):
+        self.flush()
+        self.root.after(self.interval_ms, self._tick)
+
+
+class StreamLogWriter:
+    """
+    GUI가 없는 실행(CLI)에서 AuditLog 이벤트를 백그라운드 스레드로 스트림(stderr, 파일)에 기록합니다.
+    """
+
+    def __init__(self, audit_log, stream, interval=0.2):
+        self.audit_log = audit_log
+        self.stream = stream
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def flush(self):
+        events = self.audit_log.drain()
+        if events:
+            self.stream.write("".join(format_event(event) for event in events))
+            self.stream.flush()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.flush()
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+        self.flush()
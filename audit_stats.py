@@ -0,0 +1,265 @@
+import ctypes
+import heapq
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+try:
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):  # Windows
+    _PAGE_SIZE = 4096
+
+# 단계별로 summary()에 남기는 가장 오래 걸린 URL 수
+SLOWEST_URLS_PER_STAGE = 10
+
+
+class _PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+    _fields_ = [("cb", ctypes.c_ulong), ("PageFaultCount", ctypes.c_ulong),
+                ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+
+def _windows_memory_counters():
+    counters = _PROCESS_MEMORY_COUNTERS()
+    counters.cb = ctypes.sizeof(counters)
+    try:
+        handle = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+            return counters
+    except (AttributeError, OSError):
+        pass
+    return None
+
+
+def current_peak_memory():
+    """프로세스의 최대 메모리 사용량(bytes)을 반환합니다. 확인할 수 없으면 None."""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux는 KB, macOS는 bytes 단위
+        return peak if sys.platform == "darwin" else peak * 1024
+    if sys.platform == "win32":
+        counters = _windows_memory_counters()
+        if counters is not None:
+            return counters.PeakWorkingSetSize
+    if tracemalloc.is_tracing():
+        return tracemalloc.get_traced_memory()[1]
+    return None
+
+
+def current_memory():
+    """
+    단계 시작/끝의 메모리 차이를 구할 때 쓰는 현재 메모리 사용량(bytes). 확인할 수 없으면 None.
+    tracemalloc이 켜져 있으면(벤치마크 등) Python 할당량을, 아니면 프로세스의 현재 RSS를 사용합니다.
+    """
+    if tracemalloc.is_tracing():
+        return tracemalloc.get_traced_memory()[0]
+    if sys.platform.startswith("linux"):
+        try:
+            with open("/proc/self/statm", "rb") as f:
+                return int(f.read().split()[1]) * _PAGE_SIZE
+        except (OSError, ValueError, IndexError):
+            return None
+    if sys.platform == "win32":
+        counters = _windows_memory_counters()
+        if counters is not None:
+            return counters.WorkingSetSize
+    return None
+
+
+class StageRecord:
+    """
+    단계 하나(URL별 generate_metadata 등)의 실행 시간, 전송량, 요청 수, 메모리 변화량을 기록합니다.
+    memory_delta는 단계 시작과 끝의 current_memory() 차이입니다. 여러 URL을 동시에 처리하면
+    같은 시간에 실행된 다른 단계의 할당도 함께 포함되므로 URL/단계 간 비교용 근사치로 사용합니다.
+    """
+    __slots__ = ("name", "url", "elapsed", "bytes", "requests", "peak_memory", "memory_delta")
+
+    def __init__(self, name, url=None):
+        self.name = name
+        self.url = url
+        self.elapsed = 0.0
+        self.bytes = 0
+        self.requests = 0
+        self.peak_memory = None
+        self.memory_delta = None
+
+
+# 스레드별로 현재 실행 중인 단계 목록 (중첩된 단계 모두에 요청/전송량을 더함)
+_local = threading.local()
+
+
+def _stage_stack():
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+# bound_stages로 같은 단계를 여러 스레드가 함께 집계하므로 카운터 갱신은 잠금 안에서 함
+_counter_lock = threading.Lock()
+
+
+def record_request(nbytes=0):
+    """HTTP 요청 하나를 현재 스레드에서 실행 중인 모든 단계에 기록합니다."""
+    stack = _stage_stack()
+    with _counter_lock:
+        for record in stack:
+            record.requests += 1
+            record.bytes += nbytes
+
+
+def record_bytes(nbytes):
+    """스트리밍으로 받은 본문의 전송 크기를 현재 단계들에 더합니다."""
+    stack = _stage_stack()
+    with _counter_lock:
+        for record in stack:
+            record.bytes += nbytes
+
+
+def current_stages():
+    """다른 스레드(하위 사이트맵 병렬 요청 등)로 넘길 현재 단계 목록."""
+    return list(_stage_stack())
+
+
+@contextmanager
+def bound_stages(records):
+    """current_stages()로 받은 단계들을 이 스레드에서도 집계 대상으로 사용합니다."""
+    stack = _stage_stack()
+    stack.extend(records)
+    try:
+        yield
+    finally:
+        del stack[len(stack) - len(records):]
+
+
+class RunStats:
+    """
+    Audit 실행 한 번의 단계별 계측 결과를 모읍니다.
+    단계가 끝날 때마다 단계 이름별 합계와 최댓값, 가장 오래 걸린 URL 몇 개(slowest_urls)만 갱신하고
+    기록은 버리므로, Audit하는 URL 수와 관계없이 메모리 사용량이 일정합니다.
+    시간, 전송량, 메모리 변화량은 포함(inclusive) 기준이며, 중첩된 단계(예: generate_metadata 안의
+    check_sitemap_inclusion)의 값은 바깥 단계에도 함께 집계됩니다.
+    """
+
+    def __init__(self, slowest_urls=SLOWEST_URLS_PER_STAGE):
+        self.started_at = time.time()
+        self.slowest_urls = slowest_urls
+        self._stages = {}
+        # 단계 이름별 (elapsed, 순번, url, bytes, requests, memory_delta) min-heap (가장 빠른 항목이 맨 앞)
+        self._slowest = {}
+        self._sequence = 0
+        self._peak_memory = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name, url=None):
+        record = StageRecord(name, url)
+        stack = _stage_stack()
+        stack.append(record)
+        memory_before = current_memory()
+        started = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.elapsed = time.perf_counter() - started
+            stack.remove(record)
+            memory_after = current_memory()
+            if memory_before is not None and memory_after is not None:
+                record.memory_delta = memory_after - memory_before
+            record.peak_memory = current_peak_memory()
+            with self._lock:
+                self._add(record)
+
+    def _add(self, record):
+        agg = self._stages.get(record.name)
+        if agg is None:
+            agg = self._stages[record.name] = {"count": 0, "wall_seconds": 0.0, "max_seconds": 0.0,
+                                               "bytes": 0, "requests": 0,
+                                               "memory_delta_bytes": None, "max_memory_delta_bytes": None}
+        agg["count"] += 1
+        agg["wall_seconds"] += record.elapsed
+        agg["max_seconds"] = max(agg["max_seconds"], record.elapsed)
+        agg["bytes"] += record.bytes
+        agg["requests"] += record.requests
+        if record.memory_delta is not None:
+            agg["memory_delta_bytes"] = (agg["memory_delta_bytes"] or 0) + record.memory_delta
+            if agg["max_memory_delta_bytes"] is None or record.memory_delta > agg["max_memory_delta_bytes"]:
+                agg["max_memory_delta_bytes"] = record.memory_delta
+        if record.peak_memory is not None and (self._peak_memory is None or record.peak_memory > self._peak_memory):
+            self._peak_memory = record.peak_memory
+
+        if record.url is not None and self.slowest_urls > 0:
+            heap = self._slowest.setdefault(record.name, [])
+            self._sequence += 1
+            item = (record.elapsed, self._sequence, record.url, record.bytes, record.requests, record.memory_delta)
+            if len(heap) < self.slowest_urls:
+                heapq.heappush(heap, item)
+            elif item > heap[0]:
+                heapq.heapreplace(heap, item)
+
+    def summary(self):
+        with self._lock:
+            stages = {name: dict(agg) for name, agg in self._stages.items()}
+            slowest = {name: sorted(heap, reverse=True) for name, heap in self._slowest.items()}
+            peak = self._peak_memory
+
+        for name, agg in stages.items():
+            agg["wall_seconds"] = round(agg["wall_seconds"], 4)
+            agg["max_seconds"] = round(agg["max_seconds"], 4)
+            if name in slowest:
+                agg["slowest_urls"] = [
+                    {"url": url, "wall_seconds": round(elapsed, 4), "bytes": nbytes, "requests": requests,
+                     "memory_delta_bytes": memory_delta}
+                    for elapsed, _, url, nbytes, requests, memory_delta in slowest[name]
+                ]
+
+        return {
+            "started_at": self.started_at,
+            "elapsed_seconds": round(time.time() - self.started_at, 3),
+            "peak_memory_bytes": peak if peak is not None else current_peak_memory(),
+            "stages": stages,
+        }
+
+    def write_json(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, ensure_ascii=False, indent=2)
+
+
+# Audit 실행 동안 모듈 수준 stage()가 기록할 RunStats (AuditEngine이 설정)
+_active_stats = None
+
+
+def activate_run_stats(stats):
+    """stage()가 사용할 RunStats를 설정하고 이전 값을 반환합니다."""
+    global _active_stats
+    previous = _active_stats
+    _active_stats = stats
+    return previous
+
+
+@contextmanager
+def stage(name, url=None):
+    """활성화된 RunStats가 있으면 단계를 기록하고, 없으면 아무 일도 하지 않습니다."""
+    stats = _active_stats
+    if stats is None:
+        yield None
+        return
+    with stats.stage(name, url) as record:
+        yield record
+
+
+def stats_sidecar_path(report_path):
+    """리포트 옆에 저장할 계측 결과 파일 경로 (report.html -> report.stats.json)"""
+    base = report_path[:-5] if report_path.endswith(".html") else report_path
+    return base + ".stats.json"
@@ -0,0 +1,131 @@
+"""
+벤치마크용 로컬 HTTP 서버입니다. 실제 브랜드 사이트 대신 메모리에 올린 합성 fixture를 응답합니다.
+경로별로 지연(delay), 상태 코드, 연결 끊김(status=None)을 지정할 수 있습니다.
+200 응답은 CDN처럼 "Range: bytes=a-b" 요청에 206 부분 응답을 보냅니다.
+"""
+import hashlib
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import urlsplit
+
+
+class Route:
+    __slots__ = ("body", "content_type", "status", "delay", "etag")
+
+    def __init__(self, body, content_type, status, delay):
+        self.body = body
+        self.content_type = content_type
+        self.status = status
+        self.delay = delay
+        self.etag = '"%s"' % hashlib.sha1(body).hexdigest()[:16]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+    def _respond(self, send_body):
+        # query string은 무시 (같은 fixture를 다른 URL로 요청해 캐시를 우회할 때 사용)
+        server = self.server
+        path = urlsplit(self.path).path
+        server.hits[path] = server.hits.get(path, 0) + 1
+        route = server.routes.get(path)
+        if route is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if route.delay:
+            time.sleep(route.delay)
+        if route.status is None:
+            # 응답 없이 연결을 끊어 네트워크 오류를 재현
+            self.close_connection = True
+            return
+        if route.status == 200 and self.headers.get("If-None-Match") == route.etag:
+            self.send_response(304)
+            self.send_header("ETag", route.etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = route.body
+        byte_range = self.headers.get("Range", "")
+        if route.status == 200 and byte_range.startswith("bytes=") and "," not in byte_range:
+            first, _, last = byte_range[6:].partition("-")
+            start = int(first) if first else 0
+            end = min(int(last), len(body) - 1) if last else len(body) - 1
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(body)}")
+            body = body[start:end + 1]
+        else:
+            self.send_response(route.status)
+        self.send_header("Content-Type", route.content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", route.etag)
+        self.end_headers()
+        if send_body:
+            try:
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                # 사이트맵 검색이 URL을 찾은 뒤 남은 본문 읽기를 중단한 경우
+                pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _ThreadingServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def handle_error(self, request, client_address):
+        # 클라이언트가 본문을 다 읽지 않고 연결을 닫는 것은 정상 동작(사이트맵 검색 조기 종료)이므로 무시
+        pass
+
+
+class FixtureServer:
+    """
+    with FixtureServer() as server:
+        server.add("/page.html", b"<html>...</html>")
+        server.url("/page.html")
+    """
+
+    def __init__(self, host="127.0.0.1", port=0):
+        self._server = _ThreadingServer((host, port), _Handler)
+        self._server.routes = {}
+        self._server.hits = {}
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self.base_url = f"http://{host}:{self._server.server_address[1]}"
+
+    def add(self, path, body, content_type="text/html; charset=utf-8", status=200, delay=0.0):
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        self._server.routes[path] = Route(body, content_type, status, delay)
+        return self.url(path)
+
+    def url(self, path):
+        return self.base_url + path
+
+    @property
+    def hits(self):
+        return self._server.hits
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
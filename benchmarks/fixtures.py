@@ -0,0 +1,125 @@
+"""
+벤치마크용 합성 fixture 생성 함수입니다. 같은 seed면 항상 같은 결과를 만듭니다.
+"""
+import gzip
+import json
+import random
+import struct
+
+import pandas as pd
+
+SITEMAP_NS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+
+_HIDDEN_VARIANTS = (
+    ' style="display: none"',
+    ' style="Visibility : Hidden"',
+    ' class="lazy hidden"',
+    " hidden",
+)
+
+
+def product_page(base_url, n_images, n_gallery=20, seed=0):
+    """
+    상품 상세 페이지와 비슷한 HTML을 만듭니다.
+    n_images개의 <img>(숨김/중복/상대 경로/data-amsrc 포함)와 여러 블록의 본문 마크업,
+    그리고 n_gallery개의 이미지를 가진 text/x-magento-init 갤러리 스크립트를 포함합니다.
+    """
+    rng = random.Random(seed)
+    parts = ["<!DOCTYPE html><html><head><title>Product</title>",
+             '<meta name="description" content="synthetic product page">',
+             '<script type="text/javascript">var dataLayer = [];</script></head><body>']
+    for i in range(n_images):
+        if i % 10 == 0:
+            parts.append(f'<section class="block"><h2>Section {i // 10}</h2>'
+                         + "<p>" + "Lorem ipsum dolor sit amet. " * rng.randint(5, 30) + "</p>"
+                         + '<ul class="nav">' + "".join(f'<li><a href="/c/{j}">Link {j}</a></li>'
+                                                       for j in range(8)) + "</ul></section>")
+        roll = rng.random()
+        attrs = ""
+        if roll < 0.1:
+            attrs = rng.choice(_HIDDEN_VARIANTS)
+        if roll > 0.95 and i:
+            # 앞에서 나온 이미지를 다시 사용 (페이지 내 중복 제거 경로)
+            src = f"/media/catalog/product/{rng.randrange(i)}.jpg"
+        elif roll > 0.8:
+            src = f"{base_url}/media/catalog/product/{i}.jpg"
+        else:
+            src = f"/media/catalog/product/{i}.jpg"
+        alt = "" if rng.random() < 0.2 else f"Product image {i} &amp; detail"
+        if rng.random() < 0.15:
+            parts.append(f'<div class="item"><img data-amsrc="{src}" src="/static/placeholder.gif"'
+                         f' alt="{alt}"{attrs}></div>')
+        else:
+            parts.append(f'<div class="item"><img src="{src}" alt="{alt}"{attrs} loading="lazy"></div>')
+
+    gallery = [{"img": f"/media/catalog/product/gallery/{g}.jpg",
+                "full": f"/media/catalog/product/gallery/{g}_full.jpg",
+                "caption": "" if g % 4 == 0 else f"Gallery {g}"} for g in range(n_gallery)]
+    parts.append('<script type="text/x-magento-init">'
+                 + json.dumps({"[data-gallery-role=gallery-placeholder]": {
+                     "mage/gallery/gallery": {"data": gallery}}})
+                 + "</script>")
+    parts.append('<script type="text/x-magento-init">{"*": {"Magento_Ui/js/core/app": {}}}</script>')
+    parts.append('<script type="text/x-magento-init">{not valid json</script>')
+    parts.append("</body></html>")
+    return "".join(parts).encode("utf-8")
+
+
+def png_image(width, height, size):
+    """PNG 시그니처와 IHDR(해상도)로 시작하고 size 바이트가 되도록 채운 이미지 본문"""
+    header = b"\x89PNG\r\n\x1a\n" + struct.pack(">I4sII", 13, b"IHDR", width, height) + b"\x08\x02\x00\x00\x00"
+    return header + b"\x00" * max(0, size - len(header))
+
+
+def urlset(urls):
+    parts = [f'<?xml version="1.0" encoding="UTF-8"?><urlset xmlns="{SITEMAP_NS}">']
+    parts.extend(f"<url><loc>{url}</loc><lastmod>2024-01-01</lastmod><priority>0.5</priority></url>"
+                 for url in urls)
+    parts.append("</urlset>")
+    return "".join(parts).encode("utf-8")
+
+
+def sitemap_index(sitemap_urls):
+    parts = [f'<?xml version="1.0" encoding="UTF-8"?><sitemapindex xmlns="{SITEMAP_NS}">']
+    parts.extend(f"<sitemap><loc>{url}</loc><lastmod>2024-01-01</lastmod></sitemap>"
+                 for url in sitemap_urls)
+    parts.append("</sitemapindex>")
+    return "".join(parts).encode("utf-8")
+
+
+def gzipped(body):
+    return gzip.compress(body, compresslevel=6)
+
+
+def page_urls(base_url, count, prefix="p"):
+    return [f"{base_url}/{prefix}/{i}.html" for i in range(count)]
+
+
+def report_frames(n_urls, n_images, seed=0):
+    """generate_html_report 입력과 같은 형태의 final_df, alt_df를 만듭니다."""
+    rng = random.Random(seed)
+    urls = [f"https://www.laneige.com/kr/ko/product/{i}.html" for i in range(n_urls)]
+    factors = ["Title", "Description", "H1", "Canonical", "OG Title", "OG Description",
+               "Robots", "Hreflang", "통이미지 사용", "Sitemap"]
+    rows = []
+    alt_rows = []
+    for url in urls:
+        for factor in factors:
+            status = f"<h1>{factor} {url}</h1>" if factor == "H1" else f"{factor} value for {url}"
+            rows.append({
+                "URL": url,
+                "항목": factor,
+                "현황": status,
+                "현황_길이": len(status) if factor in ("Title", "Description", "OG Title", "OG Description") else None,
+                "Comment": "이슈 없음" if rng.random() < 0.7 else "수정 필요",
+                "SEO 수정안": "N/A",
+            })
+        for j in range(n_images):
+            alt_rows.append({
+                "Page URL": url,
+                "Image URL": f"{url}/media/{j}.jpg",
+                "Alt Text (AS-IS)": "" if rng.random() < 0.2 else f"Alt text {j}",
+            })
+    final_df = pd.DataFrame(rows)
+    alt_df = pd.DataFrame(alt_rows, columns=["Page URL", "Image URL", "Alt Text (AS-IS)"])
+    return urls, final_df, alt_df
@@ -0,0 +1,349 @@
+"""
+실제 사이트에 접속하지 않고 Audit 주요 함수의 성능을 측정하는 오프라인 벤치마크입니다.
+로컬 fixture 서버에 합성 페이지/사이트맵을 올린 뒤 규모(scale)별로 실행 시간과 메모리를 측정하고,
+저장된 기준값(baseline)과 비교해 느려지거나 메모리가 늘어난 경우를 찾아냅니다.
+
+사용 예:
+    python benchmarks/run_benchmarks.py                        # small, medium 측정 후 baseline과 비교
+    python benchmarks/run_benchmarks.py --scales large --repeat 1
+    python benchmarks/run_benchmarks.py --save-baseline        # 현재 결과를 baseline으로 저장
+    python benchmarks/run_benchmarks.py --filter sitemap
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import requests
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from audit_stats import RunStats, activate_run_stats  # noqa: E402
+from duplicate_index import DuplicateIndex  # noqa: E402
+from excel_export import write_xlsx_report  # noqa: E402
+from http_client import DEFAULT_POOL_SIZE, configure_http_client  # noqa: E402
+from image_registry import ImageProber, ImageRegistry  # noqa: E402
+from link_checker import extract_links  # noqa: E402
+from page_cache import PageCache, activate_page_cache, fetch_document  # noqa: E402
+from report_generator import generate_html_report  # noqa: E402
+from sitemap_management import check_sitemap_inclusion  # noqa: E402
+from utils import collect_alt_texts  # noqa: E402
+
+from fixture_server import FixtureServer  # noqa: E402
+import fixtures  # noqa: E402
+
+DEFAULT_BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+
+SCALES = {
+    "small": {"pages": 10, "images": 100, "gallery": 10, "sitemap_urls": 5000, "children": 4,
+              "lookups": 200, "report_urls": 10, "report_images": 100, "unique_images": 50},
+    "medium": {"pages": 20, "images": 500, "gallery": 30, "sitemap_urls": 50000, "children": 8,
+               "lookups": 1000, "report_urls": 50, "report_images": 300, "unique_images": 200},
+    "large": {"pages": 20, "images": 2000, "gallery": 60, "sitemap_urls": 200000, "children": 16,
+              "lookups": 2000, "report_urls": 200, "report_images": 500, "unique_images": 1000},
+}
+# 느린 하위 사이트맵의 응답 지연(초). URL을 먼저 찾으면 이 시간을 기다리지 않아야 함
+SLOW_SITEMAP_DELAY = 2.0
+
+
+def setup_alt_text_cases(server, scale, params):
+    prefix = f"/{scale}"
+    page_urls = []
+    for i in range(params["pages"]):
+        body = fixtures.product_page(server.base_url, params["images"], params["gallery"], seed=i)
+        page_urls.append(server.add(f"{prefix}/product/{i}.html", body))
+    # 실패/지연 페이지를 섞어 오류 처리 경로도 함께 측정
+    page_urls.append(server.add(f"{prefix}/product/error.html", b"Internal Server Error", status=500))
+    page_urls.append(server.add(f"{prefix}/product/reset.html", b"", status=None))
+    page_urls.append(server.add(f"{prefix}/product/slow.html",
+                                fixtures.product_page(server.base_url, 10, 0, seed=99), delay=0.05))
+
+    def run():
+        for url in page_urls:
+            collect_alt_texts(url, None)
+
+    def run_shared():
+        # Audit 실행과 같이 페이지 캐시를 공유하면 검사 수와 관계없이 페이지당 한 번만 순회
+        previous = activate_page_cache(PageCache())
+        try:
+            for url in page_urls:
+                collect_alt_texts(url, None)
+                try:
+                    extract_links(fetch_document(url))
+                except requests.exceptions.RequestException:
+                    pass
+        finally:
+            activate_page_cache(previous)
+
+    return [("collect_alt_texts", run), ("page_rules/alt_links", run_shared)]
+
+
+def setup_sitemap_cases(server, scale, params):
+    prefix = f"/{scale}"
+    base = server.base_url
+    count = params["sitemap_urls"]
+    children = params["children"]
+    urls = fixtures.page_urls(base, count)
+
+    flat_url = server.add(f"{prefix}/flat.xml", fixtures.urlset(urls), "application/xml")
+
+    per_child = -(-count // children)
+    child_urls, gz_child_urls = [], []
+    for k in range(children):
+        chunk = fixtures.urlset(urls[k * per_child:(k + 1) * per_child])
+        child_urls.append(server.add(f"{prefix}/child-{k}.xml", chunk, "application/xml"))
+        gz_child_urls.append(server.add(f"{prefix}/child-{k}.xml.gz", fixtures.gzipped(chunk),
+                                        "application/x-gzip"))
+    index_url = server.add(f"{prefix}/index.xml", fixtures.sitemap_index(child_urls), "application/xml")
+    gz_index_url = server.add(f"{prefix}/index.xml.gz",
+                              fixtures.gzipped(fixtures.sitemap_index(gz_child_urls)), "application/x-gzip")
+
+    mixed_children = [
+        server.add(f"{prefix}/mixed-slow.xml", fixtures.urlset(urls[:100]), "application/xml",
+                   delay=SLOW_SITEMAP_DELAY),
+        server.add(f"{prefix}/mixed-error.xml", b"", status=500),
+        server.add(f"{prefix}/mixed-reset.xml", b"", status=None),
+        child_urls[-1],
+    ]
+    mixed_index_url = server.add(f"{prefix}/mixed-index.xml", fixtures.sitemap_index(mixed_children),
+                                 "application/xml")
+
+    target = urls[-1]
+    # 매번 다른 사이트맵 URL(query)로 요청해 인덱스를 새로 만드는 경우
+    build_runs = iter(range(1_000_000))
+
+    def cold_inclusion(sitemap_url):
+        def run():
+            mapping = {f"{base}/": f"{sitemap_url}?run={next(build_runs)}"}
+            check_sitemap_inclusion(target, mapping, None)
+        return run
+
+    warm_mapping = {f"{base}/": f"{index_url}?run=warm"}
+    lookups = [urls[(i * 7919) % count] if i % 2 else f"{base}/p/missing-{i}.html"
+               for i in range(params["lookups"])]
+
+    def warm_inclusion():
+        for url in lookups:
+            check_sitemap_inclusion(url, warm_mapping, None)
+
+    return [
+        ("check_sitemap_inclusion/flat_build", cold_inclusion(flat_url)),
+        ("check_sitemap_inclusion/index_build", cold_inclusion(index_url)),
+        ("check_sitemap_inclusion/gzip_index_build", cold_inclusion(gz_index_url)),
+        # 느린/실패하는 하위 사이트맵이 섞인 인덱스를 새로 만드는 경우 (하위 사이트맵 병렬 요청)
+        ("check_sitemap_inclusion/slow_and_failing_build", cold_inclusion(mixed_index_url)),
+        ("check_sitemap_inclusion/warm_lookups", warm_inclusion, warm_inclusion),
+    ]
+
+
+def setup_report_cases(server, scale, params, output_dir):
+    urls, final_df, alt_df = fixtures.report_frames(params["report_urls"], params["report_images"])
+    output_path = os.path.join(output_dir, f"report_{scale}.html")
+    results = [{"url": url, "error": None, "alt_data": [],
+                "meta": {row["항목"]: {"현황": row["현황"]} for row in rows.to_dict("records")}}
+               for url, rows in final_df.groupby("URL", sort=False)]
+
+    def find_duplicates():
+        index = DuplicateIndex()
+        for position, result in enumerate(results):
+            index.add(position, result)
+        index.clusters()
+
+    return [
+        ("generate_html_report/full",
+         lambda: generate_html_report("BENCH", urls, final_df, alt_df, output_path, compact=False)),
+        ("generate_html_report/compact",
+         lambda: generate_html_report("BENCH", urls, final_df, alt_df, output_path, compact=True)),
+        ("write_xlsx_report",
+         lambda: write_xlsx_report(urls, os.path.join(output_dir, f"report_{scale}.xlsx"), final_df, alt_df)),
+        ("duplicate_index", find_duplicates),
+    ]
+
+
+def setup_image_cases(server, scale, params, output_dir):
+    prefix = f"/{scale}"
+    # 이미지의 절반은 모든 페이지에 나오는 공통 이미지(헤더/푸터), 나머지는 페이지마다 다른 이미지
+    image_urls = [server.add(f"{prefix}/img/{i}.png", fixtures.png_image(800 + i, 600, 20_000 + i * 500),
+                             content_type="image/png")
+                  for i in range(params["unique_images"])]
+    shared, own = image_urls[::2], image_urls[1::2]
+    pages = max(1, params["report_urls"])
+    results = [{"url": f"{server.base_url}{prefix}/page/{p}.html", "error": None, "meta": {},
+                "alt_data": [{"Page URL": "", "Image URL": url, "Alt Text (AS-IS)": "alt"}
+                             for url in shared + own[p::pages]]}
+               for p in range(pages)]
+    runs = iter(range(1_000_000))
+    warm_path = os.path.join(output_dir, f"image_info_{scale}.sqlite3")
+
+    def probe(db_path):
+        registry = ImageRegistry(ImageProber(db_path))
+        for position, result in enumerate(results):
+            registry.add(position, result)
+        registry.summary()
+
+    return [
+        # 매번 새 캐시: 고유 이미지마다 Range 요청 한 번
+        ("image_registry/probe_cold",
+         lambda: probe(os.path.join(output_dir, f"image_info_{scale}_{next(runs)}.sqlite3"))),
+        ("image_registry/probe_cached", lambda: probe(warm_path), lambda: probe(warm_path)),
+    ]
+
+
+def measure(func, repeat, warmup=None):
+    """
+    func를 repeat번 실행해 시간을 재고, tracemalloc을 켠 상태로 한 번 더 실행해
+    최대 Python 메모리 할당량과 HTTP 요청 수/전송량(audit_stats)을 측정합니다.
+    """
+    if warmup is not None:
+        warmup()
+    timings = []
+    for _ in range(max(1, repeat)):
+        gc.collect()
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+
+    stats = RunStats()
+    previous = activate_run_stats(stats)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        with stats.stage("case") as record:
+            func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        activate_run_stats(previous)
+
+    return {
+        "median_seconds": round(statistics.median(timings), 4),
+        "min_seconds": round(min(timings), 4),
+        "peak_kb": round(peak / 1024, 1),
+        "requests": record.requests,
+        "transfer_kb": round(record.bytes / 1024, 1),
+    }
+
+
+def compare(results, baseline, tolerance, min_seconds, min_kb):
+    """baseline보다 tolerance 비율 이상(그리고 최소 절대값 이상) 나빠진 항목을 반환합니다."""
+    regressions = []
+    for key, current in results.items():
+        base = baseline.get(key)
+        if not base:
+            continue
+        slower = current["median_seconds"] - base["median_seconds"]
+        if slower > min_seconds and current["median_seconds"] > base["median_seconds"] * (1 + tolerance):
+            regressions.append((key, "time", base["median_seconds"], current["median_seconds"]))
+        grown = current["peak_kb"] - base["peak_kb"]
+        if grown > min_kb and current["peak_kb"] > base["peak_kb"] * (1 + tolerance):
+            regressions.append((key, "memory", base["peak_kb"], current["peak_kb"]))
+    return regressions
+
+
+def format_row(key, result, base=None):
+    ratio = ""
+    if base and base.get("median_seconds"):
+        ratio = f"{result['median_seconds'] / base['median_seconds']:.2f}x"
+    return (f"{key:<52} {result['median_seconds']:>9.4f} {result['min_seconds']:>9.4f} "
+            f"{result['peak_kb']:>11.1f} {result['requests']:>6} {result['transfer_kb']:>11.1f} {ratio:>7}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="오프라인 Audit 벤치마크를 실행합니다.")
+    parser.add_argument("--scales", default="small,medium",
+                        help=f"측정할 규모 (쉼표 구분: {', '.join(SCALES)})")
+    parser.add_argument("--repeat", type=int, default=3, help="항목별 반복 횟수 (중앙값 사용)")
+    parser.add_argument("--filter", help="이름에 이 문자열이 포함된 항목만 실행")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_PATH, help="비교/저장할 baseline 파일")
+    parser.add_argument("--save-baseline", action="store_true", help="현재 결과를 baseline으로 저장")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="허용 오차 비율 (기본 25%%)")
+    parser.add_argument("--output", help="측정 결과를 JSON으로 저장할 경로")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    scales = [s.strip() for s in args.scales.split(",") if s.strip()]
+    unknown = [s for s in scales if s not in SCALES]
+    if unknown:
+        print(f"[ERROR] Unknown scale: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f).get("results", {})
+
+    # 재시도는 그대로 하되 backoff 대기 시간은 빼고, 모든 fixture가 같은 호스트이므로 호스트별 동시 요청 제한을 풀어 둠
+    configure_http_client(backoff_factor=0, per_host_concurrency=DEFAULT_POOL_SIZE)
+
+    results = {}
+    original_cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="seo-audit-bench-") as work_dir, FixtureServer() as server:
+        # 사이트맵 인덱스/robots 캐시(audit_cache/)가 실제 작업 폴더에 섞이지 않도록 임시 폴더에서 실행
+        os.chdir(work_dir)
+        try:
+            print(f"{'case':<52} {'median(s)':>9} {'min(s)':>9} {'peak(KB)':>11} {'reqs':>6} "
+                  f"{'xfer(KB)':>11} {'vs base':>7}")
+            for scale in scales:
+                params = SCALES[scale]
+                cases = (setup_alt_text_cases(server, scale, params)
+                         + setup_sitemap_cases(server, scale, params)
+                         + setup_report_cases(server, scale, params, work_dir)
+                         + setup_image_cases(server, scale, params, work_dir))
+                for case in cases:
+                    name, func = case[0], case[1]
+                    warmup = case[2] if len(case) > 2 else None
+                    key = f"{scale}/{name}"
+                    if args.filter and args.filter not in key:
+                        continue
+                    results[key] = measure(func, args.repeat, warmup)
+                    print(format_row(key, results[key], baseline.get(key)), flush=True)
+        finally:
+            os.chdir(original_cwd)
+
+    report = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if args.save_baseline:
+        if os.path.exists(args.baseline):
+            # 이번에 측정하지 않은 항목은 기존 baseline 값을 유지
+            with open(args.baseline, "r", encoding="utf-8") as f:
+                merged = json.load(f).get("results", {})
+            merged.update(results)
+            report["results"] = merged
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"[INFO] Baseline saved to {args.baseline}")
+        return 0
+
+    if not baseline:
+        print("[INFO] No baseline to compare against. Run with --save-baseline to create one.")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance, min_seconds=0.005, min_kb=256)
+    for key, kind, before, after in regressions:
+        print(f"[WARN] Regression in {key} ({kind}): {before} -> {after}")
+    if regressions:
+        return 1
+    print("[INFO] No regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
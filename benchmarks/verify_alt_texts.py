@@ -0,0 +1,146 @@
+"""
+collect_alt_texts의 단일 순회 규칙(page_rules) 경로가 기준 방식(html.parser로 전체 트리 생성 후 find_all,
+이미지 자신이나 조상이 숨김이면 제외)과 같은 Page URL / Image URL / Alt Text (AS-IS) 행을 만드는지 확인합니다.
+
+합성 상품 페이지와 경계 사례 HTML(필요하면 인자로 받은 HTML 파일)을 로컬 fixture 서버로 응답하고,
+기준 구현과 새 구현의 결과를 행 단위로 비교합니다. 다르면 종료 코드 1을 반환합니다.
+
+사용 예:
+    python benchmarks/verify_alt_texts.py
+    python benchmarks/verify_alt_texts.py saved_pages/*.html
+"""
+import json
+import os
+import sys
+from urllib.parse import urljoin
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from link_checker import extract_links  # noqa: E402
+from page_cache import PageCache, activate_page_cache  # noqa: E402
+from utils import collect_alt_texts, is_hidden  # noqa: E402
+
+from fixture_server import FixtureServer  # noqa: E402
+import fixtures  # noqa: E402
+
+EDGE_CASES = {
+    "attributes": '<img src="/a.jpg" alt="A &amp; B &quot;q&quot;"><IMG SRC="/b.jpg" ALT="upper">'
+                  '<img src="/c.jpg" alt><img src="/d.jpg" alt="first" alt="second">'
+                  '<img src="/e.jpg" src="/e2.jpg"><img alt="no src"><img src="" alt="empty src">'
+                  '<img data-amsrc="/lazy.jpg" src="/ph.gif" alt="lazy"><img data-amsrc="" src="/f.jpg">',
+    "hidden": '<img src="/h1.jpg" style="DISPLAY : NONE"><img src="/h2.jpg" style="visibility: hidden;">'
+              '<img src="/h3.jpg" hidden><img src="/h4.jpg" class="a hidden b"><img src="/v1.jpg" class="hiddenx">'
+              '<img src="/v2.jpg" style="display:block"><img src="/v3.jpg" class="">'
+              '<img src="/v4.jpg" style><img src="/v5.jpg" class="\thidden\n">',
+    "dedupe": '<img src="/x.jpg" alt="1"><img src="http://example.com/x.jpg" alt="2"><img src="/x.jpg#f" alt="3">'
+              '<script type="text/x-magento-init">{"g": {"mage/gallery/gallery": {"data": '
+              '[{"img": "/x.jpg", "caption": "dup"}, {"full": "/y.jpg", "caption": "full only"}]}}}</script>',
+    "markup": '<!-- <img src="/comment.jpg"> --><script>var s = "<img src=\'/in-script.jpg\'>";</script>'
+              '<noscript><img src="/noscript.jpg" alt="ns"></noscript><template><img src="/tpl.jpg"></template>'
+              '<svg><image href="/svg.jpg"></image></svg><img src="/self-closing.jpg" alt="sc"/>'
+              '<textarea><img src="/textarea.jpg"></textarea>',
+    "scripts": '<script type="text/x-magento-init">{bad json</script>'
+               '<script type="TEXT/X-MAGENTO-INIT">{"u": {"mage/gallery/gallery": {"data": [{"img": "/upper.jpg"}]}}}'
+               '</script><script type="text/x-magento-init"/>'
+               '<script type="text/x-magento-init">{"a": {"mage/gallery/gallery": {"data": '
+               '[{"img": "/g&amp;1.jpg", "caption": "</div>"}, {"caption": "no image"}]}}}</script>'
+               '<script type="text/x-magento-init">{"b": {"mage/gallery/gallery": {"data": [{"img": "/open.jpg"}]}}}',
+    "hidden_ancestors": '<div style="display:none"><p><img src="/ha1.jpg"></p></div><img src="/va1.jpg">'
+                        '<div class="modal hidden"><div><span><img src="/ha2.jpg"></span></div></div>'
+                        '<section hidden><img src="/ha3.jpg"/></section><ul><li><img src="/va2.jpg"></ul>'
+                        '<div class="x"><div style="visibility:hidden"></div><img src="/va3.jpg"></div>'
+                        '<div style="display:none"><img src="/ha4.jpg"><br></div></div><img src="/va4.jpg">'
+                        '<p hidden>open<b>x</p><img src="/va7.jpg">'
+                        '<div hidden><img src="/ha6.jpg"></img></span><img src="/ha7.jpg"></div><img src="/va5.jpg">'
+                        '<div hidden/><img src="/va6.jpg"><div class="hidden">unclosed<img src="/ha8.jpg">',
+}
+
+
+def legacy_collect_alt_texts(url, html):
+    """트리를 만든 뒤 태그를 검색하는 collect_alt_texts 추출 로직 (비교 기준)"""
+    alt_data_for_url = []
+    page_seen_images = set()
+    soup = BeautifulSoup(html, "html.parser")
+    for img in soup.find_all("img"):
+        if is_hidden(img) or any(is_hidden(parent) for parent in img.parents if parent.name != "[document]"):
+            continue
+        raw_src = img.get("data-amsrc") or img.get("src", "")
+        if not raw_src:
+            continue
+        full_img_url = raw_src if raw_src.startswith("http") else urljoin(url, raw_src)
+        if full_img_url in page_seen_images:
+            continue
+        page_seen_images.add(full_img_url)
+        alt_data_for_url.append({"Page URL": url, "Image URL": full_img_url, "Alt Text (AS-IS)": img.get("alt", "")})
+
+    for script in soup.find_all("script", type="text/x-magento-init"):
+        try:
+            cfg = json.loads(script.get_text())
+        except json.JSONDecodeError:
+            continue
+        for val in cfg.values():
+            for item in val.get("mage/gallery/gallery", {}).get("data", []):
+                raw_src = item.get("img") or item.get("full")
+                if not raw_src:
+                    continue
+                full_img_url = raw_src if raw_src.startswith("http") else urljoin(url, raw_src)
+                if full_img_url in page_seen_images:
+                    continue
+                page_seen_images.add(full_img_url)
+                alt_data_for_url.append({"Page URL": url, "Image URL": full_img_url,
+                                         "Alt Text (AS-IS)": item.get("caption", "")})
+    return alt_data_for_url
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    pages = {f"/edge/{name}.html": f"<html><body>{body}</body></html>".encode("utf-8")
+             for name, body in EDGE_CASES.items()}
+    for seed in range(5):
+        pages[f"/product/{seed}.html"] = None
+    for i, path in enumerate(argv):
+        with open(path, "rb") as f:
+            pages[f"/file/{i}.html"] = f.read()
+
+    mismatches = 0
+    with FixtureServer() as server:
+        for path, body in pages.items():
+            if body is None:
+                body = fixtures.product_page(server.base_url, 300, 30, seed=int(path.split("/")[-1].split(".")[0]))
+            url = server.add(path, body)
+            expected = legacy_collect_alt_texts(url, str(body, "utf-8", errors="replace"))
+
+            # 1) 캐시 없이 페이지마다 새로 순회하는 경로
+            fast = collect_alt_texts(url, None)
+
+            # 2) 다른 검사(링크)가 먼저 순회한 결과를 공유하는 경로
+            cache = PageCache()
+            previous = activate_page_cache(cache)
+            try:
+                extract_links(cache.get(url))
+                reused = collect_alt_texts(url, None)
+            finally:
+                activate_page_cache(previous)
+
+            for label, actual in (("fast", fast), ("shared", reused)):
+                if actual != expected:
+                    mismatches += 1
+                    print(f"[ERROR] {path} ({label}): {len(actual)} rows, expected {len(expected)}")
+                    for got, want in zip(actual, expected):
+                        if got != want:
+                            print(f"    first difference: {got} != {want}")
+                            break
+            print(f"[INFO] {path}: {len(expected)} rows")
+
+    if mismatches:
+        print(f"[ERROR] {mismatches} mismatches")
+        return 1
+    print("[INFO] All pages produce identical alt text rows.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+"""
+ResultStore에서 URL 단위로 읽어 만든 리포트/CSV가 기존 방식(전체 결과를 DataFrame으로 합친 뒤 생성)과
+같은지 확인합니다.
+
+빈 값, 정수/소수 혼합, 컬럼이 없는 URL, Audit_URL 행 제외 등을 섞은 합성 결과를 무작위로 만들어
+HTML 리포트(일반/경량)와 SEO/Alt CSV를 두 경로로 만든 뒤 파일 내용을 비교합니다.
+다르면 종료 코드 1을 반환합니다.
+
+사용 예:
+    python benchmarks/verify_result_store.py
+    python benchmarks/verify_result_store.py --trials 2000 --seed 7
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import pandas as pd  # noqa: E402
+
+from report_generator import generate_html_report  # noqa: E402
+from result_store import ResultStore, ALT_COLUMNS  # noqa: E402
+
+FACTORS = ["Title", "Description", "H1", "OG Title", "Canonical"]
+VALUES = [None, 3, 4.5, 12, 120, "이슈 없음", "N/A", float("nan")]
+
+
+def legacy_build_result_frames(results):
+    """변경 전 build_result_frames (비교 기준)"""
+    all_results = []
+    all_alt_data = []
+    for result in results:
+        url = result["url"]
+        df_url = pd.DataFrame([
+            {"URL": url, "항목": k, **v} for k, v in result["meta"].items()
+        ])
+
+        if not df_url.empty:
+            audit_url_value = df_url.loc[df_url['항목'] == 'Audit_URL', '현황'].iloc[0] if 'Audit_URL' in df_url['항목'].values else None
+            if audit_url_value == url:
+                df_url = df_url[df_url['항목'] != 'Audit_URL']
+
+        all_results.append(df_url)
+        all_alt_data.extend(result["alt_data"])
+
+    if not all_results:
+        return None, None
+
+    final_df = pd.concat(all_results, ignore_index=True)
+    alt_df = pd.DataFrame(all_alt_data, columns=ALT_COLUMNS)
+    return final_df, alt_df
+
+
+def random_results(rnd, count):
+    results = []
+    for i in range(count):
+        url = f"https://www.example.com/products/p{i}"
+        meta = {}
+        if rnd.random() < 0.8:
+            meta["Audit_URL"] = {"현황": url if rnd.random() < 0.7 else url + "?redirected=1"}
+        for factor in rnd.sample(FACTORS, rnd.randint(0, len(FACTORS))):
+            row = {"현황": f"{factor} of p{i}"}
+            for column in ("현황_길이", "Comment", "SEO 수정안"):
+                if rnd.random() < 0.7:
+                    row[column] = rnd.choice(VALUES)
+            meta[factor] = row
+        alt_data = [{"Page URL": url, "Image URL": f"https://www.example.com/img/{i}-{n}.jpg",
+                     "Alt Text (AS-IS)": rnd.choice(["", "alt", "상품 이미지"])}
+                    for n in range(rnd.randint(0, 3))]
+        results.append({"url": url, "error": None, "meta": meta, "alt_data": alt_data})
+    return results
+
+
+def read(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def compare(results, workdir):
+    """두 경로의 출력 중 다른 파일 이름 목록을 반환합니다."""
+    urls = [result["url"] for result in results]
+    final_df, alt_df = legacy_build_result_frames(results)
+    store = ResultStore(os.path.join(workdir, "results.sqlite3"))
+    store.clear()
+    for position, result in enumerate(results):
+        store.add(position, result)
+
+    outputs = {}
+    for label in ("legacy", "store"):
+        for compact in (False, True):
+            path = os.path.join(workdir, f"{label}_{compact}.html")
+            if label == "legacy":
+                generate_html_report("T", urls, final_df, alt_df, path, compact=compact, compress=False)
+            else:
+                generate_html_report("T", urls, None, None, path, compact=compact, compress=False,
+                                     result_store=store)
+            outputs.setdefault(f"report_compact={compact}", []).append(read(path))
+        seo_path = os.path.join(workdir, f"{label}_seo.csv")
+        alt_path = os.path.join(workdir, f"{label}_alt.csv")
+        if label == "legacy":
+            final_df.to_csv(seo_path, index=False, encoding="utf-8-sig")
+            alt_df.to_csv(alt_path, index=False, encoding="utf-8-sig")
+        else:
+            store.write_csv(seo_path, alt_path)
+        outputs.setdefault("seo.csv", []).append(read(seo_path))
+        outputs.setdefault("alt.csv", []).append(read(alt_path))
+    store.close()
+    return [name for name, (legacy, streamed) in outputs.items() if legacy != streamed]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ResultStore 기반 리포트/CSV가 기존 결과와 같은지 확인합니다.")
+    parser.add_argument("--trials", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rnd = random.Random(args.seed)
+    mismatches = 0
+    for trial in range(args.trials):
+        results = random_results(rnd, rnd.randint(1, 6))
+        with tempfile.TemporaryDirectory() as workdir:
+            different = compare(results, workdir)
+        if different:
+            mismatches += 1
+            if mismatches <= 3:
+                print(f"[ERROR] trial {trial}: {', '.join(different)} differ")
+                print(f"    results: {results}")
+
+    if mismatches:
+        print(f"[ERROR] {mismatches}/{args.trials} trials differ")
+        return 1
+    print(f"[INFO] All {args.trials} trials produce identical reports and CSV files.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
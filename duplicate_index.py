@@ -0,0 +1,225 @@
+import hashlib
+
+from report_generator import text_of
+
+# 페이지 간 중복을 찾는 리포트 항목 (현황 값 기준)
+DUPLICATE_FACTORS = ("Title", "Description", "OG Title", "H1")
+# 근접 중복 기준: 문자 SHINGLE_SIZE-gram 집합의 Jaccard 유사도(MinHash 추정값)가 이 값 이상이면 같은 묶음
+NEAR_DUPLICATE_THRESHOLD = 0.85
+SHINGLE_SIZE = 3
+# 이보다 짧은 값은 완전 중복만 확인 (짧은 값은 한 글자만 달라도 유사도가 높아 "상품 1001"/"상품 1002"가 묶임)
+NEAR_DUPLICATE_MIN_LENGTH = 20
+# MinHash 서명 길이와 LSH band 수 (band당 NUM_PERM // LSH_BANDS개 값, 후보가 되는 유사도 약 0.7 이상)
+NUM_PERM = 128
+LSH_BANDS = 16
+# 같은 입력이면 실행마다 같은 묶음이 나오도록 해시 계수를 고정된 seed로 만듦
+MINHASH_SEED = 20240601
+# 리포트에 표시하는 묶음 수(항목별)와 값별 URL 수. 나머지는 개수만 표시
+REPORT_GROUP_LIMIT = 200
+REPORT_URL_LIMIT = 50
+# 값이 없다는 뜻의 현황은 중복으로 보지 않음
+_EMPTY_VALUES = {"", "-", "n/a", "none", "null", "없음"}
+_SHINGLE_MULTIPLIER = 0x100000001B3
+_VERIFY_BATCH = 100_000
+# MinHash 추정값만으로 판단하지 않고 정확히 확인하는 범위 (기준 ± 이 값, 128개 기준 추정 표준편차는 약 0.03)
+_ESTIMATE_MARGIN = 0.1
+
+
+class DuplicateIndex:
+    """
+    여러 페이지의 Title, Description, OG Title, H1 현황 값에서 페이지 간 중복을 찾는 색인입니다.
+    - 완전 중복: 정규화한 값의 해시로 묶으므로 URL 수와 관계없이 URL 하나를 추가하는 비용이 일정합니다.
+    - 근접 중복: 서로 다른 값마다 MinHash 서명을 결과가 들어오는 대로 계산해 두고, clusters()에서
+      LSH band 값을 정렬해 같은 bucket의 값만 비교하므로 값 쌍을 모두 비교하지 않습니다.
+    add()는 한 스레드에서만 호출해야 합니다. (AuditEngine의 on_result 콜백)
+    """
+
+    def __init__(self, factors=DUPLICATE_FACTORS, threshold=NEAR_DUPLICATE_THRESHOLD):
+        # numpy(pandas 의존성)는 색인을 만들 때만 import (앱 시작 시간 단축)
+        import numpy as np
+
+        self._np = np
+        self.factors = tuple(factors)
+        self.threshold = threshold
+        rng = np.random.default_rng(MINHASH_SEED)
+        # h(x) = (a * x + b) mod 2^64의 상위 32비트 (a는 홀수)
+        self._hash_a = rng.integers(0, 2 ** 63, size=NUM_PERM, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._hash_b = rng.integers(0, 2 ** 63, size=NUM_PERM, dtype=np.uint64)
+        self._band_weights = rng.integers(0, 2 ** 63, size=NUM_PERM // LSH_BANDS, dtype=np.uint64)
+        self._keys = {}
+        # 값 번호별 [항목, 표시 텍스트, URL 목록]. 서명은 같은 번호의 행
+        self._values = []
+        self._signatures = np.empty((256, NUM_PERM), dtype=np.uint32)
+        self._positions = set()
+
+    def __len__(self):
+        return len(self._positions)
+
+    def _signature(self, text):
+        np = self._np
+        codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+        count = max(1, len(codes) - SHINGLE_SIZE + 1)
+        shingles = np.zeros(count, dtype=np.uint64)
+        for offset in range(min(SHINGLE_SIZE, len(codes))):
+            shingles = shingles * np.uint64(_SHINGLE_MULTIPLIER) + codes[offset:offset + count]
+        shingles = np.unique(shingles)
+        hashed = (shingles[:, None] * self._hash_a + self._hash_b) >> np.uint64(32)
+        return hashed.min(axis=0).astype(np.uint32)
+
+    def add(self, position, result):
+        """position(입력 순서) URL의 결과를 색인에 추가합니다. 실패한 결과와 이미 추가한 position은 무시합니다."""
+        if result["error"] or position in self._positions:
+            return
+        self._positions.add(position)
+        url = result["url"]
+        meta = result["meta"]
+        for factor in self.factors:
+            values = meta.get(factor)
+            status = values.get("현황") if isinstance(values, dict) else None
+            if not isinstance(status, str):
+                # 빈 값(None, NaN)이나 숫자
+                status = "" if status is None or status != status else str(status)
+            text = text_of(status)
+            normalized = " ".join(text.split()).casefold()
+            if normalized in _EMPTY_VALUES:
+                continue
+            key = (factor, hashlib.blake2b(normalized.encode("utf-8"), digest_size=8).digest())
+            value_id = self._keys.get(key)
+            if value_id is None:
+                value_id = self._keys[key] = len(self._values)
+                self._values.append([factor, text, []])
+                if value_id == len(self._signatures):
+                    self._signatures = self._np.concatenate([self._signatures, self._np.empty_like(self._signatures)])
+                self._signatures[value_id] = self._signature(normalized)
+            # 결과가 완료 순서대로 들어오므로 (position, url)로 보관해 리포트는 입력 순서로 만듦
+            urls = self._values[value_id][2]
+            if not urls or urls[-1][1] != url:
+                urls.append((position, url))
+
+    def update_from_store(self, result_store):
+        """
+        result_store에 있지만 아직 색인에 없는 결과를 추가합니다.
+        (--resume으로 이어서 실행했거나 다른 워커가 처리한 URL)
+        """
+        missing = [position for position, _, error in result_store.summaries()
+                   if not error and position not in self._positions]
+        for position, result in result_store.iter_results_at(missing):
+            self.add(position, result)
+
+    def _similar_pairs(self, rank):
+        """
+        LSH로 고른 후보 중 실제로 비슷한 값 쌍 (값 번호, 값 번호) 목록.
+        band마다 서명 조각의 해시로 정렬해 같은 bucket끼리 모으고, bucket에서 rank가 가장 앞선 값과 나머지를 후보로 만듭니다.
+        """
+        np = self._np
+        count = len(self._values)
+        signatures = self._signatures[:count]
+        factor_ids = {factor: i for i, factor in enumerate(self.factors)}
+        factor_salt = np.array([factor_ids[value[0]] for value in self._values], dtype=np.uint64)
+        eligible = np.array([len(value[1]) >= NEAR_DUPLICATE_MIN_LENGTH for value in self._values])
+        rows = NUM_PERM // LSH_BANDS
+        firsts, seconds = [], []
+        for band in range(LSH_BANDS):
+            block = signatures[:, band * rows:(band + 1) * rows].astype(np.uint64)
+            keys = (block * self._band_weights).sum(axis=1) ^ (factor_salt * np.uint64(_SHINGLE_MULTIPLIER))
+            order = np.lexsort((rank, keys))
+            sorted_keys = keys[order]
+            starts = np.flatnonzero(np.concatenate(([True], sorted_keys[1:] != sorted_keys[:-1])))
+            heads = np.repeat(starts, np.diff(np.append(starts, count)))
+            members = (heads != np.arange(count)) & eligible[order] & eligible[order[heads]]
+            firsts.append(order[heads[members]])
+            seconds.append(order[members])
+        pairs = np.unique(np.stack([np.concatenate(firsts), np.concatenate(seconds)], axis=1), axis=0)
+
+        # 서명이 같은 비율(Jaccard 추정값)이 기준에서 충분히 멀면 그대로 판단하고, 경계에 있는 쌍만 shingle 집합으로 확인
+        similar = []
+        for start in range(0, len(pairs), _VERIFY_BATCH):
+            batch = pairs[start:start + _VERIFY_BATCH]
+            agreement = (signatures[batch[:, 0]] == signatures[batch[:, 1]]).mean(axis=1)
+            similar.extend(batch[agreement >= self.threshold + _ESTIMATE_MARGIN].tolist())
+            borderline = (agreement >= self.threshold - _ESTIMATE_MARGIN) & (agreement < self.threshold + _ESTIMATE_MARGIN)
+            # 쌍은 첫 값 순서로 정렬되어 있으므로 첫 값의 집합은 연속한 쌍에서 재사용
+            current, a = None, None
+            for first, second in batch[borderline].tolist():
+                if first != current:
+                    current, a = first, self._shingle_set(first)
+                b = self._shingle_set(second)
+                if len(a & b) >= self.threshold * len(a | b):
+                    similar.append((first, second))
+        return similar
+
+    def _shingle_set(self, value_id):
+        normalized = " ".join(self._values[value_id][1].split()).casefold()
+        return {normalized[i:i + SHINGLE_SIZE] for i in range(max(1, len(normalized) - SHINGLE_SIZE + 1))}
+
+    def clusters(self, group_limit=REPORT_GROUP_LIMIT, url_limit=REPORT_URL_LIMIT):
+        """
+        두 페이지 이상이 같은(또는 거의 같은) 값을 쓰는 묶음을 항목별로 페이지 수가 많은 순서로 반환합니다.
+        {"pages": 중복이 있는 페이지 수, "groups": 묶음 수,
+         "factors": [{"factor", "group_count", "page_count", "more": 표시하지 않은 묶음 수,
+                      "groups": [{"kind": "exact"/"near", "pages", "entries": [{"text", "urls", "more"}]}]}]}
+        비교할 때는 HTML 태그를 뺀 텍스트의 공백을 하나로 줄이고 대소문자를 무시합니다.
+        중복이 하나도 없으면 None을 반환합니다.
+        """
+        # URL이 많은 값부터 묶음의 기준이 되고, 기준 값과 비슷한 값만 같은 묶음에 넣음
+        # (비슷한 값을 이어 붙이면 "상품 1001", "상품 1002", ...처럼 템플릿 값이 전부 한 묶음이 되므로)
+        count = len(self._values)
+        # 같은 URL 수끼리는 입력 순서가 앞선 값부터 (URL이 완료되는 순서와 관계없이 같은 결과)
+        ordered = [[factor, text, [url for _, url in sorted(urls)]] for factor, text, urls in self._values]
+        first_position = [min(urls)[0] for _, _, urls in self._values]
+        order = sorted(range(count), key=lambda value_id: (-len(ordered[value_id][2]), first_position[value_id]))
+        neighbors = {}
+        if count > 1:
+            rank = self._np.empty(count, dtype=self._np.int64)
+            rank[order] = self._np.arange(count)
+            for first, second in self._similar_pairs(rank):
+                neighbors.setdefault(first, []).append(second)
+                neighbors.setdefault(second, []).append(first)
+        leader_of = {}
+        members = {}
+        for value_id in order:
+            if value_id in leader_of:
+                continue
+            leader_of[value_id] = value_id
+            group = members[value_id] = [value_id]
+            for neighbor in sorted(neighbors.get(value_id, ()), key=lambda neighbor: rank[neighbor]):
+                if neighbor not in leader_of:
+                    leader_of[neighbor] = value_id
+                    group.append(neighbor)
+
+        by_factor = {factor: [] for factor in self.factors}
+        for value_ids in members.values():
+            values = [ordered[value_id] for value_id in value_ids]
+            pages = {url for _, _, urls in values for url in urls}
+            if len(pages) < 2:
+                continue
+            by_factor[values[0][0]].append({
+                "kind": "exact" if len(values) == 1 else "near",
+                "pages": len(pages),
+                "entries": [{"text": text, "urls": urls[:url_limit], "more": max(0, len(urls) - url_limit)}
+                            for _, text, urls in values],
+                "_urls": pages,
+            })
+
+        factors = []
+        all_pages = set()
+        for factor, groups in by_factor.items():
+            if not groups:
+                continue
+            groups.sort(key=lambda group: group["pages"], reverse=True)
+            factor_pages = set()
+            for group in groups:
+                factor_pages.update(group.pop("_urls"))
+            all_pages.update(factor_pages)
+            factors.append({"factor": factor, "group_count": len(groups), "page_count": len(factor_pages),
+                            "groups": groups[:group_limit], "more": max(0, len(groups) - group_limit)})
+        if not factors:
+            return None
+        return {"pages": len(all_pages), "groups": sum(factor["group_count"] for factor in factors),
+                "factors": factors}
+
+
+def duplicate_summary(duplicates):
+    """clusters() 결과를 로그 한 줄로 요약합니다. (예: "Title 3 groups, H1 1 groups across 12 URLs")"""
+    factors = ", ".join(f"{factor['factor']} {factor['group_count']} groups" for factor in duplicates["factors"])
+    return f"{factors} across {duplicates['pages']} URLs"
@@ -0,0 +1,119 @@
+from report_generator import LENGTH_CHECK_ROWS, get_tab_name, iter_report_tabs, iter_store_report_tabs, text_of
+
+SEO_HEADERS = ["항목", "현황", "길이", "Comment", "SEO 수정안", "길이"]
+ALT_HEADERS = ["Image URL", "Alt Text (AS-IS)", "SEO Comment", "Alt Text (To-Be)"]
+SEO_COLUMN_WIDTHS = [18, 50, 6, 30, 50, 6]
+SHARED_IMAGE_HEADERS = ["Image URL", "Alt Text (AS-IS)", "SEO Comment", "페이지 수", "표시한 시트 URL"]
+HEAVY_IMAGE_HEADERS = ["Image URL", "용량 (KB)", "해상도", "형식", "페이지 수", "처음 나온 URL"]
+IMAGE_COLUMN_WIDTHS = [60, 30, 12, 12, 10, 50]
+IMAGES_SHEET_NAME = "Images"
+# Excel 시트 이름 제한: 31자, \ / * ? : [ ] 사용 불가
+SHEET_NAME_MAX = 31
+_SHEET_NAME_INVALID = str.maketrans({c: "_" for c in "\\/*?:[]"})
+
+
+def sheet_name_for(url, used_names):
+    """탭 이름으로 시트 이름을 만듭니다. (브라우저 내보내기와 같이 뒤 31자 사용, 중복이면 번호를 붙임)"""
+    base = (get_tab_name(url) or "").translate(_SHEET_NAME_INVALID)[-SHEET_NAME_MAX:] or "Sheet"
+    name, number = base, 1
+    while name.lower() in used_names:
+        number += 1
+        suffix = f" ({number})"
+        name = base[:SHEET_NAME_MAX - len(suffix)] + suffix
+    used_names.add(name.lower())
+    return name
+
+
+def iter_sheet_rows(tab):
+    """
+    탭 하나의 시트 행을 (값 목록, 제목 행 여부)로 위에서부터 하나씩 만들어 냅니다.
+    (SEO QA 표, 빈 줄, Image Alt QA 표 순서. 길이 열이 없는 항목도 열 위치를 맞춰 빈 칸으로 채움)
+    """
+    yield ["SEO QA"], True
+    yield SEO_HEADERS, True
+    for row in tab["seo_rows"]:
+        status = text_of(row["status"])
+        comment = text_of(row["comment"])
+        seo_fix = text_of(row["seo_fix"])
+        if row["factor"] in LENGTH_CHECK_ROWS:
+            yield [row["factor"], status, row["status_length"], comment, seo_fix, f"{len(seo_fix)}자"], False
+        else:
+            yield [row["factor"], status, "", comment, seo_fix, ""], False
+    yield [], False
+    if tab["alt_rows"]:
+        yield ["Image Alt QA"], True
+        yield ALT_HEADERS, True
+        for alt in tab["alt_rows"]:
+            yield [alt["image_url"], alt["alt_asis"], alt["comment"], alt["alt_to_be"]], False
+
+
+def iter_image_sheet_rows(images):
+    """ImageRegistry.summary()의 공통 이미지, 용량 큰 이미지 표를 (값 목록, 제목 행 여부)로 만들어 냅니다."""
+    if images["shared"]:
+        yield ["공통 이미지 (처음 나온 시트의 Image Alt QA에만 표시)"], True
+        yield SHARED_IMAGE_HEADERS, True
+        for image in images["shared"]:
+            yield [image["image_url"], image["alt_asis"], image["comment"], image["pages"], image["first_url"]], False
+        if images["shared_more"]:
+            yield [f"외 {images['shared_more']}개"], False
+        yield [], False
+    if images["heavy"]:
+        yield ["용량 큰 이미지"], True
+        yield HEAVY_IMAGE_HEADERS, True
+        for image in images["heavy"]:
+            yield [image["image_url"], image["kilobytes"], image["dimensions"], image["content_type"],
+                   image["pages"], image["first_url"]], False
+        if images["heavy_more"]:
+            yield [f"외 {images['heavy_more']}개"], False
+
+
+def write_xlsx_report(urls, output_path, final_df=None, alt_df=None, result_store=None, images=None):
+    """
+    HTML 리포트와 같은 내용(URL별 시트에 SEO QA, Image Alt QA 표)을 .xlsx 파일로 저장합니다.
+    openpyxl의 write-only 통합 문서에 URL 단위로 행을 바로 흘려 쓰므로, 이미지 행이 수만 개여도
+    메모리 사용량이 일정하고 처리 시간은 행 수에 비례합니다.
+    result_store(ResultStore)를 넘기면 urls, final_df, alt_df 대신 저장소에 기록된 순서대로 URL 단위로 읽습니다.
+    images(ImageRegistry.summary())를 넘기면 HTML 리포트처럼 공통 이미지는 처음 나온 시트에만 넣고
+    공통 이미지와 용량 큰 이미지는 마지막 "Images" 시트에 따로 씁니다.
+    openpyxl이 없으면 ImportError를 그대로 전달합니다.
+    """
+    # openpyxl은 Excel 파일을 만들 때만 import (앱 시작 시간 단축)
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+    from openpyxl.styles import Font
+
+    bold = Font(bold=True)
+    workbook = Workbook(write_only=True)
+    shared_images = images["shared_keys"] if images else None
+    tabs = (iter_store_report_tabs(result_store, shared_images) if result_store is not None
+            else iter_report_tabs(urls, final_df, alt_df, shared_images))
+    # "History"는 Excel이 예약한 시트 이름
+    used_names = {"history"}
+    if images:
+        used_names.add(IMAGES_SHEET_NAME.lower())
+
+    def write_rows(sheet, rows, widths):
+        for index, width in enumerate(widths):
+            sheet.column_dimensions[chr(ord("A") + index)].width = width
+        for row, heading in rows:
+            # 제어 문자는 xlsx에 저장할 수 없으므로 제거
+            values = [ILLEGAL_CHARACTERS_RE.sub("", value) if isinstance(value, str) else value for value in row]
+            if heading:
+                cells = [WriteOnlyCell(sheet, value) for value in values]
+                for cell in cells:
+                    cell.font = bold
+                sheet.append(cells)
+            else:
+                sheet.append(values)
+        # 시트마다 임시 파일과 XML writer가 저장 때까지 열려 있지 않도록 다 쓴 시트는 바로 닫음
+        sheet.close()
+
+    for tab in tabs:
+        write_rows(workbook.create_sheet(sheet_name_for(tab["url"], used_names)), iter_sheet_rows(tab),
+                   SEO_COLUMN_WIDTHS)
+    if images and (images["shared"] or images["heavy"]):
+        write_rows(workbook.create_sheet(IMAGES_SHEET_NAME), iter_image_sheet_rows(images), IMAGE_COLUMN_WIDTHS)
+    if not workbook.worksheets:
+        workbook.create_sheet("Report")
+    workbook.save(output_path)
@@ -0,0 +1,230 @@
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from audit_stats import record_request, record_bytes
+
+DEFAULT_TIMEOUT = 10
+# 연결 실패, 읽기 오류, 아래 상태 코드는 최대 DEFAULT_MAX_RETRIES번 다시 시도 (0.5s, 1s, 2s ... 간격)
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.5
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# 호스트별 동시 요청 수와 초당 요청 수 (None이면 제한 없음)
+DEFAULT_PER_HOST_CONCURRENCY = 6
+DEFAULT_PER_HOST_RATE = None
+# 응답 본문 최대 크기 (사이트맵 최대 크기 50MB보다 약간 크게)
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_POOL_SIZE = 32
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class ResponseTooLarge(requests.exceptions.RequestException):
+    """응답 본문이 max_bytes를 넘은 경우 (다른 네트워크 오류와 같은 방식으로 처리되도록 RequestException 상속)"""
+
+
+class _HostGate:
+    """호스트 하나에 대한 동시 요청 수 제한과 요청 시작 간격(rate limit)을 관리합니다."""
+
+    def __init__(self, concurrency, rate):
+        self._slots = threading.BoundedSemaphore(max(1, concurrency))
+        self._interval = 1.0 / rate if rate else 0.0
+        self._next_start = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """슬롯을 얻을 때까지 기다리고, 기다린 시간(초)을 반환합니다."""
+        started = time.monotonic()
+        self._slots.acquire()
+        if self._interval:
+            with self._lock:
+                now = time.monotonic()
+                start_at = max(now, self._next_start)
+                self._next_start = start_at + self._interval
+            if start_at > now:
+                time.sleep(start_at - now)
+        return time.monotonic() - started
+
+    def release(self):
+        self._slots.release()
+
+
+def _wire_bytes(response, received):
+    """
+    지금까지 네트워크로 받은 본문 크기(bytes). Content-Encoding(gzip 등)으로 압축된 응답은 풀기 전 크기입니다.
+    urllib3는 chunked 응답의 위치를 세지 않으므로(tell()이 0) 이때는 받은 본문 크기(received)를 사용합니다.
+    (chunked이면서 압축된 응답만 실제 전송량보다 크게 집계됨)
+    """
+    return response.raw.tell() or received
+
+
+class StreamedResponse:
+    """
+    HttpClient.open_stream()이 반환하는 스트리밍 응답입니다.
+    본문을 읽는 동안 호스트 슬롯을 유지하며, close()(또는 with 블록 종료) 시 연결과 슬롯을 반환합니다.
+    """
+
+    def __init__(self, client, response, release):
+        self._client = client
+        self._response = response
+        self._release = release
+        self.status_code = response.status_code
+        self.headers = response.headers
+        self.url = response.url
+
+    def iter_content(self, chunk_size=STREAM_CHUNK_SIZE):
+        # 크기 제한은 풀린 본문 기준, 전송량은 네트워크로 받은 크기 기준
+        received = 0
+        counted = 0
+        for chunk in self._response.iter_content(chunk_size):
+            received += len(chunk)
+            if received > self._client.max_bytes:
+                raise ResponseTooLarge(f"Response exceeds {self._client.max_bytes} bytes: {self.url}")
+            wire = _wire_bytes(self._response, received)
+            if wire > counted:
+                self._client._count_bytes(wire - counted)
+                record_bytes(wire - counted)
+                counted = wire
+            yield chunk
+
+    def close(self):
+        if self._release is not None:
+            self._response.close()
+            self._release()
+            self._release = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class HttpClient:
+    """
+    모든 페이지/사이트맵/robots.txt 요청이 공유하는 HTTP 클라이언트입니다.
+    Session 연결 풀(keep-alive), 재시도와 backoff, 호스트별 동시 요청 수/초당 요청 수 제한,
+    응답 크기 제한을 적용하고, 요청 수와 전송량을 집계합니다. (audit_stats 단계에도 기록)
+    """
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, max_retries=DEFAULT_MAX_RETRIES,
+                 backoff_factor=DEFAULT_BACKOFF_FACTOR, per_host_concurrency=DEFAULT_PER_HOST_CONCURRENCY,
+                 per_host_rate=DEFAULT_PER_HOST_RATE, max_bytes=DEFAULT_MAX_BYTES, pool_size=DEFAULT_POOL_SIZE):
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.per_host_concurrency = per_host_concurrency
+        self.per_host_rate = per_host_rate
+        self.session = requests.Session()
+        retry = Retry(total=max_retries, connect=max_retries, read=max_retries, status=max_retries,
+                      backoff_factor=backoff_factor, status_forcelist=RETRY_STATUSES,
+                      allowed_methods=frozenset(["GET", "HEAD"]), respect_retry_after_header=True,
+                      raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._gates = {}
+        self._lock = threading.Lock()
+        self._counters = {"requests": 0, "bytes": 0, "retries": 0, "throttled_seconds": 0.0}
+
+    def _gate_for(self, url):
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            gate = self._gates.get(host)
+            if gate is None:
+                gate = self._gates[host] = _HostGate(self.per_host_concurrency, self.per_host_rate)
+            return gate
+
+    def _count_bytes(self, nbytes):
+        with self._lock:
+            self._counters["bytes"] += nbytes
+
+    def _count_request(self, response, waited):
+        retries = getattr(getattr(response.raw, "retries", None), "history", None) or ()
+        with self._lock:
+            self._counters["requests"] += 1
+            self._counters["retries"] += len(retries)
+            self._counters["throttled_seconds"] += waited
+
+    def _send(self, method, url, headers, timeout):
+        gate = self._gate_for(url)
+        waited = gate.acquire()
+        try:
+            response = self.session.request(method, url, headers=headers, stream=True,
+                                            timeout=self.timeout if timeout is None else timeout)
+        except BaseException:
+            gate.release()
+            raise
+        self._count_request(response, waited)
+        return response, gate.release
+
+    def get(self, url, headers=None, timeout=None):
+        """
+        url을 GET으로 요청하고 본문을 모두 읽은 requests.Response를 반환합니다.
+        재시도 후에도 실패한 상태 코드는 그대로 반환하며, 네트워크 오류와 크기 초과는
+        requests.exceptions.RequestException으로 전달됩니다.
+        """
+        response, release = self._send("GET", url, headers, timeout)
+        try:
+            body = []
+            received = 0
+            for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+                received += len(chunk)
+                if received > self.max_bytes:
+                    raise ResponseTooLarge(f"Response exceeds {self.max_bytes} bytes: {url}")
+                body.append(chunk)
+            response._content = b"".join(body)
+            wire = _wire_bytes(response, received)
+        finally:
+            response.close()
+            release()
+        self._count_bytes(wire)
+        record_request(wire)
+        return response
+
+    def head(self, url, headers=None, timeout=None):
+        """url을 HEAD로 요청하고 응답(본문 없음)을 반환합니다. 리다이렉트는 따라갑니다."""
+        response, release = self._send("HEAD", url, headers, timeout)
+        response.close()
+        release()
+        record_request()
+        return response
+
+    def open_stream(self, url, headers=None, timeout=None):
+        """본문을 조각 단위로 읽는 StreamedResponse를 반환합니다. 반드시 close()하거나 with 블록에서 사용해야 합니다."""
+        response, release = self._send("GET", url, headers, timeout)
+        record_request()
+        return StreamedResponse(self, response, release)
+
+    def snapshot(self):
+        """지금까지의 요청 수, 전송량(네트워크로 받은 본문 bytes), 재시도 수, 제한으로 기다린 시간을 반환합니다."""
+        with self._lock:
+            return dict(self._counters)
+
+
+_default_client = None
+_default_client_lock = threading.Lock()
+
+
+def get_http_client():
+    """프로세스 전체에서 공유하는 기본 HttpClient를 반환합니다."""
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = HttpClient()
+        return _default_client
+
+
+def configure_http_client(**options):
+    """기본 HttpClient를 주어진 설정(HttpClient 인자)으로 새로 만들어 교체하고 반환합니다."""
+    global _default_client
+    with _default_client_lock:
+        _default_client = HttpClient(**options)
+        return _default_client
+
+
+def http_counters_delta(before, after):
+    """snapshot() 두 개의 차이 (실행 한 번 동안의 요청 수/전송량)"""
+    return {key: round(after[key] - before.get(key, 0), 3) for key in after}
@@ -0,0 +1,365 @@
+import os
+import sqlite3
+import struct
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from audit_stats import current_stages, bound_stages
+from http_client import get_http_client
+from report_generator import build_alt_row
+
+DEFAULT_IMAGE_CACHE_PATH = os.path.join("audit_cache", "image_info.sqlite3")
+# 확인한 이미지 정보를 재사용하는 기간(초). 이미지는 링크보다 드물게 바뀌므로 링크 상태보다 길게 유지
+IMAGE_INFO_TTL = 7 * 24 * 60 * 60
+IMAGE_PROBE_WORKERS = 8
+# 이미지 하나당 Range 요청으로 받는 최대 바이트 수 (해상도는 파일 앞부분의 헤더에서 읽음.
+# JPEG는 EXIF/ICC 데이터 뒤에 크기 정보가 있어 조금 넉넉하게 받음)
+PROBE_RANGE_BYTES = 32 * 1024
+# 이 크기 이상인 이미지를 리포트에 '용량 큰 이미지'로 표시
+HEAVY_IMAGE_BYTES = 300 * 1024
+# 리포트에 표시하는 공통 이미지/용량 큰 이미지 행 수. 나머지는 개수만 표시
+REPORT_IMAGE_LIMIT = 200
+
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+def image_dimensions(head):
+    """
+    이미지 파일 앞부분(head)에서 (가로, 세로) 픽셀 크기를 읽습니다. PNG, GIF, JPEG, WebP를 지원하며
+    형식을 모르거나 head에 크기 정보가 아직 없으면 None을 반환합니다. (SVG처럼 크기가 없는 형식도 None)
+    """
+    if head.startswith(b"\x89PNG\r\n\x1a\n") and len(head) >= 24:
+        return struct.unpack(">II", head[16:24])
+    if head[:6] in (b"GIF87a", b"GIF89a") and len(head) >= 10:
+        return struct.unpack("<HH", head[6:10])
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP" and len(head) >= 30:
+        chunk = head[12:16]
+        if chunk == b"VP8 ":
+            width, height = struct.unpack("<HH", head[26:30])
+            return width & 0x3FFF, height & 0x3FFF
+        if chunk == b"VP8L":
+            bits = int.from_bytes(head[21:25], "little")
+            return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+        if chunk == b"VP8X":
+            return int.from_bytes(head[24:27], "little") + 1, int.from_bytes(head[27:30], "little") + 1
+        return None
+    if head[:2] == b"\xff\xd8":
+        # 마커를 따라가며 SOF(프레임 시작) 세그먼트의 크기 정보를 찾음
+        offset = 2
+        while offset + 9 <= len(head):
+            if head[offset] != 0xFF:
+                return None
+            marker = head[offset + 1]
+            if marker == 0xFF:
+                offset += 1
+                continue
+            if marker in _JPEG_SOF_MARKERS:
+                height, width = struct.unpack(">HH", head[offset + 5:offset + 9])
+                return width, height
+            offset += 2 + struct.unpack(">H", head[offset + 2:offset + 4])[0]
+    return None
+
+
+class ImageInfo:
+    """이미지 하나의 확인 결과. status_code가 None이면 네트워크 오류(error에 내용)입니다."""
+    __slots__ = ("url", "status_code", "content_type", "byte_size", "width", "height", "error", "checked_at")
+
+    def __init__(self, url, status_code, content_type=None, byte_size=None, width=None, height=None,
+                 error=None, checked_at=None):
+        self.url = url
+        self.status_code = status_code
+        self.content_type = content_type
+        self.byte_size = byte_size
+        self.width = width
+        self.height = height
+        self.error = error
+        self.checked_at = time.time() if checked_at is None else checked_at
+
+    @property
+    def heavy(self):
+        return self.byte_size is not None and self.byte_size >= HEAVY_IMAGE_BYTES
+
+    @property
+    def persistable(self):
+        # 네트워크 오류와 5xx는 일시적일 수 있으므로 이번 실행 안에서만 재사용
+        return self.status_code is not None and self.status_code < 500
+
+
+def _total_size(response):
+    # 206이면 Content-Range의 전체 크기, 서버가 Range를 무시하고 200으로 보내면 Content-Length
+    content_range = response.headers.get("Content-Range", "")
+    if response.status_code == 206 and "/" in content_range:
+        total = content_range.rsplit("/", 1)[1].strip()
+        return int(total) if total.isdigit() else None
+    length = response.headers.get("Content-Length", "")
+    return int(length) if response.status_code == 200 and length.isdigit() else None
+
+
+class ImageProber:
+    """
+    이미지 URL의 용량, 해상도, Content-Type을 확인하고 실행 간에도(TTL 동안) 공유하는 캐시입니다.
+    이미지 하나당 앞부분만 받는 Range GET 요청 한 번으로 전체 크기(Content-Range)와 헤더의 해상도를 함께 얻습니다.
+    prefetch()로 Audit 도중 새 이미지를 미리 확인해 두고, check()에서 기다린 뒤 결과를 한 번에 SQLite에 저장합니다.
+    """
+
+    def __init__(self, db_path=DEFAULT_IMAGE_CACHE_PATH, ttl=IMAGE_INFO_TTL, max_workers=IMAGE_PROBE_WORKERS):
+        self.db_path = db_path
+        self.ttl = ttl
+        self._memory = {}
+        self._pending = {}
+        self._unsaved = []
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="image-probe")
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS image_info (
+                    url TEXT PRIMARY KEY,
+                    status_code INTEGER,
+                    content_type TEXT,
+                    byte_size INTEGER,
+                    width INTEGER,
+                    height INTEGER,
+                    checked_at REAL
+                ) WITHOUT ROWID""")
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _load(self, urls):
+        found = {}
+        oldest = time.time() - self.ttl
+        with self._connect() as conn:
+            for start in range(0, len(urls), 500):
+                batch = urls[start:start + 500]
+                rows = conn.execute(
+                    f"SELECT url, status_code, content_type, byte_size, width, height, checked_at FROM image_info "
+                    f"WHERE checked_at >= ? AND url IN ({','.join('?' * len(batch))})",
+                    [oldest, *batch]).fetchall()
+                for url, status_code, content_type, byte_size, width, height, checked_at in rows:
+                    found[url] = ImageInfo(url, status_code, content_type, byte_size, width, height,
+                                           checked_at=checked_at)
+        return found
+
+    def _save(self):
+        with self._lock:
+            infos, self._unsaved = self._unsaved, []
+        rows = [(i.url, i.status_code, i.content_type, i.byte_size, i.width, i.height, i.checked_at)
+                for i in infos if i.persistable]
+        if not rows:
+            return
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO image_info (url, status_code, content_type, byte_size, width, height, "
+                "checked_at) VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def _probe(self, url, stages):
+        with bound_stages(stages):
+            try:
+                with get_http_client().open_stream(url, headers={"Range": f"bytes=0-{PROBE_RANGE_BYTES - 1}"}) as response:
+                    if response.status_code >= 400:
+                        info = ImageInfo(url, response.status_code)
+                    else:
+                        # 206(부분 응답)은 PROBE_RANGE_BYTES 이하이므로 끝까지 읽어 연결을 다음 요청에 재사용하고,
+                        # Range를 무시하고 전체를 보내는 서버(200)는 해상도를 읽을 만큼만 받고 연결을 닫음
+                        partial = response.status_code == 206
+                        head = b""
+                        dimensions = None
+                        for chunk in response.iter_content(8 * 1024):
+                            if len(head) < PROBE_RANGE_BYTES:
+                                head += chunk
+                                dimensions = dimensions or image_dimensions(head)
+                            if not partial and (dimensions or len(head) >= PROBE_RANGE_BYTES):
+                                break
+                        content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+                        width, height = dimensions or (None, None)
+                        info = ImageInfo(url, response.status_code, content_type or None, _total_size(response),
+                                         width, height)
+            except requests.exceptions.RequestException as e:
+                info = ImageInfo(url, None, error=str(e))
+        with self._lock:
+            self._memory[url] = info
+            self._pending.pop(url, None)
+            self._unsaved.append(info)
+        return info
+
+    def _schedule(self, urls, submit):
+        """캐시에 있는 결과와 진행 중인 요청을 모으고, submit이면 나머지를 요청합니다. ({url: 결과}, {url: future})"""
+        unique = [url for url in dict.fromkeys(urls) if url.startswith(("http://", "https://"))]
+        now = time.time()
+        results = {}
+        waiting = {}
+        missing = []
+        with self._lock:
+            for url in unique:
+                info = self._memory.get(url)
+                if info is not None and now - info.checked_at < self.ttl:
+                    results[url] = info
+                elif url in self._pending:
+                    waiting[url] = self._pending[url]
+                else:
+                    missing.append(url)
+        if missing:
+            stored = self._load(missing)
+            stages = current_stages()
+            with self._lock:
+                for url in missing:
+                    if url in stored:
+                        self._memory[url] = results[url] = stored[url]
+                    elif url in self._pending:
+                        waiting[url] = self._pending[url]
+                    elif submit:
+                        waiting[url] = self._pending[url] = self._pool.submit(self._probe, url, stages)
+        return results, waiting
+
+    def prefetch(self, urls):
+        """확인하지 않은 이미지 요청을 시작만 하고 바로 반환합니다. (결과는 check()에서 사용)"""
+        self._schedule(urls, submit=True)
+
+    def check(self, urls):
+        """urls의 정보를 {url: ImageInfo}로 반환합니다. 캐시에 없는 이미지만 동시에 요청하며, http(s)가 아닌 URL은 제외합니다."""
+        results, waiting = self._schedule(urls, submit=True)
+        for url, future in waiting.items():
+            results[url] = future.result()
+        self._save()
+        return results
+
+    def cached(self, urls):
+        """요청 없이 캐시(메모리, SQLite)에 있는 정보만 {url: ImageInfo}로 반환합니다."""
+        return self._schedule(urls, submit=False)[0]
+
+
+_default_prober = None
+_default_prober_lock = threading.Lock()
+
+
+def get_image_prober():
+    """프로세스 전체에서 공유하는 기본 ImageProber를 반환합니다."""
+    global _default_prober
+    with _default_prober_lock:
+        if _default_prober is None:
+            _default_prober = ImageProber()
+        return _default_prober
+
+
+def _count(entry, position, url):
+    # 결과는 완료 순서로 들어오므로 처음 나온 페이지는 입력 순서(리포트 탭 순서)가 가장 앞선 페이지로 유지
+    entry[0] += 1
+    if position < entry[1]:
+        entry[1], entry[2] = position, url
+
+
+class ImageRegistry:
+    """
+    Audit 전체의 고유 이미지 목록입니다. 이미지 URL마다 한 번만 기록하고 페이지는 참조 수로만 세므로,
+    헤더/푸터처럼 모든 페이지에 나오는 이미지도 한 번만 확인(ImageProber)하고 리포트에 한 번만 표시합니다.
+    add()는 한 스레드에서만 호출해야 합니다. (AuditEngine의 on_result 콜백)
+    prober가 None이면 용량/해상도는 확인하지 않고 공통 이미지만 찾습니다.
+    """
+
+    def __init__(self, prober=None):
+        self.prober = prober
+        # 이미지 URL -> [참조한 페이지 수, 처음 나온 position, 그 페이지 URL]
+        self._images = {}
+        # (이미지 URL, Alt) -> [페이지 수, 처음 나온 position, 그 페이지 URL]
+        self._pairs = {}
+        self._references = 0
+        self._positions = set()
+
+    def __len__(self):
+        return len(self._images)
+
+    def add(self, position, result):
+        """position(입력 순서) URL의 이미지를 등록하고, 처음 보는 이미지는 바로 확인을 시작합니다."""
+        if result["error"] or position in self._positions:
+            return
+        self._positions.add(position)
+        url = result["url"]
+        new_images = []
+        for row in result["alt_data"]:
+            image_url = row["Image URL"]
+            self._references += 1
+            image = self._images.get(image_url)
+            if image is None:
+                self._images[image_url] = [1, position, url]
+                new_images.append(image_url)
+            else:
+                _count(image, position, url)
+            key = (image_url, row["Alt Text (AS-IS)"])
+            pair = self._pairs.get(key)
+            if pair is None:
+                self._pairs[key] = [1, position, url]
+            else:
+                _count(pair, position, url)
+        if new_images and self.prober is not None:
+            self.prober.prefetch(new_images)
+
+    def update_from_store(self, result_store):
+        """result_store에 있지만 아직 등록하지 않은 결과를 추가합니다. (--resume, 다른 워커가 처리한 URL)"""
+        missing = [position for position, _, error in result_store.summaries()
+                   if not error and position not in self._positions]
+        for position, result in result_store.iter_results_at(missing):
+            self.add(position, result)
+
+    def summary(self, probe=True, limit=REPORT_IMAGE_LIMIT):
+        """
+        리포트에 표시할 이미지 요약을 반환합니다. 이미지가 하나도 없으면 None.
+        {"unique", "references", "probed", "failed", "total_kilobytes",
+         "shared_keys": 여러 페이지에 같은 Alt로 나오는 (이미지 URL, Alt) 집합 (처음 나온 탭에만 표시),
+         "shared": [{"image_url", "alt_asis", "comment", "comment_status", "pages", "first_url"}], "shared_count", "shared_more",
+         "heavy": [{"image_url", "kilobytes", "dimensions", "content_type", "pages", "first_url"}], "heavy_count", "heavy_more"}
+        probe=False이면 새로 요청하지 않고 캐시에 있는 정보만 사용합니다.
+        """
+        if not self._images:
+            return None
+        infos = {}
+        if self.prober is not None:
+            urls = list(self._images)
+            infos = self.prober.check(urls) if probe else self.prober.cached(urls)
+
+        shared = sorted(((key, pair) for key, pair in self._pairs.items() if pair[0] > 1),
+                        key=lambda item: -item[1][0])
+        heavy = sorted((info for info in infos.values() if info.heavy), key=lambda info: -info.byte_size)
+        shared_rows = []
+        for (image_url, alt), (pages, _, first_url) in shared[:limit]:
+            row = build_alt_row({"Image URL": image_url, "Alt Text (AS-IS)": alt})
+            row.update(pages=pages, first_url=first_url)
+            shared_rows.append(row)
+        heavy_rows = []
+        for info in heavy[:limit]:
+            pages, _, first_url = self._images[info.url]
+            heavy_rows.append({
+                "image_url": info.url,
+                "kilobytes": round(info.byte_size / 1024, 1),
+                "dimensions": f"{info.width}x{info.height}" if info.width else "",
+                "content_type": info.content_type or "",
+                "pages": pages,
+                "first_url": first_url,
+            })
+        sized = [info.byte_size for info in infos.values() if info.byte_size is not None]
+        return {
+            "unique": len(self._images),
+            "references": self._references,
+            "probed": len(sized),
+            "failed": sum(1 for info in infos.values() if info.status_code is None or info.status_code >= 400),
+            "total_kilobytes": round(sum(sized) / 1024, 1),
+            "shared_keys": {key for key, _ in shared},
+            "shared": shared_rows,
+            "shared_count": len(shared),
+            "shared_more": max(0, len(shared) - limit),
+            "heavy": heavy_rows,
+            "heavy_count": len(heavy),
+            "heavy_more": max(0, len(heavy) - limit),
+        }
+
+
+def image_summary(images):
+    """summary() 결과를 로그 한 줄로 요약합니다."""
+    return (f"{images['unique']} unique in {images['references']} references, "
+            f"{images['shared_count']} shown once for several pages, "
+            f"{images['heavy_count']} over {HEAVY_IMAGE_BYTES // 1024} KB, {images['failed']} failed")
@@ -0,0 +1,187 @@
+import os
+import socket
+import sqlite3
+import time
+from contextlib import contextmanager
+
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+# 작업을 가져간 워커가 이 시간(초) 안에 끝내지 못하면 다른 워커가 다시 가져갈 수 있음
+DEFAULT_LEASE_SECONDS = 30 * 60
+
+
+def default_worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    # 강제 종료된 직후에는 아직 회수되지 않은 zombie로 남아 있을 수 있음 (Linux)
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as f:
+            return f.read().rsplit(b")", 1)[-1].split()[0] != b"Z"
+    except (OSError, IndexError):
+        return True
+
+
+def job_queue_path(report_path):
+    """리포트 옆에 저장할 작업 큐 경로 (report.html -> report.queue.sqlite3)"""
+    base = report_path[:-5] if report_path.endswith(".html") else report_path
+    return base + ".queue.sqlite3"
+
+
+class JobQueue:
+    """
+    Audit 실행 하나의 URL별 진행 상태(pending/running/done/failed와 실패 이유)를 SQLite 파일에 기록하는 작업 큐입니다.
+    실행이 중단되어도 끝나지 않은 URL부터 이어서 실행하거나 실패한 URL만 다시 실행할 수 있고,
+    같은 파일을 여러 프로세스(공유 폴더라면 여러 머신)가 함께 열어 URL을 나눠 가져갈 수 있습니다.
+    네트워크 파일 시스템에서도 동작하도록 WAL 대신 기본 rollback journal을 사용합니다.
+    """
+
+    def __init__(self, path, lease_seconds=DEFAULT_LEASE_SECONDS, worker_id=None):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.worker_id = worker_id or default_worker_id()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS queue_meta (key TEXT PRIMARY KEY, value TEXT)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    position INTEGER PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    state TEXT NOT NULL,
+                    error TEXT,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    worker TEXT,
+                    lease_until REAL,
+                    updated_at REAL NOT NULL
+                )""")
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, position)")
+            conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS jobs_url ON jobs (url)")
+
+    @contextmanager
+    def _connect(self):
+        # with 블록 하나가 트랜잭션 하나 (정상 종료 시 commit, 예외 시 rollback)
+        conn = sqlite3.connect(self.path, timeout=60)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def reset(self, urls, **meta):
+        """
+        큐를 urls(입력 순서가 position)로 새로 채우고 meta(ticket, report_path 등)를 기록한 뒤 URL 수를 반환합니다.
+        urls는 iterator여도 되며(사이트맵 전체 등) 한 번에 메모리에 올리지 않고, 중복 URL은 한 번만 넣습니다.
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("DELETE FROM jobs")
+            conn.execute("DELETE FROM queue_meta")
+            conn.executemany(
+                "INSERT OR IGNORE INTO jobs (position, url, state, updated_at) "
+                "VALUES ((SELECT COALESCE(MAX(position) + 1, 0) FROM jobs), ?, ?, ?)",
+                ((url, JOB_PENDING, now) for url in urls))
+            conn.executemany("INSERT INTO queue_meta (key, value) VALUES (?, ?)",
+                             [(key, str(value)) for key, value in meta.items()])
+            return conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def meta(self):
+        with self._connect() as conn:
+            return dict(conn.execute("SELECT key, value FROM queue_meta").fetchall())
+
+    def urls(self, state=None, limit=None):
+        """큐에 있는 전체 URL, 또는 state 상태인 URL (position 순, limit이 있으면 앞에서부터 limit개)"""
+        # SQLite에서 LIMIT -1은 제한 없음
+        limit = -1 if limit is None else limit
+        with self._connect() as conn:
+            if state is None:
+                return [row[0] for row in conn.execute("SELECT url FROM jobs ORDER BY position LIMIT ?", (limit,))]
+            return [row[0] for row in conn.execute(
+                "SELECT url FROM jobs WHERE state = ? ORDER BY position LIMIT ?", (state, limit))]
+
+    def counts(self):
+        """상태별 URL 수 {"pending": n, "running": n, "done": n, "failed": n}"""
+        counts = dict.fromkeys((JOB_PENDING, JOB_RUNNING, JOB_DONE, JOB_FAILED), 0)
+        with self._connect() as conn:
+            counts.update(conn.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall())
+        return counts
+
+    def failures(self):
+        """실패한 URL의 (position, url, error) 목록"""
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT position, url, error FROM jobs WHERE state = ? ORDER BY position", (JOB_FAILED,)).fetchall()
+
+    def retry_failed(self):
+        """실패한 URL을 다시 대기 상태로 돌리고 그 수를 반환합니다."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM queue_meta WHERE key = 'finished_by'")
+            return conn.execute(
+                "UPDATE jobs SET state = ?, worker = NULL, lease_until = NULL, updated_at = ? WHERE state = ?",
+                (JOB_PENDING, time.time(), JOB_FAILED)).rowcount
+
+    def recover(self):
+        """
+        이 머신에서 이미 종료된 프로세스가 실행 중이던 URL을 바로 대기 상태로 돌립니다.
+        (다른 머신의 워커가 가져간 URL은 lease가 끝난 뒤에 다시 가져갈 수 있음)
+        """
+        host = self.worker_id.rsplit(":", 1)[0]
+        with self._connect() as conn:
+            rows = conn.execute("SELECT position, worker FROM jobs WHERE state = ?", (JOB_RUNNING,)).fetchall()
+            dead = []
+            for position, worker in rows:
+                worker_host, _, pid = (worker or "").rpartition(":")
+                if worker_host == host and pid.isdigit() and worker != self.worker_id and not _pid_alive(int(pid)):
+                    dead.append((JOB_PENDING, time.time(), position))
+            conn.executemany(
+                "UPDATE jobs SET state = ?, worker = NULL, lease_until = NULL, updated_at = ? WHERE position = ?", dead)
+        return len(dead)
+
+    def claim(self, limit):
+        """
+        대기 중(또는 lease가 끝난) URL을 최대 limit개 가져가 running으로 표시하고 (position, url) 목록을 반환합니다.
+        여러 프로세스가 동시에 호출해도 같은 URL을 두 곳에서 가져가지 않습니다.
+        """
+        now = time.time()
+        with self._connect() as conn:
+            # 읽기와 표시 사이에 다른 프로세스가 끼어들지 않도록 처음부터 쓰기 잠금을 잡음
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute(
+                "SELECT position, url FROM jobs WHERE state = ? OR (state = ? AND lease_until < ?) "
+                "ORDER BY position LIMIT ?", (JOB_PENDING, JOB_RUNNING, now, max(0, limit))).fetchall()
+            conn.executemany(
+                "UPDATE jobs SET state = ?, worker = ?, lease_until = ?, attempts = attempts + 1, updated_at = ? "
+                "WHERE position = ?",
+                [(JOB_RUNNING, self.worker_id, now + self.lease_seconds, now, position) for position, _ in rows])
+        return rows
+
+    def complete(self, position, error=None):
+        """URL 하나를 done(또는 error가 있으면 failed)으로 표시합니다. 결과를 저장한 뒤에 호출해야 합니다."""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET state = ?, error = ?, worker = NULL, lease_until = NULL, updated_at = ? "
+                "WHERE position = ?", (JOB_FAILED if error else JOB_DONE, error, time.time(), position))
+
+    def try_finish(self):
+        """
+        모든 URL이 끝났으면(done/failed) 이 워커를 리포트 작성자로 기록하고 True를 반환합니다.
+        여러 워커가 함께 실행하는 경우 마지막 하나만 True를 받습니다.
+        """
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            unfinished = conn.execute("SELECT COUNT(*) FROM jobs WHERE state IN (?, ?)",
+                                      (JOB_PENDING, JOB_RUNNING)).fetchone()[0]
+            if unfinished or conn.execute("SELECT 1 FROM queue_meta WHERE key = 'finished_by'").fetchone():
+                return False
+            conn.execute("INSERT INTO queue_meta (key, value) VALUES ('finished_by', ?)", (self.worker_id,))
+            return True
@@ -0,0 +1,220 @@
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, urldefrag
+
+import requests
+
+from audit_log import log_event
+from audit_stats import stage, current_stages, bound_stages
+from http_client import get_http_client
+from page_cache import fetch_document
+from page_rules import PageRule, register_rule
+
+DEFAULT_LINK_CACHE_PATH = os.path.join("audit_cache", "link_status.sqlite3")
+# 확인한 링크 상태를 재사용하는 기간(초). 실행이 바뀌어도 이 기간 안에는 다시 요청하지 않음
+LINK_STATUS_TTL = 24 * 60 * 60
+LINK_CHECK_WORKERS = 8
+# HEAD 결과만으로 끊어진 링크로 판단하는 상태 코드 (나머지 4xx/5xx는 HEAD 미지원일 수 있어 GET으로 재확인)
+DEFINITIVE_BROKEN_STATUSES = (404, 410)
+_SKIPPED_SCHEMES = ("mailto:", "tel:", "javascript:", "data:", "sms:")
+
+
+class LinkStatus:
+    """링크 하나의 확인 결과. status_code가 None이면 네트워크 오류(error에 내용)입니다."""
+    __slots__ = ("url", "status_code", "error", "checked_at")
+
+    def __init__(self, url, status_code, error=None, checked_at=None):
+        self.url = url
+        self.status_code = status_code
+        self.error = error
+        self.checked_at = time.time() if checked_at is None else checked_at
+
+    @property
+    def broken(self):
+        return self.status_code is None or self.status_code >= 400
+
+    @property
+    def persistable(self):
+        # 네트워크 오류와 5xx는 일시적일 수 있으므로 이번 실행 안에서만 재사용
+        return self.status_code is not None and self.status_code < 500
+
+
+class LinkRule(PageRule):
+    """페이지의 <a href> 값을 문서 순서대로 모으는 페이지 검사 규칙입니다. (숨겨진 링크도 크롤러는 따라가므로 포함)"""
+
+    tags = ("a",)
+
+    def __init__(self):
+        self.hrefs = []
+
+    def start(self, tag, values, hidden):
+        if values.get("href"):
+            self.hrefs.append(values["href"])
+
+    def result(self):
+        return self.hrefs
+
+
+register_rule("links", LinkRule)
+
+
+def extract_links(document):
+    """페이지의 <a href> 링크를 절대 URL(fragment 제외)로 바꿔 중복 없이 문서 순서대로 반환합니다."""
+    hrefs = document.rule_result("links")
+    links = []
+    seen = set()
+    for href in hrefs:
+        href = href.strip()
+        if not href or href.startswith("#") or href.lower().startswith(_SKIPPED_SCHEMES):
+            continue
+        link = urldefrag(urljoin(document.url, href))[0]
+        if link.startswith(("http://", "https://")) and link not in seen:
+            seen.add(link)
+            links.append(link)
+    return links
+
+
+class LinkChecker:
+    """
+    Audit 전체(그리고 TTL 동안은 실행 간에도)에서 링크 상태를 공유하는 캐시입니다.
+    같은 링크는 여러 페이지에서 동시에 요청되어도 한 번만 확인하며(HEAD 후 필요하면 GET),
+    확정된 결과는 SQLite에 저장해 다음 실행에서 재사용합니다.
+    """
+
+    def __init__(self, db_path=DEFAULT_LINK_CACHE_PATH, ttl=LINK_STATUS_TTL, max_workers=LINK_CHECK_WORKERS):
+        self.db_path = db_path
+        self.ttl = ttl
+        self._memory = {}
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="link-check")
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS link_status (
+                    url TEXT PRIMARY KEY,
+                    status_code INTEGER,
+                    checked_at REAL
+                ) WITHOUT ROWID""")
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _load(self, urls):
+        found = {}
+        oldest = time.time() - self.ttl
+        with self._connect() as conn:
+            for start in range(0, len(urls), 500):
+                batch = urls[start:start + 500]
+                rows = conn.execute(
+                    f"SELECT url, status_code, checked_at FROM link_status "
+                    f"WHERE checked_at >= ? AND url IN ({','.join('?' * len(batch))})",
+                    [oldest, *batch]).fetchall()
+                for url, status_code, checked_at in rows:
+                    found[url] = LinkStatus(url, status_code, checked_at=checked_at)
+        return found
+
+    def _save(self, statuses):
+        rows = [(s.url, s.status_code, s.checked_at) for s in statuses if s.persistable]
+        if not rows:
+            return
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO link_status (url, status_code, checked_at) VALUES (?, ?, ?)", rows)
+
+    def _probe(self, url, stages):
+        with bound_stages(stages):
+            client = get_http_client()
+            try:
+                status_code = client.head(url).status_code
+                if status_code >= 400 and status_code not in DEFINITIVE_BROKEN_STATUSES:
+                    # HEAD를 지원하지 않거나 막아 둔 서버가 많으므로 GET으로 다시 확인 (본문은 읽지 않음)
+                    with client.open_stream(url) as response:
+                        status_code = response.status_code
+                status = LinkStatus(url, status_code)
+            except requests.exceptions.RequestException as e:
+                status = LinkStatus(url, None, error=str(e))
+        with self._lock:
+            self._memory[url] = status
+            self._pending.pop(url, None)
+        return status
+
+    def check(self, urls):
+        """urls의 상태를 {url: LinkStatus}로 반환합니다. 캐시에 없는 링크만 동시에 요청합니다."""
+        unique = list(dict.fromkeys(urls))
+        now = time.time()
+        results = {}
+        waiting = {}
+        missing = []
+        with self._lock:
+            for url in unique:
+                status = self._memory.get(url)
+                if status is not None and now - status.checked_at < self.ttl:
+                    results[url] = status
+                elif url in self._pending:
+                    waiting[url] = self._pending[url]
+                else:
+                    missing.append(url)
+
+        submitted = []
+        if missing:
+            stored = self._load(missing)
+            stages = current_stages()
+            with self._lock:
+                for url in missing:
+                    if url in stored:
+                        self._memory[url] = results[url] = stored[url]
+                    elif url in self._pending:
+                        waiting[url] = self._pending[url]
+                    else:
+                        waiting[url] = self._pending[url] = self._pool.submit(self._probe, url, stages)
+                        submitted.append(url)
+
+        for url, future in waiting.items():
+            results[url] = future.result()
+        self._save([results[url] for url in submitted])
+        return results
+
+
+_default_checker = None
+_default_checker_lock = threading.Lock()
+
+
+def get_link_checker():
+    """프로세스 전체에서 공유하는 기본 LinkChecker를 반환합니다."""
+    global _default_checker
+    with _default_checker_lock:
+        if _default_checker is None:
+            _default_checker = LinkChecker()
+        return _default_checker
+
+
+def check_page_links(url, log_output=None):
+    """
+    페이지의 Broken Link 검사 결과를 리포트 행 형식({"현황", "Comment", "SEO 수정안"})으로 반환합니다.
+    audit_engine.audit_single_url이 리포트의 Broken Link 항목으로 사용하며, 링크 상태는 get_link_checker()로 공유합니다.
+    """
+    with stage("check_page_links", url):
+        links = extract_links(fetch_document(url))
+        statuses = get_link_checker().check(links)
+        broken = [statuses[link] for link in links if statuses[link].broken]
+
+    if not broken:
+        log_event(log_output, "INFO", f"No broken links on {url} ({len(links)} links checked)")
+        return {
+            "현황": f"Broken Link 없음 (링크 {len(links)}개 확인)",
+            "Comment": "이슈 없음",
+            "SEO 수정안": "N/A"
+        }
+
+    log_event(log_output, "WARN", f"{len(broken)} broken links on {url}")
+    return {
+        "현황": f"Broken Link {len(broken)}개 (링크 {len(links)}개 확인)",
+        "Comment": "수정 필요",
+        "SEO 수정안": "\n".join(f"{status.url} ({status.status_code or '연결 실패'})" for status in broken)
+    }
@@ -1,15 +1,29 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox, simpledialog
 import os
+import queue
+import threading
 import webbrowser
-from datetime import date
-import pandas as pd
 
-from seo_core import generate_metadata
+from audit_history import get_audit_history
+from audit_log import AuditLog, TkLogDrain
+from duplicate_index import DuplicateIndex, duplicate_summary
+from excel_export import write_xlsx_report
+from audit_stats import RunStats, stats_sidecar_path
+from http_client import get_http_client, http_counters_delta
+from image_registry import ImageRegistry, get_image_prober, image_summary
+from audit_engine import AuditEngine, DEFAULT_MAX_WORKERS, DEFAULT_PER_HOST_LIMIT
+from page_cache import DEFAULT_PAGE_CACHE_DIR
 from sitemap_management import load_sitemap_mapping, save_sitemap_mapping
-from utils import extract_brand_country_and_lancode, collect_alt_texts
+from utils import build_report_filename
 # 'generate_final_shareable_report' 임포트 구문 제거
-from report_generator import generate_html_report
+from report_generator import LiveReportWriter, generate_html_report, live_report_dir
+from result_store import ResultStore, result_store_path
+from job_queue import JobQueue, job_queue_path
+from site_crawl import SitemapSampler, iter_site_urls
+
+# 사이트맵에서 불러온 URL은 큐에만 넣고 입력란에는 앞부분 몇 개만 보여 줌
+SITE_PREVIEW_URLS = 20
 
 class SEOAuditApp:
     def __init__(self, root):
@@ -25,16 +39,19 @@ class SEOAuditApp:
         self.notebook.pack(fill="both", expand=True)
 
         self.sitemap_data = load_sitemap_mapping()
+        self.audit_queue = queue.Queue()
+        self.audit_log = AuditLog()
+        # 사이트맵에서 불러와 큐에 넣어 둔 URL 목록 정보 (입력란 미리보기가 그대로일 때만 Audit에 사용)
+        self.site_job = None
+        # Audit 실행 중에는 사이트맵 불러오기가 끝나도 실행 버튼을 다시 켜지 않음
+        self.audit_running = False
 
         self.create_main_tab()
         self.create_sitemap_tab()
 
     def log_message(self, message, tag=None):
-        self.log_output.config(state='normal')
-        self.log_output.insert(tk.END, message, tag)
-        self.log_output.see(tk.END)
-        self.log_output.config(state='disabled')
-        self.root.update_idletasks()
+        # 위젯에는 TkLogDrain이 타이머로 모아서 기록
+        self.audit_log.insert(tk.END, message, tag)
 
     def create_main_tab(self):
         tab_main = ttk.Frame(self.notebook)
@@ -51,10 +68,24 @@ class SEOAuditApp:
         self.url_text = scrolledtext.ScrolledText(frame_exec, height=8, width=50, font=("Segoe UI", 10))
         self.url_text.grid(row=1, column=1, padx=5, pady=5, sticky="ew")
 
+        ttk.Label(frame_exec, text="⚙️ 동시 실행 수", font=("Segoe UI", 10)).grid(row=2, column=0, sticky="w", padx=(0, 10), pady=5)
+        frame_workers = ttk.Frame(frame_exec)
+        frame_workers.grid(row=2, column=1, padx=5, pady=5, sticky="w")
+        self.workers_var = tk.IntVar(value=DEFAULT_MAX_WORKERS)
+        ttk.Spinbox(frame_workers, from_=1, to=32, width=5, textvariable=self.workers_var).pack(side="left")
+        ttk.Label(frame_workers, text="호스트당 최대", font=("Segoe UI", 10)).pack(side="left", padx=(15, 5))
+        self.per_host_var = tk.IntVar(value=DEFAULT_PER_HOST_LIMIT)
+        ttk.Spinbox(frame_workers, from_=1, to=16, width=5, textvariable=self.per_host_var).pack(side="left")
+        self.reuse_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(frame_workers, text="변경 없는 페이지는 이전 결과 재사용",
+                        variable=self.reuse_var).pack(side="left", padx=(15, 0))
+
         frame_exec.grid_columnconfigure(1, weight=1)
 
-        # 버튼 하나만 있도록 원래대로 수정
-        ttk.Button(tab_main, text="🚀 Audit 실행", command=self.on_execute).pack(pady=(5,10))
+        self.site_button = ttk.Button(tab_main, text="🗺️ 사이트맵에서 URL 불러오기", command=self.on_load_site_urls)
+        self.site_button.pack(pady=(5, 0))
+        self.execute_button = ttk.Button(tab_main, text="🚀 Audit 실행", command=self.on_execute)
+        self.execute_button.pack(pady=(5,10))
 
         log_frame = ttk.LabelFrame(tab_main, text="실행 로그", padding=10)
         log_frame.pack(pady=10, padx=20, fill="both", expand=True)
@@ -63,6 +94,7 @@ class SEOAuditApp:
         self.log_output.tag_configure("INFO", foreground="blue")
         self.log_output.tag_configure("WARN", foreground="orange")
         self.log_output.tag_configure("ERROR", foreground="red")
+        TkLogDrain(self.root, self.log_output, self.audit_log).start()
 
     def create_sitemap_tab(self):
         tab_map = ttk.Frame(self.notebook)
@@ -154,14 +186,91 @@ class SEOAuditApp:
         self.sitemap_data = updated_mapping
         messagebox.showinfo("저장 완료", "사이트맵 매핑이 sitemap_mapping.json 파일로 저장되었습니다.")
 
+    def report_output_path(self, ticket_name, first_url):
+        output_dir = "./audit_reports"
+        os.makedirs(output_dir, exist_ok=True)
+        return os.path.join(output_dir, build_report_filename(ticket_name, first_url))
+
+    def on_load_site_urls(self):
+        """
+        입력된 첫 URL이 속한 사이트의 사이트맵에서 URL을 골라 바로 Audit 큐에 넣습니다.
+        (CLI의 --site처럼 URL 목록을 메모리에 모으지 않고, 입력란에는 URL 수와 앞부분 미리보기만 표시)
+        """
+        ticket_name = self.ticket_entry.get().strip()
+        urls = [u.strip() for u in self.url_text.get("1.0", "end").splitlines()
+                if u.strip() and not u.strip().startswith("#")]
+        if not urls:
+            messagebox.showwarning("입력 오류", "사이트 URL(예: https://www.laneige.com/kr/ko/)을 먼저 입력해주세요.")
+            return
+        if not ticket_name:
+            messagebox.showwarning("입력 오류", "티켓 이름을 먼저 입력해주세요.")
+            return
+        site_url = urls[0]
+        per_section = simpledialog.askinteger(
+            "사이트맵 URL 샘플링", "섹션별 최대 URL 수 (비워두면 전체):", minvalue=1, parent=self.root)
+        pattern = simpledialog.askstring(
+            "사이트맵 URL 샘플링", "URL 경로 패턴 (예: */products/*, 비워두면 전체):", parent=self.root)
+        sampler = SitemapSampler([pattern.strip()] if pattern else None, per_section)
+
+        self.site_button.config(state="disabled")
+        self.execute_button.config(state="disabled")
+        self.log_message(f"\n[INFO] Loading URLs from the sitemap of {site_url}\n", "INFO")
+        self.site_job = None
+        output_path = self.report_output_path(ticket_name, site_url)
+        job_queue = JobQueue(job_queue_path(output_path))
+        site_queue = queue.Queue()
+
+        def enumerate_urls():
+            # 큰 사이트맵은 내려받는 데 오래 걸리므로 백그라운드 스레드에서 실행
+            try:
+                # 사이트맵 URL을 메모리에 모으지 않고 바로 큐에 넣음 (중복은 큐에서 제거)
+                count = job_queue.reset(iter_site_urls(site_url, self.sitemap_data, self.audit_log, sampler),
+                                        ticket=ticket_name, report_path=output_path)
+                site_queue.put(("done", count, job_queue.urls(limit=SITE_PREVIEW_URLS)))
+            except Exception as e:
+                site_queue.put(("error", str(e)))
+
+        threading.Thread(target=enumerate_urls, daemon=True).start()
+        self.root.after(100, self.poll_site_urls, site_url, ticket_name, output_path, site_queue)
+
+    def poll_site_urls(self, site_url, ticket_name, output_path, site_queue):
+        try:
+            event = site_queue.get_nowait()
+        except queue.Empty:
+            self.root.after(100, self.poll_site_urls, site_url, ticket_name, output_path, site_queue)
+            return
+        self.site_button.config(state="normal")
+        if not self.audit_running:
+            self.execute_button.config(state="normal")
+        if event[0] == "error":
+            messagebox.showerror("사이트맵 오류", f"사이트맵에서 URL을 불러오지 못했습니다:\n{event[1]}")
+            self.log_message(f"[ERROR] Failed to load sitemap URLs: {event[1]}\n", "ERROR")
+            return
+        _, count, preview = event
+        if not count:
+            messagebox.showwarning("사이트맵", f"{site_url}의 사이트맵에서 조건에 맞는 URL을 찾지 못했습니다.")
+            return
+        # 입력란에는 URL 수와 앞부분만 표시. '#' 줄은 Audit URL로 읽지 않음
+        lines = [f"# {site_url} 사이트맵 URL {count}개 (Audit 실행 시 모두 검사)"] + preview
+        if count > len(preview):
+            lines.append(f"# ... 외 {count - len(preview)}개")
+        text = "\n".join(lines)
+        self.url_text.delete("1.0", "end")
+        self.url_text.insert("1.0", text)
+        self.site_job = {"site_url": site_url, "ticket": ticket_name, "output_path": output_path,
+                         "count": count, "text": text}
+        self.log_message(f"[INFO] Queued {count} URLs from the sitemap of {site_url}\n", "INFO")
+
     def on_execute(self):
         ticket_name = self.ticket_entry.get().strip()
         urls_raw = self.url_text.get("1.0", "end").strip()
-        urls = [u.strip() for u in urls_raw.splitlines() if u.strip()]
+        # 사이트맵 미리보기를 수정하지 않았으면 불러올 때 큐에 넣어 둔 URL 전체를 Audit
+        site_job = self.site_job if self.site_job and urls_raw == self.site_job["text"] else None
+        urls = [u.strip() for u in urls_raw.splitlines() if u.strip() and not u.strip().startswith("#")]
 
         self.log_message("\n--- Audit Started ---\n", "INFO")
 
-        if not urls:
+        if not urls and not site_job:
             messagebox.showwarning("입력 오류", "Audit할 URL을 입력해주세요.")
             self.log_message("[ERROR] No URLs provided for audit.\n", "ERROR")
             return
@@ -171,53 +280,190 @@ class SEOAuditApp:
             self.log_message("[ERROR] No ticket name provided.\n", "ERROR")
             return
 
-        messagebox.showinfo("Audit 시작", f"티켓명: {ticket_name}\n총 {len(urls)}개 URL Audit을 시작합니다. 로그 창을 확인하세요.")
-
-        all_results = []
-        all_alt_data = []
-
-        current_sitemap_mapping = self.sitemap_data 
-
-        for url in urls:
-            self.log_message(f"\n[INFO] Processing URL: {url}\n", "INFO")
-            meta = generate_metadata(url, current_sitemap_mapping, self.log_output)
-            df_url = pd.DataFrame([
-                {"URL": url, "항목": k, **v} for k, v in meta.items()
-            ])
-
-            audit_url_value = df_url.loc[df_url['항목'] == 'Audit_URL', '현황'].iloc[0] if 'Audit_URL' in df_url['항목'].values else None
-            if audit_url_value == url:
-                df_url = df_url[df_url['항목'] != 'Audit_URL']
-            
-            all_results.append(df_url)
-
-            alt_data_for_url = collect_alt_texts(url, self.log_output)
-            all_alt_data.extend(alt_data_for_url)
-            
-        if not all_results:
-            messagebox.showerror("Audit 결과", "처리할 URL이 없거나 데이터 추출에 실패했습니다.")
-            self.log_message("[ERROR] No audit results generated.\n", "ERROR")
+        if site_job and ticket_name != site_job["ticket"]:
+            messagebox.showwarning("입력 오류", "티켓 이름이 바뀌었습니다. 사이트맵에서 URL을 다시 불러와주세요.")
+            self.log_message("[ERROR] Ticket name changed after loading sitemap URLs.\n", "ERROR")
             return
 
-        final_df = pd.concat(all_results, ignore_index=True)
-        alt_df = pd.DataFrame(all_alt_data)
-
-        today_date = date.today().strftime("%y%m%d")
-        output_dir = "./audit_reports"
-        os.makedirs(output_dir, exist_ok=True)
-        
-        brand, country, lan = extract_brand_country_and_lancode(urls[0])
-        lan_suffix = f"_{lan}" if lan else ""
-        report_filename = f"SEO-audit_Report_{ticket_name}_{brand}-{country}{lan_suffix}_{today_date}.html"
-        output_path = os.path.join(output_dir, report_filename)
-
-        generate_html_report(ticket_name, urls, final_df, alt_df, output_path)
-
-        messagebox.showinfo("Audit 완료", f"Audit이 완료되었으며, 결과가 다음 파일에 저장되었습니다:\n{output_path}")
-        self.log_message(f"\n[INFO] Audit completed. Report saved to: {output_path}\n", "INFO")
-        
-        webbrowser.open(f"file://{os.path.abspath(output_path)}")
+        try:
+            max_workers = int(self.workers_var.get())
+            per_host_limit = int(self.per_host_var.get())
+        except (tk.TclError, ValueError):
+            messagebox.showwarning("입력 오류", "동시 실행 수는 숫자로 입력해주세요.")
+            return
 
+        total = site_job["count"] if site_job else len(urls)
+        messagebox.showinfo("Audit 시작", f"티켓명: {ticket_name}\n총 {total}개 URL Audit을 시작합니다. 로그 창을 확인하세요.")
+
+        # Audit이 끝날 때까지 다시 실행하거나 사이트맵 큐를 바꾸지 못하도록 두 버튼을 모두 끔
+        self.audit_running = True
+        self.execute_button.config(state="disabled")
+        self.site_button.config(state="disabled")
+        output_path = site_job["output_path"] if site_job else self.report_output_path(ticket_name, urls[0])
+        # URL이 끝날 때마다 결과를 파일에 기록하고 큐에 완료로 표시 (메모리에 모으지 않음)
+        result_store = ResultStore(result_store_path(output_path))
+        job_queue = JobQueue(job_queue_path(output_path))
+        if site_job:
+            # 사이트맵 URL은 불러올 때 이미 큐에 넣었음. 다시 실행하려면 사이트맵에서 다시 불러옴
+            self.site_job = None
+            self.url_text.delete("1.0", "end")
+            self.url_text.insert("1.0", site_job["site_url"])
+            result_store.clear()
+        elif self.ask_resume(job_queue, urls):
+            job_queue.recover()
+            job_queue.retry_failed()
+        else:
+            result_store.clear()
+            job_queue.reset(urls, ticket=ticket_name, report_path=output_path)
+        engine = AuditEngine(self.sitemap_data, self.audit_log,
+                             max_workers=max_workers, per_host_limit=per_host_limit,
+                             page_cache_dir=DEFAULT_PAGE_CACHE_DIR, stats=RunStats(),
+                             result_store=result_store, history=get_audit_history(),
+                             reuse_unchanged=self.reuse_var.get())
+        worker = threading.Thread(target=self.run_audit, args=(engine, job_queue, ticket_name, output_path),
+                                  daemon=True)
+        worker.start()
+        self.root.after(100, self.poll_audit_queue)
+
+    def ask_resume(self, job_queue, urls):
+        """같은 URL 목록으로 중단된(또는 실패한 URL이 남은) Audit이 있으면 이어서 실행할지 묻습니다."""
+        # 큐에는 중복 URL이 한 번만 들어가므로 입력 목록도 같은 방식으로 중복을 제거해 비교
+        urls = list(dict.fromkeys(urls))
+        if not job_queue.meta() or job_queue.urls() != urls:
+            return False
+        counts = job_queue.counts()
+        if not counts["done"] or counts["done"] == len(urls):
+            return False
+        return messagebox.askyesno(
+            "이전 Audit 이어서 실행",
+            f"같은 URL 목록으로 중단된 Audit이 있습니다. (완료 {counts['done']}/{len(urls)}, 실패 {counts['failed']})\n"
+            f"완료된 URL은 건너뛰고 나머지 URL과 실패한 URL만 실행할까요?\n"
+            f"(아니오를 누르면 처음부터 다시 실행합니다)")
+
+    def run_audit(self, engine, job_queue, ticket_name, output_path):
+        # 백그라운드 스레드에서 실행되며, UI 갱신은 audit_queue를 통해서만 요청
+        try:
+            def on_start(index, url):
+                self.audit_log.insert(tk.END, f"\n[INFO] Processing URL: {url}\n", "INFO")
+
+            # 완료된 URL부터 바로 볼 수 있도록 진행 중 리포트를 만들고 브라우저로 엶
+            # 전체 URL 수는 중복이 제거된 큐 기준
+            live_report = LiveReportWriter(ticket_name, live_report_dir(output_path),
+                                           sum(job_queue.counts().values()))
+            if live_report.start(engine.result_store):
+                self.audit_queue.put(("live", live_report.index_path))
+            else:
+                live_report = None
+
+            # 페이지 간 중복 Title/Description/H1 색인은 결과가 들어오는 대로 만듦
+            duplicates = DuplicateIndex()
+            # Audit 전체의 고유 이미지 목록. 처음 보는 이미지는 결과가 들어오는 대로 용량/해상도 확인을 시작
+            images = ImageRegistry(get_image_prober())
+
+            def on_result(index, result):
+                if live_report is not None:
+                    live_report.add(index, result)
+                duplicates.add(index, result)
+                images.add(index, result)
+                # 전체 결과는 ResultStore에 기록되므로 UI에는 진행 상황만 전달
+                self.audit_queue.put(("progress", index, {"url": result["url"], "error": result["error"],
+                                                          "reused": result.get("reused", False)}))
+
+            stats = engine.stats
+            result_store = engine.result_store
+            http_before = get_http_client().snapshot()
+            engine.run_queue(job_queue, on_result=on_result, on_start=on_start)
+            http = http_counters_delta(http_before, get_http_client().snapshot())
+            self.audit_log.info(f"HTTP: {http['requests']} requests, {http['bytes'] / (1024 * 1024):.1f} MB, "
+                                f"{http['retries']} retries")
+            if not job_queue.try_finish():
+                # 같은 큐를 함께 처리하는 다른 프로세스(audit_cli.py --resume)가 리포트를 만듦
+                self.audit_log.warn("Other workers are still auditing this queue; the last worker writes the report.")
+                result_store.close()
+                self.audit_queue.put(("failed",))
+                return
+            failed = len(job_queue.failures())
+            if failed:
+                self.audit_log.warn(f"{failed} URLs failed. Run the audit again with the same URLs to retry only them.")
+            if not result_store.count():
+                result_store.close()
+                if live_report is not None:
+                    live_report.finish()
+                self.audit_queue.put(("failed",))
+                return
+
+            # 같은 티켓의 이전 리포트와 이슈를 비교하고, 이번 결과를 다음 비교 기준으로 저장
+            run_diff = get_audit_history().compare(ticket_name, result_store.iter_results())
+            if run_diff:
+                self.audit_log.info(f"Compared with the previous audit: {run_diff['fixed']} fixed, "
+                                    f"{run_diff['new']} new, {run_diff['unchanged']} unchanged issues")
+            with stats.stage("duplicate_index"):
+                # 이어서 실행한 경우 이전 실행에서 끝난 URL도 포함
+                duplicates.update_from_store(result_store)
+                duplicate_groups = duplicates.clusters()
+            if duplicate_groups:
+                self.audit_log.info(f"Duplicate content across pages: {duplicate_summary(duplicate_groups)}")
+            with stats.stage("image_probe"):
+                images.update_from_store(result_store)
+                image_info = images.summary()
+            if image_info:
+                self.audit_log.info(f"Images: {image_summary(image_info)}")
+            with stats.stage("generate_html_report"):
+                generate_html_report(ticket_name, None, None, None, output_path,
+                                     run_stats=stats.summary(), result_store=result_store, run_diff=run_diff,
+                                     duplicates=duplicate_groups, images=image_info)
+            try:
+                with stats.stage("write_xlsx"):
+                    write_xlsx_report(None, os.path.splitext(output_path)[0] + ".xlsx", result_store=result_store,
+                                      images=image_info)
+            except ImportError:
+                self.audit_log.warn("openpyxl is not installed; skipping the .xlsx export.")
+            result_store.close()
+            if live_report is not None:
+                live_report.finish(output_path)
+            stats.write_json(stats_sidecar_path(output_path))
+            self.audit_queue.put(("done", output_path))
+        except Exception as e:
+            self.audit_queue.put(("error", str(e)))
+
+    def poll_audit_queue(self):
+        finished = False
+        while True:
+            try:
+                event = self.audit_queue.get_nowait()
+            except queue.Empty:
+                break
+
+            kind = event[0]
+            if kind == "progress":
+                _, index, result = event
+                tag = "ERROR" if result["error"] else "INFO"
+                status = "Failed" if result["error"] else "Unchanged" if result["reused"] else "Completed"
+                self.log_message(f"[{tag}] {status}: {result['url']}\n", tag)
+            elif kind == "live":
+                self.log_message(f"[INFO] Live report (updates as URLs finish): {event[1]}\n", "INFO")
+                webbrowser.open(f"file://{os.path.abspath(event[1])}")
+            elif kind == "failed":
+                finished = True
+                messagebox.showerror("Audit 결과", "처리할 URL이 없거나 데이터 추출에 실패했습니다.")
+                self.log_message("[ERROR] No audit results generated.\n", "ERROR")
+            elif kind == "error":
+                finished = True
+                messagebox.showerror("Audit 오류", f"Audit 실행 중 오류가 발생했습니다:\n{event[1]}")
+                self.log_message(f"[ERROR] Audit aborted: {event[1]}\n", "ERROR")
+            elif kind == "done":
+                finished = True
+                output_path = event[1]
+                messagebox.showinfo("Audit 완료", f"Audit이 완료되었으며, 결과가 다음 파일에 저장되었습니다:\n{output_path}")
+                self.log_message(f"\n[INFO] Audit completed. Report saved to: {output_path}\n", "INFO")
+                webbrowser.open(f"file://{os.path.abspath(output_path)}")
+
+        if finished:
+            self.audit_running = False
+            self.execute_button.config(state="normal")
+            self.site_button.config(state="normal")
+        else:
+            self.root.after(100, self.poll_audit_queue)
 
 if __name__ == "__main__":
     root = tk.Tk()
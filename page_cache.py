@@ -0,0 +1,320 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlparse, urlunparse
+
+from http_client import DEFAULT_TIMEOUT, get_http_client
+from page_rules import run_rules
+
+DEFAULT_PAGE_CACHE_DIR = os.path.join("audit_cache", "pages")
+# 디스크에 저장한 페이지를 재검증 없이 버리기 전까지 보관하는 기간과 캐시 폴더의 최대 크기
+PAGE_CACHE_TTL = 30 * 24 * 60 * 60
+PAGE_CACHE_MAX_BYTES = 512 * 1024 * 1024
+# 기록 중 중단되어 남은 임시 파일은 이 시간이 지나면 정리
+_STALE_TEMP_SECONDS = 60 * 60
+_ENTRY_SUFFIX = ".page"
+# 메모리에 동시에 보관할 최대 페이지 수 (가장 오래 사용하지 않은 페이지부터 내보냄)
+DEFAULT_MAX_DOCUMENTS = 64
+_LEGACY_SUFFIXES = (".json", ".body")
+
+
+def normalize_cache_key(url):
+    """
+    캐시 키용 URL 정규화: scheme/host 소문자, 기본 포트와 fragment 제거.
+    path와 query는 서버가 구분할 수 있으므로 그대로 둡니다.
+    """
+    parsed = urlparse(url.strip())
+    scheme = parsed.scheme.lower()
+    netloc = parsed.netloc.lower()
+    if (scheme == "http" and netloc.endswith(":80")) or (scheme == "https" and netloc.endswith(":443")):
+        netloc = netloc.rsplit(":", 1)[0]
+    return urlunparse((scheme, netloc, parsed.path or "/", parsed.params, parsed.query, ""))
+
+
+class PageDocument:
+    """
+    한 번 내려받은 페이지의 응답 정보와 파싱된 트리, 페이지 검사 규칙(page_rules) 결과를 보관합니다.
+    soup과 규칙 결과는 처음 필요할 때 한 번만 만들어지며, 여러 검사에서 공유하므로 읽기 전용으로 사용해야 합니다.
+    """
+
+    def __init__(self, url, status_code, headers, content, from_disk=False):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.from_disk = from_disk
+        self.disk_path = None
+        self._text = None
+        self._soup = None
+        self._rule_results = {}
+        self._lock = threading.Lock()
+
+    @property
+    def etag(self):
+        return self.headers.get("ETag")
+
+    @property
+    def last_modified(self):
+        return self.headers.get("Last-Modified")
+
+    @property
+    def text(self):
+        # 기존 collect_alt_texts와 동일하게 utf-8로 강제 디코딩
+        if self._text is None:
+            self._text = str(self.content, "utf-8", errors="replace")
+        return self._text
+
+    @property
+    def soup(self):
+        if self._soup is None:
+            with self._lock:
+                if self._soup is None:
+                    # bs4는 트리가 처음 필요할 때 import (앱 시작 시간 단축)
+                    from bs4 import BeautifulSoup
+                    self._soup = BeautifulSoup(self.text, "html.parser")
+        return self._soup
+
+    def rule_result(self, name):
+        """
+        page_rules에 등록된 규칙 name의 결과. 처음 요청될 때 등록된 모든 규칙을 문서 한 번의 순회로 실행하므로
+        Alt Text, 링크, 페이지 지문 등 검사 수와 관계없이 페이지는 한 번만 읽습니다.
+        """
+        results = self._rule_results
+        if name not in results:
+            with self._lock:
+                results = self._rule_results
+                if name not in results:
+                    # 이미 실행한 규칙은 제외 (순회 뒤에 등록된 규칙이 있으면 그 규칙만 한 번 더 실행)
+                    results = {**results, **run_rules(self.text, exclude=results)}
+                    self._rule_results = results
+        return results[name]
+
+
+class PageCache:
+    """
+    Audit 한 번 동안 URL별 페이지를 한 번만 내려받도록 하는 공유 캐시입니다.
+    cache_dir을 지정하면 응답을 디스크에도 저장하고, 다음 실행에서는
+    ETag/Last-Modified 조건부 요청으로 재검증해 변경이 없으면 저장된 본문을 재사용합니다.
+    디스크 항목은 메타데이터와 본문을 한 파일에 담아 임시 파일 + os.replace로 기록하므로
+    중간에 종료되어도 반쯤 쓰인 항목이 남지 않으며, ttl이 지난 항목과 max_bytes를 넘는
+    오래된 항목은 prune()으로 정리합니다.
+    메모리에는 최근 사용한 페이지를 max_documents개까지만 두며, Audit이 끝난 URL은 discard()로 바로 내보냅니다.
+    """
+
+    def __init__(self, cache_dir=None, timeout=DEFAULT_TIMEOUT, ttl=PAGE_CACHE_TTL, max_bytes=PAGE_CACHE_MAX_BYTES,
+                 max_documents=DEFAULT_MAX_DOCUMENTS):
+        self.cache_dir = cache_dir
+        self.timeout = timeout
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.max_documents = max(1, int(max_documents))
+        self._documents = OrderedDict()
+        self._key_locks = {}
+        self._lock = threading.Lock()
+        self._prune_lock = threading.Lock()
+        self._written_since_prune = 0
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            self.prune()
+
+    def _lock_for(self, key):
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _disk_path(self, key):
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, digest + _ENTRY_SUFFIX)
+
+    def _load_from_disk(self, key):
+        if not self.cache_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl:
+                return None
+            # 첫 줄은 메타데이터(JSON), 나머지는 본문
+            with open(path, "rb") as f:
+                meta = json.loads(f.readline())
+                content = f.read()
+        except (OSError, ValueError):
+            return None
+        document = PageDocument(meta["url"], meta["status_code"], meta["headers"], content, from_disk=True)
+        document.disk_path = path
+        return document
+
+    def _save_to_disk(self, key, document):
+        if not self.cache_dir or not (document.etag or document.last_modified):
+            return
+        meta = json.dumps({
+            "url": document.url,
+            "status_code": document.status_code,
+            "headers": {k: v for k, v in document.headers.items()
+                        if k in ("ETag", "Last-Modified", "Content-Type")},
+        }, ensure_ascii=False).encode("utf-8")
+        temp_path = None
+        try:
+            fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(meta + b"\n")
+                f.write(document.content)
+            os.replace(temp_path, self._disk_path(key))
+        except OSError:
+            if temp_path is not None:
+                _remove_quietly(temp_path)
+            return
+
+        with self._lock:
+            self._written_since_prune += len(meta) + len(document.content)
+            should_prune = self._written_since_prune > self.max_bytes // 10
+        if should_prune:
+            self.prune()
+
+    def prune(self):
+        """
+        디스크 캐시에서 ttl이 지난 항목, 남은 임시 파일, 이전 형식(.json/.body) 파일을 지우고,
+        전체 크기가 max_bytes를 넘으면 가장 오래 사용하지 않은 항목부터 지웁니다.
+        다른 스레드가 정리 중이면 기다리지 않고 돌아갑니다.
+        """
+        if not self.cache_dir or not self._prune_lock.acquire(blocking=False):
+            return
+        try:
+            with self._lock:
+                self._written_since_prune = 0
+            now = time.time()
+            entries = []
+            try:
+                scanned = list(os.scandir(self.cache_dir))
+            except OSError:
+                return
+            for item in scanned:
+                try:
+                    info = item.stat()
+                except OSError:
+                    continue
+                name = item.name
+                expired = (name.endswith(_LEGACY_SUFFIXES)
+                           or (name.endswith(".tmp") and now - info.st_mtime > _STALE_TEMP_SECONDS)
+                           or (name.endswith(_ENTRY_SUFFIX) and now - info.st_mtime > self.ttl))
+                if expired:
+                    _remove_quietly(item.path)
+                elif name.endswith(_ENTRY_SUFFIX):
+                    entries.append((info.st_mtime, info.st_size, item.path))
+
+            total = sum(size for _, size, _ in entries)
+            if total <= self.max_bytes:
+                return
+            # 한 번 정리할 때 여유를 두어(90%까지) 매 기록마다 정리하지 않도록 함
+            target = self.max_bytes * 9 // 10
+            for _, size, path in sorted(entries):
+                if total <= target:
+                    break
+                if _remove_quietly(path):
+                    total -= size
+        finally:
+            self._prune_lock.release()
+
+    def _fetch(self, url, key):
+        stored = self._load_from_disk(key)
+        headers = {}
+        if stored is not None:
+            if stored.etag:
+                headers["If-None-Match"] = stored.etag
+            if stored.last_modified:
+                headers["If-Modified-Since"] = stored.last_modified
+
+        res = get_http_client().get(url, headers=headers, timeout=self.timeout)
+        if res.status_code == 304 and stored is not None:
+            # 재검증한 항목은 ttl과 크기 정리 순서에서 최근 사용으로 취급
+            try:
+                os.utime(stored.disk_path)
+            except OSError:
+                pass
+            return stored
+
+        document = PageDocument(url, res.status_code, dict(res.headers), res.content)
+        if res.status_code == 200:
+            self._save_to_disk(key, document)
+        return document
+
+    def get(self, url):
+        """
+        url의 PageDocument를 반환합니다. 같은 URL에 대한 동시 요청은 하나의 다운로드를 공유합니다.
+        네트워크 오류는 requests.exceptions.RequestException으로 그대로 전달됩니다.
+        """
+        key = normalize_cache_key(url)
+        document = self._cached(key)
+        if document is not None:
+            return document
+        with self._lock_for(key):
+            document = self._cached(key)
+            if document is None:
+                document = self._fetch(url, key)
+                with self._lock:
+                    self._documents[key] = document
+                    while len(self._documents) > self.max_documents:
+                        evicted, _ = self._documents.popitem(last=False)
+                        self._drop_key_lock(evicted)
+        return document
+
+    def _cached(self, key):
+        with self._lock:
+            document = self._documents.get(key)
+            if document is not None:
+                self._documents.move_to_end(key)
+            return document
+
+    def _drop_key_lock(self, key):
+        # self._lock을 잡은 상태에서 호출. 다운로드 중인 URL의 잠금은 남겨 둠
+        lock = self._key_locks.get(key)
+        if lock is not None and not lock.locked():
+            del self._key_locks[key]
+
+    def discard(self, url):
+        """url의 페이지를 메모리에서 내보냅니다. (디스크 캐시는 그대로 둠)"""
+        key = normalize_cache_key(url)
+        with self._lock:
+            self._documents.pop(key, None)
+            self._drop_key_lock(key)
+
+    def clear(self):
+        with self._lock:
+            self._documents.clear()
+            self._key_locks.clear()
+
+
+def _remove_quietly(path):
+    try:
+        os.remove(path)
+        return True
+    except OSError:
+        return False
+
+
+# Audit 실행 동안 사용할 공유 캐시 (AuditEngine이 설정)
+_active_cache = None
+
+
+def activate_page_cache(cache):
+    """
+    fetch_document가 사용할 공유 캐시를 설정하고 이전 캐시를 반환합니다.
+    None을 넘기면 캐시 없이 매번 새로 내려받습니다.
+    """
+    global _active_cache
+    previous = _active_cache
+    _active_cache = cache
+    return previous
+
+
+def fetch_document(url):
+    """
+    페이지를 가져오는 공용 진입점입니다. generate_metadata, collect_alt_texts 등
+    페이지 검사 함수는 직접 요청하는 대신 이 함수를 사용해 다운로드와 파싱을 공유합니다.
+    """
+    cache = _active_cache
+    if cache is None:
+        cache = PageCache()
+    return cache.get(url)
@@ -0,0 +1,152 @@
+from html import unescape
+from html.parser import HTMLParser
+
+# start()의 반환값: 요소가 닫힐 때 end(tag, None)을 호출 / 요소 안의 텍스트를 모아 end(tag, text)를 호출
+TRACK_END = 1
+TRACK_TEXT = 2
+
+# 닫는 태그 없이 끝나는 요소 (BeautifulSoup html.parser 빌더와 같은 목록)
+VOID_TAGS = frozenset((
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "keygen", "link", "menuitem", "meta",
+    "param", "source", "track", "wbr", "basefont", "bgsound", "command", "frame", "image", "isindex",
+    "nextid", "spacer",
+))
+
+
+def is_hidden_style(style, classes, has_hidden_attr):
+    """style 속성, class 목록, hidden 속성 여부로 요소 자체가 숨김 처리되어 있는지 판단합니다."""
+    # style 정규화(공백 제거, 소문자)는 한 번만 수행
+    normalized = style.replace(" ", "").lower() if style else ""
+    return (
+        "display:none" in normalized
+        or "visibility:hidden" in normalized
+        or has_hidden_attr
+        or "hidden" in classes
+    )
+
+
+class PageRule:
+    """
+    한 번의 문서 순회에서 실행되는 페이지 검사 규칙의 기본 클래스입니다.
+    tags에 있는 태그가 열릴 때마다 start(tag, values, hidden)가 호출됩니다.
+    - values: 속성 dict (중복 속성은 마지막 값, 값이 없는 속성은 "")
+    - hidden: 요소 자신이나 조상 중 하나가 숨김 처리되어 있는지 여부
+    start가 TRACK_END/TRACK_TEXT를 반환하면 그 요소가 닫힐 때 end(tag, text)가 호출되고,
+    순회가 끝나면 result()의 반환값이 규칙 이름으로 저장됩니다.
+    규칙 객체는 문서마다 새로 만들어지므로 상태를 인스턴스에 보관해도 됩니다.
+    """
+
+    tags = ()
+
+    def start(self, tag, values, hidden):
+        return None
+
+    def end(self, tag, text):
+        pass
+
+    def result(self):
+        return None
+
+
+_rules = {}
+
+
+def register_rule(name, factory):
+    """
+    문서 순회에 참여할 규칙을 등록합니다. factory는 인자 없이 PageRule 객체를 만드는 callable입니다.
+    검사를 추가해도 문서는 한 번만 읽으므로 파싱과 순회 비용은 늘어나지 않습니다.
+    """
+    _rules[name] = factory
+
+
+class _RuleWalker(HTMLParser):
+    """
+    문서를 한 번 읽으면서 열린 요소 스택(태그, 숨김 여부)을 유지하고, 각 요소를 관심 있는 규칙에 전달합니다.
+    트리는 만들지 않지만 요소를 닫는 방식(void 요소, 짝이 없는 닫는 태그 무시, 가장 가까운 같은 태그까지 닫기)은
+    BeautifulSoup의 html.parser 빌더와 같으므로 조상 관계도 같습니다.
+    """
+
+    def __init__(self, rules):
+        super().__init__(convert_charrefs=False)
+        self.rules = rules
+        self._dispatch = {}
+        for rule in rules:
+            for tag in rule.tags:
+                self._dispatch.setdefault(tag, []).append(rule)
+        self._stack = []
+        # (요소의 스택 위치, 규칙, 모드, 텍스트 조각)
+        self._tracked = []
+
+    def handle_starttag(self, tag, attrs):
+        parent_hidden = self._stack[-1][1] if self._stack else False
+        rules = self._dispatch.get(tag)
+        values = None
+        if parent_hidden:
+            hidden = True
+        elif attrs:
+            values = {name: value or "" for name, value in attrs}
+            hidden = is_hidden_style(values.get("style", ""), values.get("class", "").split(), "hidden" in values)
+        else:
+            hidden = False
+
+        void = tag in VOID_TAGS
+        if not void:
+            self._stack.append((tag, hidden))
+        if rules is None:
+            return
+        if values is None:
+            values = {name: value or "" for name, value in attrs}
+        for rule in rules:
+            mode = rule.start(tag, values, hidden)
+            if not mode:
+                continue
+            if void:
+                rule.end(tag, "" if mode == TRACK_TEXT else None)
+            else:
+                self._tracked.append((len(self._stack) - 1, rule, mode, []))
+
+    def handle_endtag(self, tag):
+        stack = self._stack
+        for index in range(len(stack) - 1, -1, -1):
+            if stack[index][0] == tag:
+                self._pop_to(index)
+                return
+
+    def _pop_to(self, index):
+        # index 위치의 요소와 그 안에서 닫히지 않은 요소를 모두 닫음 (안쪽 요소부터)
+        tracked = self._tracked
+        while tracked and tracked[-1][0] >= index:
+            position, rule, mode, parts = tracked.pop()
+            rule.end(self._stack[position][0], "".join(parts) if mode == TRACK_TEXT else None)
+        del self._stack[index:]
+
+    def handle_data(self, data):
+        for _, _, mode, parts in self._tracked:
+            if mode == TRACK_TEXT:
+                parts.append(data)
+
+    def handle_entityref(self, name):
+        self.handle_data(unescape(f"&{name};"))
+
+    def handle_charref(self, name):
+        self.handle_data(unescape(f"&#{name};"))
+
+    def close(self):
+        super().close()
+        # 닫히지 않은 요소는 문서 끝에서 닫힌 것으로 처리
+        self._pop_to(0)
+
+
+def run_rules(text, exclude=()):
+    """
+    등록된 규칙(exclude에 있는 이름 제외)을 문서 text 한 번의 순회로 모두 실행하고 {규칙 이름: 결과}를 반환합니다.
+    보통은 직접 호출하지 않고 PageDocument.rule_result(name)로 결과를 공유해 사용합니다.
+    """
+    rules = {name: factory() for name, factory in list(_rules.items()) if name not in exclude}
+    if not rules:
+        return {}
+    walker = _RuleWalker(list(rules.values()))
+    walker.feed(text)
+    walker.close()
+    return {name: rule.result() for name, rule in rules.items()}
+
@@ -1,23 +1,374 @@
+import base64
+import json
 import os
-import pandas as pd
+import zlib
+from html.parser import HTMLParser
 from urllib.parse import urlparse
-import json
+from jinja2 import Environment, FileSystemLoader, TemplateNotFound
+
+from result_store import result_seo_records
+
+LENGTH_CHECK_ROWS = ["Title", "Description", "OG Title", "OG Description"]
+OK_COMMENTS = ['이슈 없음', 'n/a', '']
+# 이미지 행이 이 개수를 넘으면 기본적으로 데이터 기반 경량 리포트를 생성
+COMPACT_REPORT_ROW_THRESHOLD = 5000
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+
+_template_env = None
+
+
+def get_template_env():
+    global _template_env
+    if _template_env is None:
+        # 리포트 값에는 의도적으로 HTML(<h1> 등)이 들어가므로 autoescape를 사용하지 않음
+        _template_env = Environment(loader=FileSystemLoader(TEMPLATE_DIR), autoescape=False,
+                                    trim_blocks=True, lstrip_blocks=True, keep_trailing_newline=True)
+    return _template_env
+
+
+def _cell(value):
+    # 빈 값(None, DataFrame의 NaN)은 빈 문자열로 표시
+    return "" if value is None or value != value else str(value)
+
+
+class _TextParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+
+    def handle_data(self, data):
+        self.parts.append(data)
+
+
+def text_of(value):
+    """리포트 셀 값(<h1> 등 HTML이 들어 있을 수 있음)을 브라우저 textContent와 같은 텍스트로 바꿉니다."""
+    if "<" not in value and "&" not in value:
+        return value.strip()
+    parser = _TextParser()
+    parser.feed(value)
+    parser.close()
+    return "".join(parser.parts).strip()
+
+
+def get_tab_name(url):
+    # URL에서 마지막 경로를 탭 이름으로 사용
+    path_segment = urlparse(url).path.strip('/')
+    return path_segment.split('/')[-1] or urlparse(url).hostname
+
+
+def build_seo_row(row):
+    factor = row.get('항목', '')
+    comment = _cell(row.get("Comment"))
+    return {
+        "factor": factor,
+        "status": _cell(row.get("현황")),
+        "status_length": _cell(row.get("현황_길이")),
+        "comment": comment,
+        "seo_fix": _cell(row.get("SEO 수정안")),
+        "is_length_row": factor in LENGTH_CHECK_ROWS,
+        "comment_status": "ok" if comment.lower().strip() in OK_COMMENTS else 'issue',
+        "editable": factor == "통이미지 사용",
+    }
+
+
+def build_alt_row(alt_row):
+    alt_asis = _cell(alt_row.get("Alt Text (AS-IS)"))
+    default_alt_comment = "이슈 없음" if alt_asis.strip() else "수정 필요"
+    return {
+        "image_url": _cell(alt_row.get("Image URL")),
+        "alt_asis": alt_asis,
+        "comment": default_alt_comment,
+        "alt_to_be": "N/A" if alt_asis.strip() else "",
+        "comment_status": "ok" if default_alt_comment == '이슈 없음' else 'issue',
+    }
+
+
+def _alt_rows(alt_records, shared_images, shown):
+    """
+    탭 하나의 Image Alt QA 행. shared_images(여러 페이지에 같은 Alt로 나오는 (Image URL, Alt) 집합)에 있는 이미지는
+    처음 나온 탭에만 표시하고, 이미 표시한 것은 shown에 기록해 다음 탭부터 건너뜁니다.
+    """
+    if not shared_images:
+        return [build_alt_row(row) for row in alt_records]
+    rows = []
+    for row in alt_records:
+        key = (row.get("Image URL"), row.get("Alt Text (AS-IS)"))
+        if key in shared_images:
+            if key in shown:
+                continue
+            shown.add(key)
+        rows.append(build_alt_row(row))
+    return rows
+
+
+def _group_positions(df, column):
+    """df를 한 번만 훑어 column 값별 행 위치를 모읍니다. (URL별 반복 필터링 대신 사용)"""
+    if df is None or df.empty or column not in df.columns:
+        return {}
+    return df.groupby(column, sort=False).indices
+
+
+def iter_report_tabs(urls, final_df, alt_df, shared_images=None):
+    """
+    탭 하나를 렌더링하는 데 필요한 데이터만 URL 순서대로 만들어 냅니다.
+    템플릿이 탭을 출력하는 시점에 생성되므로 전체 리포트 데이터를 한꺼번에 만들지 않습니다.
+    shared_images(ImageRegistry.summary()["shared_keys"])를 넘기면 여러 페이지의 공통 이미지는 처음 나온 탭에만 넣습니다.
+    """
+    shown = set()
+    seo_positions = _group_positions(final_df, "URL")
+    alt_positions = _group_positions(alt_df, "Page URL")
+    for i, url in enumerate(urls):
+        seo_records = final_df.iloc[seo_positions[url]].to_dict("records") if url in seo_positions else []
+        alt_records = alt_df.iloc[alt_positions[url]].to_dict("records") if url in alt_positions else []
+        yield {
+            "index": i,
+            "url": url,
+            "seo_rows": [build_seo_row(row) for row in seo_records],
+            "alt_rows": _alt_rows(alt_records, shared_images, shown),
+        }
+
+
+def iter_store_report_tabs(result_store, shared_images=None):
+    """
+    iter_report_tabs와 같은 탭 데이터를 ResultStore에 저장된 순서(position)대로 URL 단위로 읽어 만듭니다.
+    URL 목록도 저장소에서 읽으므로 Audit 규모와 관계없이 한 번에 한 URL의 결과만 메모리에 올립니다.
+    """
+    _, float_columns = result_store.seo_columns()
+    shown = set()
+    for i, (_, result) in enumerate(result_store.iter_positioned_results()):
+        seo_records = result_store.normalize_records(result_seo_records(result), float_columns)
+        yield {
+            "index": i,
+            "url": result["url"],
+            "seo_rows": [build_seo_row(row) for row in seo_records],
+            "alt_rows": _alt_rows(result["alt_data"], shared_images, shown),
+        }
+
+
+def _iter_tabs(urls, final_df, alt_df, result_store=None, shared_images=None):
+    if result_store is not None:
+        return iter_store_report_tabs(result_store, shared_images)
+    return iter_report_tabs(urls, final_df, alt_df, shared_images)
+
+
+def _iter_tab_buttons(urls, result_store=None):
+    if result_store is not None:
+        urls = (url for _, url, _ in result_store.summaries())
+    return ({"index": i, "url": url, "name": get_tab_name(url)} for i, url in enumerate(urls))
 
-def generate_html_report(ticket_name, urls, final_df, alt_df, output_path):
+
+def iter_gzip_base64(chunks):
+    """
+    문자열 조각을 gzip으로 압축한 뒤 base64로 인코딩해 조각 단위로 반환합니다.
+    (base64는 3바이트 단위로 끊어 인코딩해야 하므로 나머지는 다음 조각으로 넘김)
+    """
+    compressor = zlib.compressobj(9, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    remainder = b""
+
+    def encode(data, final=False):
+        nonlocal remainder
+        data = remainder + data
+        cut = len(data) if final else len(data) - len(data) % 3
+        remainder = data[cut:]
+        return base64.b64encode(data[:cut]).decode("ascii")
+
+    for chunk in chunks:
+        encoded = encode(compressor.compress(chunk.encode("utf-8")))
+        if encoded:
+            yield encoded
+    yield encode(compressor.flush(), final=True)
+
+
+def _script_safe_json(value):
+    # <script> 안에 넣을 JSON: '</script>', '<!--'로 태그가 조기 종료되지 않도록 '<'를 유니코드 이스케이프
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).replace("<", "\\u003c")
+
+
+def iter_report_payload(ticket_name, urls, final_df, alt_df, result_store=None, shared_images=None):
+    """
+    데이터 기반 리포트에 넣을 JSON을 탭 단위 조각으로 만들어 냅니다.
+    행은 키 없이 배열로 저장해 용량을 줄이고, 기본 Comment/To-Be 값은 브라우저에서 계산합니다.
+    """
+    yield '{"ticket":' + _script_safe_json(ticket_name)
+    yield ',"lengthRows":' + _script_safe_json(LENGTH_CHECK_ROWS)
+    yield ',"tabs":['
+    for tab in _iter_tabs(urls, final_df, alt_df, result_store, shared_images):
+        yield ("," if tab["index"] else "") + _script_safe_json(_payload_tab(tab))
+    yield "]}"
+
+
+def _payload_tab(tab):
+    return {
+        "url": tab["url"],
+        "name": get_tab_name(tab["url"]),
+        "seo": [[row["factor"], row["status"], row["status_length"], row["comment"], row["seo_fix"]]
+                for row in tab["seo_rows"]],
+        "alt": [[alt["image_url"], alt["alt_asis"]] for alt in tab["alt_rows"]],
+    }
+
+
+def live_report_dir(report_path):
+    """리포트 옆에 만들 진행 중 리포트 폴더 (report.html -> report.live/)"""
+    return os.path.splitext(report_path)[0] + ".live"
+
+
+def _write_atomic(path, text):
+    # 브라우저가 기록 중인 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+    temp_path = path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(temp_path, path)
+
+
+class LiveReportWriter:
+    """
+    Audit이 끝나기 전에도 완료된 URL부터 볼 수 있는 진행 중 리포트를 live_dir에 기록합니다.
+    - index.html: 한 번만 만드는 리포트 틀. 브라우저에서 progress.js를 주기적으로 읽고 새 탭 조각을 불러옵니다.
+    - tabs/NNNNNN.js: URL 하나가 끝날 때마다 그 URL의 탭 데이터만 담아 새로 쓰는 조각 (완료 순서 번호)
+    - progress.js: 진행 상황(완료/실패/전체 URL 수, 조각 수). 크기가 일정해 매번 새로 써도 비용이 같습니다.
+    URL 하나를 추가하는 비용은 그 URL의 결과 크기에만 비례하며, 전체 문서를 다시 만들지 않습니다.
+    결과는 한 프로세스에서만 기록해야 합니다. (여러 워커가 같은 큐를 나눠 처리할 때는 하나만 사용)
+    """
+
+    def __init__(self, ticket_name, live_dir, total):
+        self.ticket_name = ticket_name
+        self.live_dir = live_dir
+        self.total = total
+        self.index_path = os.path.join(live_dir, "index.html")
+        self._tabs_dir = os.path.join(live_dir, "tabs")
+        self._fragments = 0
+        self._completed = 0
+        self._failed = 0
+        self._report = None
+        self._finished = False
+
+    def start(self, result_store=None):
+        """
+        폴더를 비우고 index.html을 만듭니다. result_store에 이미 결과가 있으면(--resume)
+        그 URL들의 조각을 먼저 기록합니다. 리포트 틀을 만들지 못하면 False를 반환합니다.
+        """
+        try:
+            env = get_template_env()
+            template = env.get_template("report_live_template.html")
+            with open(os.path.join(TEMPLATE_DIR, "report_style.css"), "r", encoding="utf-8") as f:
+                report_css = f.read()
+            with open(os.path.join(TEMPLATE_DIR, "report_script.js"), "r", encoding="utf-8") as f:
+                report_js = f.read()
+            try:
+                with open(os.path.join(TEMPLATE_DIR, "sheetjs.min.js"), "r", encoding="utf-8") as f:
+                    sheetjs_js = f.read()
+            except FileNotFoundError:
+                sheetjs_js = "alert('Excel 내보내기 기능에 필요한 sheetjs.min.js 파일을 templates 폴더에서 찾을 수 없습니다.');"
+        except (FileNotFoundError, TemplateNotFound) as e:
+            print(f"오류: {getattr(e, 'filename', None) or e} 파일을 찾을 수 없습니다.")
+            return False
+
+        os.makedirs(self._tabs_dir, exist_ok=True)
+        for name in os.listdir(self._tabs_dir):
+            os.remove(os.path.join(self._tabs_dir, name))
+        self._write_progress()
+        stream = template.generate(
+            ticket_name=self.ticket_name,
+            length_rows_json=json.dumps(LENGTH_CHECK_ROWS, ensure_ascii=False),
+            report_css=report_css,
+            report_js=report_js,
+            sheetjs_encoding="gzip+base64",
+            sheetjs_chunks=iter_gzip_base64([sheetjs_js]),
+        )
+        with open(self.index_path, "w", encoding="utf-8") as f:
+            f.writelines(stream)
+
+        if result_store is not None:
+            for position, result in result_store.iter_positioned_results():
+                self.add(position, result)
+        return True
+
+    def add(self, position, result):
+        """position(입력 순서) URL의 결과를 조각으로 기록하고 진행 상황을 갱신합니다."""
+        tab = {
+            "url": result["url"],
+            "seo_rows": [build_seo_row(row) for row in result_seo_records(result)],
+            "alt_rows": [build_alt_row(row) for row in result["alt_data"]],
+        }
+        self._fragments += 1
+        self._completed += 1
+        if result["error"]:
+            self._failed += 1
+        _write_atomic(os.path.join(self._tabs_dir, f"{self._fragments:06d}.js"),
+                      f"reportLive.addTab({position},{_script_safe_json(_payload_tab(tab))});\n")
+        self._write_progress()
+
+    def finish(self, report_path=None):
+        """진행 중 표시를 끝내고, report_path가 있으면 최종 리포트 링크를 표시합니다."""
+        self._finished = True
+        if report_path:
+            self._report = os.path.relpath(report_path, self.live_dir).replace(os.sep, "/")
+        self._write_progress()
+
+    def _write_progress(self):
+        progress = {"completed": self._completed, "failed": self._failed, "total": self.total,
+                    "fragments": self._fragments, "finished": self._finished, "report": self._report}
+        _write_atomic(os.path.join(self.live_dir, "progress.js"),
+                      f"reportLive.progress({_script_safe_json(progress)});\n")
+
+
+def should_use_compact_report(alt_df):
+    return alt_df is not None and len(alt_df) > COMPACT_REPORT_ROW_THRESHOLD
+
+
+def build_run_stats_context(summary):
+    """RunStats.summary() 결과를 리포트 상단 'Run stats' 표에 쓸 형태로 바꿉니다. (오래 걸린 단계 순)"""
+    if not summary:
+        return None
+    peak = summary.get("peak_memory_bytes")
+    stages = [
+        {"name": name, "count": agg["count"], "wall_seconds": agg["wall_seconds"],
+         "max_seconds": agg["max_seconds"], "requests": agg["requests"],
+         "kilobytes": round(agg["bytes"] / 1024, 1),
+         "max_memory_delta_kb": (round(agg["max_memory_delta_bytes"] / 1024, 1)
+                                 if agg.get("max_memory_delta_bytes") is not None else None)}
+        for name, agg in summary.get("stages", {}).items()
+    ]
+    stages.sort(key=lambda row: row["wall_seconds"], reverse=True)
+    return {
+        "elapsed_seconds": summary.get("elapsed_seconds"),
+        "peak_memory_mb": round(peak / (1024 * 1024), 1) if peak else None,
+        "stages": stages,
+    }
+
+
+def generate_html_report(ticket_name, urls, final_df, alt_df, output_path, compact=None, compress=True,
+                         run_stats=None, result_store=None, run_diff=None, duplicates=None, images=None):
     """
     HTML 템플릿과 외부 CSS, JS 파일 내용을 읽어와 하나의 독립적인 HTML 파일로 생성합니다.
+    URL별 데이터는 한 번의 group-by로 나누고, 탭이 렌더링되는 대로 파일에 바로 기록합니다.
+
+    compact=True이면 표를 HTML로 미리 만들지 않고 Audit 데이터를 JSON(compress=True이면 gzip+base64)으로
+    넣은 경량 리포트를 만듭니다. 브라우저가 탭을 열 때 표를 그리며 이미지 표는 보이는 행만 렌더링합니다.
+    compact=None이면 이미지 행 수(COMPACT_REPORT_ROW_THRESHOLD)를 기준으로 자동 선택합니다.
+    result_store(ResultStore)를 넘기면 urls, final_df, alt_df 대신 저장소에 기록된 순서대로 URL 단위로 읽어
+    리포트를 만듭니다. (이때 urls는 None이어도 됨)
+    run_stats(RunStats.summary())를 넘기면 리포트 상단에 접이식 단계별 계측 표를 추가합니다.
+    run_diff(AuditHistory.compare())를 넘기면 같은 티켓의 이전 리포트 대비 수정됨/새 이슈/그대로인 이슈를 표시합니다.
+    duplicates(DuplicateIndex.clusters())를 넘기면 여러 페이지가 같거나 비슷한 Title/Description/H1을 쓰는 묶음을 표시합니다.
+    images(ImageRegistry.summary())를 넘기면 여러 페이지에 같은 Alt로 나오는 이미지는 처음 나온 탭의 Image Alt QA에만
+    넣고, 상단에 공통 이미지와 용량 큰 이미지 표를 표시합니다.
     """
-    length_check_rows = ["Title", "Description", "OG Title", "OG Description"]
-    
+    shared_images = images["shared_keys"] if images else None
+    if compact is None:
+        if result_store is not None:
+            compact = result_store.alt_row_count() > COMPACT_REPORT_ROW_THRESHOLD
+        else:
+            compact = should_use_compact_report(alt_df)
+
     # 1. 템플릿, CSS, JS 파일 내용 읽기
     try:
-        # 이 스크립트가 실행되는 위치를 기준으로 templates 폴더의 경로를 설정합니다.
-        script_dir = os.path.dirname(__file__)
         def read_file(file_name):
-            with open(os.path.join(script_dir, "templates", file_name), "r", encoding="utf-8") as f:
+            with open(os.path.join(TEMPLATE_DIR, file_name), "r", encoding="utf-8") as f:
                 return f.read()
 
-        template = read_file("report_template.html")
+        env = get_template_env()
+        template = env.get_template("report_data_template.html" if compact else "report_template.html")
         report_css = read_file("report_style.css")
         # sheetjs.min.js 파일도 읽어옵니다.
         try:
@@ -26,101 +377,38 @@ def generate_html_report(ticket_name, urls, final_df, alt_df, output_path):
             sheetjs_js = "alert('Excel 내보내기 기능에 필요한 sheetjs.min.js 파일을 templates 폴더에서 찾을 수 없습니다.');"
         report_js = read_file("report_script.js")
 
-    except FileNotFoundError as e:
-        print(f"오류: {e.filename} 파일을 찾을 수 없습니다.")
+    except (FileNotFoundError, TemplateNotFound) as e:
+        print(f"오류: {getattr(e, 'filename', None) or e} 파일을 찾을 수 없습니다.")
         print("프로젝트 폴더에 templates 폴더와 그 안의 파일들이 모두 있는지 확인해주세요.")
         return
 
-    # 2. 탭 버튼 HTML 생성
-    tab_buttons_html = ""
-    for i, url in enumerate(urls):
-        # URL에서 마지막 경로를 탭 이름으로 사용
-        path_segment = urlparse(url).path.strip('/')
-        tab_name = path_segment.split('/')[-1] or urlparse(url).hostname
-        tab_buttons_html += f"<button class='tab-button' title='{url}' onclick='showTab({i})'>{tab_name}</button>\n"
+    if compact:
+        payload = iter_report_payload(ticket_name, urls, final_df, alt_df, result_store, shared_images)
+        context = {
+            "payload_encoding": "gzip+base64" if compress else "json",
+            "payload_chunks": iter_gzip_base64(payload) if compress else payload,
+            # SheetJS는 Excel 내보내기 때만 압축을 풀어 로드
+            "sheetjs_encoding": "gzip+base64",
+            "sheetjs_chunks": iter_gzip_base64([sheetjs_js]),
+        }
+    else:
+        # 2. 탭 버튼 / 탭 콘텐츠 데이터
+        context = {
+            "tab_buttons": _iter_tab_buttons(urls, result_store),
+            "tabs": _iter_tabs(urls, final_df, alt_df, result_store, shared_images),
+            "sheetjs_js": sheetjs_js,
+        }
 
-    # 3. 탭 콘텐츠 HTML 생성
-    tab_contents_html = ""
-    for i, url in enumerate(urls):
-        active_class = "active" if i == 0 else ""
-        tab_contents_html += f"<div id='urlContent_{i}' class='tab-content {active_class}'>\n"
-        
-        # SEO QA 테이블
-        tab_contents_html += "<h3>SEO QA</h3>\n"
-        tab_contents_html += "<table class='seo-table'><thead><tr><th>항목</th><th style='width:30%'>현황</th><th class='len-col'>길이</th><th style='width:22%'>Comment</th><th style='width:auto'>SEO 수정안</th><th class='len-col'>길이</th></tr></thead><tbody>\n"
-        
-        url_df = final_df[final_df["URL"] == url]
-        for _, row in url_df.iterrows():
-            factor = row.get('항목', '')
-            현황 = "" if pd.isna(row.get("현황")) else str(row["현황"])
-            현황_길이 = "" if pd.isna(row.get("현황_길이")) else str(row["현황_길이"])
-            comment = "" if pd.isna(row.get("Comment")) else str(row["Comment"])
-            seo_fix = "" if pd.isna(row.get("SEO 수정안")) else str(row["SEO 수정안"])
-            
-            is_length_row = factor in length_check_rows
-            comment_status = "ok" if str(comment).lower().strip() in ['이슈 없음', 'n/a', ''] else 'issue'
-            editable_status = " contenteditable='true'" if factor == "통이미지 사용" else ""
-
-            tab_contents_html += "<tr>\n"
-            tab_contents_html += f"  <td class='factor-name'>{factor}</td>\n"
-            
-            # 현황 및 현황-길이 칸 처리
-            if is_length_row:
-                tab_contents_html += f"  <td><div class='editable-field'>{현황}</div></td>\n"
-                tab_contents_html += f"  <td class='len-col'>{현황_길이}</td>\n"
-            else:
-                if editable_status:
-                    tab_contents_html += f"  <td colspan='2'><div class='editable-field'{editable_status}>{현황}</div></td>\n"
-                else:
-                    tab_contents_html += f"  <td colspan='2'>{현황}</td>\n"
-            
-            # Comment 칸 처리
-            tab_contents_html += f"  <td class='comment-cell' data-status='{comment_status}'><div class='editable-field' contenteditable='true'>{comment}</div></td>\n"
-            
-            # SEO 수정안 및 SEO 수정안-길이 칸 처리
-            if is_length_row:
-                tab_contents_html += f"  <td class='fix-cell'><div class='editable-field' contenteditable='true'>{seo_fix}</div></td>\n"
-                tab_contents_html += f"  <td class='len-col len-counter-fix'>0자</td>\n"
-            else:
-                tab_contents_html += f"  <td class='fix-cell' colspan='2'><div class='editable-field' contenteditable='true'>{seo_fix}</div></td>\n"
-            tab_contents_html += "</tr>\n"
-        tab_contents_html += "</tbody></table>\n"
-        
-        # Alt Text 테이블
-        alt_data_for_current_url = alt_df[alt_df["Page URL"] == url]
-        if not alt_data_for_current_url.empty:
-            tab_contents_html += "<h3>Image Alt QA</h3>\n"
-            tab_contents_html += "<table class='alt-table'><thead><tr><th style='width:25%'>Image URL</th><th>Preview</th><th style='width:20%'>Alt Text (AS-IS)</th><th class='sortable' style='width:15%'>SEO Comment <i class='sort-icon'>&#8597;</i></th><th>Alt Text (To-Be)</th></tr></thead><tbody>\n"
-            for _, alt_row in alt_data_for_current_url.iterrows():
-                image_url = "" if pd.isna(alt_row.get("Image URL")) else str(alt_row["Image URL"])
-                alt_asis = "" if pd.isna(alt_row.get("Alt Text (AS-IS)")) else str(alt_row["Alt Text (AS-IS)"])
-                default_alt_comment = "이슈 없음" if alt_asis.strip() else "수정 필요"
-                default_alt_to_be = "N/A" if alt_asis.strip() else ""
-                comment_status = "ok" if default_alt_comment == '이슈 없음' else 'issue'
-
-                tab_contents_html += f"""
-                <tr>
-                    <td>{image_url}</td>
-                    <td><img src="{image_url}" alt="Image Preview"></td>
-                    <td>{alt_asis}</td>
-                    <td class='comment-cell' data-status='{comment_status}'><div class='alt-comment-toggle'>{default_alt_comment}</div></td>
-                    <td><div class='editable-field' contenteditable='true'>{default_alt_to_be}</div></td>
-                </tr>
-                """
-            tab_contents_html += "</tbody></table>\n"
-        
-        tab_contents_html += "</div>\n"
-
-    # 4. 템플릿에 모든 데이터와 코드 주입
-    final_html = template.replace("{{TICKET_NAME}}", ticket_name)
-    final_html = final_html.replace("{{TAB_BUTTONS}}", tab_buttons_html)
-    final_html = final_html.replace("{{TAB_CONTENTS}}", tab_contents_html)
-    
-    # 외부 파일을 링크하는 대신, 파일 내용을 직접 삽입
-    final_html = final_html.replace('<link rel="stylesheet" href="report_style.css" />', f"<style>{report_css}</style>")
-    final_html = final_html.replace('<script src="sheetjs.min.js"></script>', f"<script>{sheetjs_js}</script>")
-    final_html = final_html.replace('<script src="report_script.js"></script>', f"<script>{report_js}</script>")
-
-    # 5. 최종 HTML 파일 저장
+    # 3. 템플릿 렌더링 결과를 조각 단위로 바로 파일에 기록
+    stream = template.generate(
+        ticket_name=ticket_name,
+        report_css=report_css,
+        report_js=report_js,
+        run_stats=build_run_stats_context(run_stats),
+        run_diff=run_diff,
+        duplicates=duplicates,
+        images=images,
+        **context,
+    )
     with open(output_path, "w", encoding="utf-8") as f:
-        f.write(final_html)
\ No newline at end of file
+        f.writelines(stream)
@@ -0,0 +1,296 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+ALT_COLUMNS = ["Page URL", "Image URL", "Alt Text (AS-IS)"]
+_NAN = float("nan")
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _is_missing(value):
+    return value is None or (isinstance(value, float) and value != value)
+
+
+class SeoRecord:
+    """
+    리포트 SEO 행 하나. 자주 쓰는 컬럼은 slot에, 그 밖의 컬럼은 extra에 담습니다.
+    dict처럼 get(컬럼명)으로 읽을 수 있어 build_seo_row에 그대로 넘길 수 있고,
+    columns에 원래 키 순서를 유지하므로 CSV 컬럼 순서도 기존과 같습니다.
+    """
+    __slots__ = ("columns", "url", "factor", "status", "status_length", "comment", "seo_fix", "extra")
+
+    FIELDS = {"URL": "url", "항목": "factor", "현황": "status", "현황_길이": "status_length",
+              "Comment": "comment", "SEO 수정안": "seo_fix"}
+    # 같은 컬럼 순서는 행마다 새로 만들지 않고 하나의 tuple을 공유
+    _column_orders = {}
+
+    def __init__(self, url, factor, values):
+        columns = ("URL", "항목", *(key for key in values if key not in ("URL", "항목")))
+        self.columns = self._column_orders.setdefault(columns, columns)
+        self.url = url
+        self.factor = factor
+        self.status = self.status_length = self.comment = self.seo_fix = _MISSING
+        self.extra = None
+        for key, value in values.items():
+            if key not in ("URL", "항목"):
+                self.set(key, value)
+
+    def get(self, column, default=None):
+        attr = self.FIELDS.get(column)
+        if attr is not None:
+            value = getattr(self, attr)
+        elif self.extra is not None:
+            value = self.extra.get(column, _MISSING)
+        else:
+            value = _MISSING
+        return default if value is _MISSING else value
+
+    def set(self, column, value):
+        attr = self.FIELDS.get(column)
+        if attr is not None:
+            setattr(self, attr, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[column] = value
+
+    def items(self):
+        return [(column, self.get(column)) for column in self.columns]
+
+
+_MISSING = object()
+
+
+# pandas 없이 행을 만들지만 형식 결정 규칙은 일부러 pandas와 같게 유지합니다.
+# 기존 리포트/CSV는 URL별 DataFrame을 합친 값을 그대로 출력해, 빈 값이 섞인 숫자 컬럼(현황_길이 등)은
+# "3"이 아니라 "3.0"으로 표시되었습니다. 값을 바로 출력하면 이전 리포트와 비교하거나 CSV를 읽는
+# 쪽에서 같은 값이 다르게 보이므로 이 형식을 바꾸지 않습니다.
+def _frame_kinds(records):
+    """
+    records로 DataFrame을 만들었을 때 컬럼별로 pandas가 정할 형식을 구합니다.
+    ("int": 정수만 있고 빈 값 없음, "float": 숫자뿐인데 빈 값이나 소수가 섞임, "other": 그 외)
+    """
+    kinds = {}
+    for key in dict.fromkeys(key for record in records for key in record.columns):
+        # 키가 없는 행은 NaN, 값이 None인 행은 None으로 들어감 (None만 있는 컬럼은 object)
+        values = [record.get(key, _NAN) for record in records]
+        present = [value for value in values if not _is_missing(value)]
+        if not present:
+            kinds[key] = "other" if all(value is None for value in values) else "float"
+        elif not all(_is_number(value) for value in present):
+            kinds[key] = "other"
+        elif len(present) < len(values) or any(isinstance(value, float) for value in present):
+            kinds[key] = "float"
+        else:
+            kinds[key] = "int"
+    return kinds
+
+
+def result_seo_frame(result):
+    """
+    URL 하나의 리포트 행(SeoRecord)과 컬럼별 형식을 반환합니다. float 컬럼의 값은 float으로 바꿔 둡니다.
+    형식은 Audit_URL 행을 제외하기 전의 전체 행을 기준으로 정합니다.
+    """
+    url = result["url"]
+    records = [SeoRecord(url, k, v) for k, v in result["meta"].items()]
+    kinds = _frame_kinds(records)
+    audit_url_value = next((r.get("현황") for r in records if r.factor == "Audit_URL"), None)
+    if audit_url_value == url:
+        records = [r for r in records if r.factor != "Audit_URL"]
+    float_keys = [key for key, kind in kinds.items() if kind == "float"]
+    for record in records:
+        for key in float_keys:
+            value = record.get(key)
+            record.set(key, None if _is_missing(value) else float(value))
+    return records, kinds
+
+
+def result_seo_records(result):
+    """
+    URL 하나의 Audit 결과(meta)를 리포트 행(SeoRecord) 목록으로 바꿉니다.
+    Audit_URL 항목이 Audit한 URL과 같으면(리다이렉트 없음) 행에서 제외합니다.
+    """
+    return result_seo_frame(result)[0]
+
+
+class ResultStore:
+    """
+    Audit 결과를 URL이 끝날 때마다 SQLite 파일에 추가하는 저장소입니다.
+    결과를 메모리에 모아 두지 않으므로 Audit 규모와 관계없이 메모리 사용량이 일정하고,
+    실행이 중간에 중단되어도 그때까지 끝난 URL의 결과는 파일에 남습니다.
+    리포트/CSV/JSON은 이 저장소에서 URL 단위로 읽어 만듭니다.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        # 여러 프로세스(공유 폴더라면 여러 머신)가 같은 작업 큐로 함께 기록할 수 있도록 WAL 대신 기본 journal 사용
+        self._conn = sqlite3.connect(path, timeout=60, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS results (
+                    position INTEGER PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    error TEXT,
+                    meta TEXT NOT NULL,
+                    alt_data TEXT NOT NULL,
+                    alt_count INTEGER NOT NULL,
+                    completed_at REAL NOT NULL
+                )""")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS results_url ON results (url)")
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM results")
+
+    def add(self, position, result):
+        """URL 하나의 결과를 저장하고 바로 커밋합니다. (같은 position이면 덮어씀)"""
+        alt_data = result["alt_data"]
+        row = (position, result["url"], result["error"],
+               json.dumps(result["meta"], ensure_ascii=False, default=str),
+               json.dumps(alt_data, ensure_ascii=False, default=str),
+               len(alt_data), time.time())
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (position, url, error, meta, alt_data, alt_count, completed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)", row)
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def count(self):
+        return self._query("SELECT COUNT(*) FROM results")[0][0]
+
+    def alt_row_count(self):
+        return self._query("SELECT COALESCE(SUM(alt_count), 0) FROM results")[0][0]
+
+    def summaries(self):
+        """저장된 결과의 (position, url, error) 목록 (position 순)"""
+        return self._query("SELECT position, url, error FROM results ORDER BY position")
+
+    def _iter_rows(self, sql, params=()):
+        return self.iter_results_at([row[0] for row in self._query(sql, params)])
+
+    def iter_results_at(self, positions):
+        """positions 순서대로 저장된 (position, 결과) 쌍을 반환합니다. (결과가 없는 position은 건너뜀)"""
+        # 한 번에 한 URL씩만 메모리에 올림
+        for position in positions:
+            row = self._query("SELECT url, error, meta, alt_data FROM results WHERE position = ?", (position,))
+            if row:
+                url, error, meta, alt_data = row[0]
+                yield position, {"url": url, "error": error, "meta": json.loads(meta), "alt_data": json.loads(alt_data)}
+
+    def iter_results(self):
+        """저장된 결과를 engine 결과와 같은 dict 형식으로 position 순서대로 하나씩 반환합니다."""
+        return (result for _, result in self.iter_positioned_results())
+
+    def iter_positioned_results(self):
+        """iter_results와 같지만 (position, 결과) 쌍을 반환합니다."""
+        return self._iter_rows("SELECT position FROM results ORDER BY position")
+
+    def seo_columns(self):
+        """
+        전체 결과를 한 번 훑어 SEO 행의 컬럼 순서와, URL별 DataFrame을 concat했다면 float이 되었을 컬럼을 구합니다.
+        (URL마다 정수/float 여부가 다르거나 컬럼이 없는 URL이 있으면 pandas는 float으로 합치므로
+        조각 단위로 읽어도 리포트/CSV 출력이 기존과 같도록 맞추기 위함)
+        """
+        columns = {}
+        frames = 0
+        for result in self.iter_results():
+            records, kinds = result_seo_frame(result)
+            if not kinds:
+                continue
+            for key, stat in columns.items():
+                if key not in kinds:
+                    stat["missing"] = True
+            for key, kind in kinds.items():
+                # 앞선 URL에 없던 컬럼이면 그 URL들의 값은 빈 값
+                stat = columns.setdefault(key, {"kinds": set(), "missing": frames > 0})
+                if records:
+                    stat["kinds"].add(kind)
+                else:
+                    # Audit_URL 행만 있어 행이 모두 빠진 URL도 컬럼은 남으므로 빈 값으로 취급
+                    stat["missing"] = True
+            frames += 1
+        float_columns = {key for key, stat in columns.items()
+                         if stat["kinds"] and "other" not in stat["kinds"]
+                         and ("float" in stat["kinds"] or stat["missing"])}
+        return list(columns), float_columns
+
+    @staticmethod
+    def normalize_records(records, float_columns):
+        for record in records:
+            for key in float_columns:
+                value = record.get(key)
+                record.set(key, None if _is_missing(value) else float(value))
+        return records
+
+    def iter_seo_frames(self, chunk_rows=5000):
+        """
+        CSV 저장용: SEO 행을 chunk_rows개 정도씩 DataFrame으로 나눠 반환합니다.
+        조각마다 dtype이 달라지지 않도록 전체 기준으로 정한 float 컬럼 외에는 object로 유지합니다.
+        """
+        import pandas as pd
+
+        columns, float_columns = self.seo_columns()
+
+        def to_frame(records):
+            frame = pd.DataFrame([dict(record.items()) for record in records], columns=columns, dtype=object)
+            for key in float_columns:
+                frame[key] = frame[key].astype(float)
+            return frame
+
+        chunk = []
+        for result in self.iter_results():
+            chunk.extend(self.normalize_records(result_seo_records(result), float_columns))
+            if len(chunk) >= chunk_rows:
+                yield to_frame(chunk)
+                chunk = []
+        if chunk:
+            yield to_frame(chunk)
+
+    def iter_alt_frames(self, chunk_rows=5000):
+        """CSV 저장용: Alt Text 행을 chunk_rows개 정도씩 DataFrame으로 나눠 반환합니다."""
+        import pandas as pd
+
+        chunk = []
+        for result in self.iter_results():
+            chunk.extend(result["alt_data"])
+            if len(chunk) >= chunk_rows:
+                yield pd.DataFrame(chunk, columns=ALT_COLUMNS)
+                chunk = []
+        if chunk:
+            yield pd.DataFrame(chunk, columns=ALT_COLUMNS)
+
+    def write_csv(self, seo_path, alt_path):
+        """SEO/Alt Text 결과를 조각 단위로 CSV 파일에 기록합니다. (pandas는 이때 처음 import)"""
+        import pandas as pd
+
+        for path, frames in ((seo_path, self.iter_seo_frames()), (alt_path, self.iter_alt_frames())):
+            first = True
+            for frame in frames:
+                frame.to_csv(path, index=False, encoding="utf-8-sig" if first else "utf-8",
+                             mode="w" if first else "a", header=first)
+                first = False
+            if first:
+                pd.DataFrame(columns=ALT_COLUMNS if path == alt_path else self.seo_columns()[0]).to_csv(
+                    path, index=False, encoding="utf-8-sig")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def result_store_path(report_path):
+    """리포트 옆에 저장할 결과 저장소 경로 (report.html -> report.results.sqlite3)"""
+    base = report_path[:-5] if report_path.endswith(".html") else report_path
+    return base + ".results.sqlite3"
@@ -0,0 +1,88 @@
+import random
+from fnmatch import fnmatchcase
+from urllib.parse import urlparse
+
+from audit_log import log_event
+from sitemap_index import get_sitemap_index
+from sitemap_management import extract_base_url, find_sitemap_url
+
+# 섹션 = 사이트 기준 경로(예: /kr/ko/) 뒤의 첫 경로 단계 (예: /kr/ko/products/... -> "products")
+DEFAULT_SECTION_DEPTH = 1
+
+
+def url_section(url, base_path="/", depth=DEFAULT_SECTION_DEPTH):
+    """url이 속한 섹션 이름. base_path 아래 경로의 앞 depth단계를 '/'로 이은 값입니다. (최상위 페이지는 "")"""
+    path = urlparse(url).path
+    if base_path != "/" and path.startswith(base_path):
+        path = path[len(base_path):]
+    segments = [segment for segment in path.split("/") if segment]
+    # 마지막 단계는 페이지 자체이므로 섹션에서 제외 (예: /products/cream.html -> "products")
+    return "/".join(segments[:min(depth, max(0, len(segments) - 1))])
+
+
+class SitemapSampler:
+    """
+    사이트맵 URL 중 Audit할 URL을 고릅니다.
+    - patterns: URL 경로가 하나라도 맞아야 하는 glob 패턴 목록 (예: "*/products/*")
+    - per_section: 섹션별로 고를 URL 수. 섹션마다 무작위로 고르며(seed로 재현 가능)
+      섹션 수 x per_section개만 메모리에 유지합니다.
+    - max_urls: 전체 최대 URL 수
+    아무 조건도 없으면 URL을 그대로 흘려보내므로 사이트 크기와 관계없이 메모리 사용량이 일정합니다.
+    """
+
+    def __init__(self, patterns=None, per_section=None, max_urls=None, section_depth=DEFAULT_SECTION_DEPTH,
+                 seed=0):
+        self.patterns = [pattern for pattern in (patterns or []) if pattern]
+        self.per_section = per_section or None
+        self.max_urls = max_urls or None
+        self.section_depth = section_depth
+        self.seed = seed
+
+    def _matches(self, url):
+        if not self.patterns:
+            return True
+        path = urlparse(url).path
+        return any(fnmatchcase(path, pattern) or fnmatchcase(url, pattern) for pattern in self.patterns)
+
+    def sample(self, urls, base_url="/"):
+        base_path = urlparse(base_url).path or "/"
+        selected = (url for url in urls if self._matches(url))
+        if self.per_section:
+            selected = self._sample_sections(selected, base_path)
+        for count, url in enumerate(selected):
+            if self.max_urls and count >= self.max_urls:
+                return
+            yield url
+
+    def _sample_sections(self, urls, base_path):
+        # 섹션별 reservoir sampling: 섹션의 URL 수와 관계없이 per_section개만 유지
+        rnd = random.Random(self.seed)
+        reservoirs = {}
+        seen = {}
+        for url in urls:
+            section = url_section(url, base_path, self.section_depth)
+            reservoir = reservoirs.setdefault(section, [])
+            seen[section] = seen.get(section, 0) + 1
+            if len(reservoir) < self.per_section:
+                reservoir.append(url)
+            else:
+                slot = rnd.randrange(seen[section])
+                if slot < self.per_section:
+                    reservoir[slot] = url
+        for section in reservoirs:
+            yield from sorted(reservoirs[section])
+
+
+def iter_site_urls(site_url, sitemap_mapping, log_output=None, sampler=None):
+    """
+    site_url이 속한 사이트의 사이트맵(sitemap_mapping 또는 robots.txt)에서 URL을 하나씩 반환합니다.
+    사이트맵 URL은 디스크 인덱스(SitemapIndex)에서 나눠 읽고, sampler가 있으면 조건에 맞는 URL만 반환합니다.
+    """
+    base_url = extract_base_url(site_url)
+    sitemap_url = find_sitemap_url(base_url, sitemap_mapping, log_output)
+    if not sitemap_url:
+        log_event(log_output, "ERROR", f"No sitemap found for {site_url}; cannot enumerate site URLs.")
+        return
+    log_event(log_output, "INFO", f"Enumerating site URLs from {sitemap_url}")
+    urls = get_sitemap_index().iter_urls(sitemap_url, log_output)
+    yield from (sampler or SitemapSampler()).sample(urls, base_url)
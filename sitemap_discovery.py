@@ -0,0 +1,114 @@
+import json
+import os
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+
+from http_client import get_http_client
+
+DEFAULT_ROBOTS_CACHE_PATH = os.path.join("audit_cache", "robots_sitemaps.json")
+# robots.txt 조회 결과(사이트맵이 없는 경우 포함)를 재사용하는 기간(초)
+ROBOTS_CACHE_TTL = 24 * 60 * 60
+
+
+def parse_robots_sitemaps(robots_text):
+    """robots.txt 본문에서 Sitemap: 지시문의 URL 목록을 순서대로 반환합니다."""
+    sitemaps = []
+    for line in robots_text.splitlines():
+        line = line.split("#", 1)[0].strip()
+        if line[:8].lower() == "sitemap:":
+            sitemap_url = line[8:].strip()
+            if sitemap_url and sitemap_url not in sitemaps:
+                sitemaps.append(sitemap_url)
+    return sitemaps
+
+
+def choose_sitemap_for(base_url, sitemap_urls):
+    """
+    robots.txt에 사이트맵이 여러 개 있으면 base_url 경로와 가장 길게 겹치는 사이트맵을 고릅니다.
+    (예: /kr/ko/ 마켓에는 /kr/ko/sitemap.xml) 겹치는 것이 없으면 첫 번째를 사용합니다.
+    """
+    if not sitemap_urls:
+        return None
+    base_path = urlparse(base_url).path
+    best, best_len = sitemap_urls[0], 0
+    for sitemap_url in sitemap_urls:
+        sitemap_dir = urlparse(sitemap_url).path.rsplit("/", 1)[0] + "/"
+        if base_path.startswith(sitemap_dir) and len(sitemap_dir) > best_len:
+            best, best_len = sitemap_url, len(sitemap_dir)
+    return best
+
+
+class RobotsSitemapCache:
+    """
+    매핑에 없는 도메인의 사이트맵을 robots.txt의 Sitemap: 지시문으로 찾고,
+    결과를 origin(scheme://host) 단위로 TTL 동안 메모리와 디스크에 보관합니다.
+    """
+
+    def __init__(self, cache_path=DEFAULT_ROBOTS_CACHE_PATH, ttl=ROBOTS_CACHE_TTL):
+        self.cache_path = cache_path
+        self.ttl = ttl
+        self._entries = self._load()
+        self._origin_locks = {}
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        if not self.cache_path:
+            return
+        directory = os.path.dirname(self.cache_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        try:
+            with open(self.cache_path, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f, indent=2, ensure_ascii=False)
+        except OSError:
+            pass
+
+    def _lock_for(self, origin):
+        with self._lock:
+            return self._origin_locks.setdefault(origin, threading.Lock())
+
+    def sitemaps_for(self, url):
+        """url이 속한 origin의 robots.txt에 등록된 사이트맵 목록을 반환합니다. (실패 시 빈 목록)"""
+        parsed = urlparse(url)
+        origin = f"{parsed.scheme}://{parsed.netloc}"
+        with self._lock_for(origin):
+            entry = self._entries.get(origin)
+            if entry and time.time() - entry["fetched_at"] < self.ttl:
+                return entry["sitemaps"]
+
+            try:
+                res = get_http_client().get(f"{origin}/robots.txt")
+                sitemaps = parse_robots_sitemaps(res.text) if res.status_code == 200 else []
+            except requests.exceptions.RequestException:
+                # 일시적인 네트워크 오류는 캐시하지 않음
+                return entry["sitemaps"] if entry else []
+
+            with self._lock:
+                self._entries[origin] = {"sitemaps": sitemaps, "fetched_at": time.time()}
+                self._save()
+            return sitemaps
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_robots_sitemap_cache():
+    """프로세스 전체에서 공유하는 기본 RobotsSitemapCache를 반환합니다."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = RobotsSitemapCache()
+        return _default_cache
@@ -0,0 +1,230 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+import requests
+
+from audit_log import log_event
+from audit_stats import stage
+from http_client import get_http_client
+
+DEFAULT_INDEX_PATH = os.path.join("audit_cache", "sitemap_index.sqlite3")
+# 같은 실행 안에서는 이 시간(초) 동안 사이트맵 변경 여부를 다시 확인하지 않음
+REVALIDATE_INTERVAL = 600
+# 인덱스를 만들 때 이 수만큼 URL을 모아 한 트랜잭션으로 기록
+INDEX_WRITE_BATCH = 5000
+
+
+class SitemapIndex:
+    """
+    사이트맵별 URL 집합을 SQLite에 저장해 두고 포함 여부를 바로 조회하는 인덱스입니다.
+    최상위 사이트맵의 ETag/Last-Modified(또는 본문 해시, 인덱스의 lastmod 변경 포함)가
+    바뀐 경우에만 전체 사이트맵 트리를 다시 읽어 인덱스를 갱신합니다.
+    """
+
+    def __init__(self, db_path=DEFAULT_INDEX_PATH, revalidate_interval=REVALIDATE_INTERVAL):
+        self.db_path = db_path
+        self.revalidate_interval = revalidate_interval
+        self._checked_at = {}
+        self._root_locks = {}
+        self._lock = threading.Lock()
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS sitemap_meta (
+                    sitemap_url TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    signature TEXT,
+                    url_count INTEGER,
+                    built_at REAL
+                )""")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS sitemap_urls (
+                    sitemap_url TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    source_sitemap TEXT NOT NULL,
+                    PRIMARY KEY (sitemap_url, url)
+                ) WITHOUT ROWID""")
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _lock_for(self, sitemap_url):
+        with self._lock:
+            return self._root_locks.setdefault(sitemap_url, threading.Lock())
+
+    def _load_meta(self, sitemap_url):
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT etag, last_modified, signature FROM sitemap_meta WHERE sitemap_url = ?",
+                (sitemap_url,)).fetchone()
+
+    def ensure_fresh(self, sitemap_url, log_output=None):
+        """
+        인덱스가 최신인지 확인하고, 사이트맵이 바뀌었거나 인덱스가 없으면 다시 만듭니다.
+        """
+        with self._lock_for(sitemap_url):
+            checked_at = self._checked_at.get(sitemap_url)
+            if checked_at is not None and time.time() - checked_at < self.revalidate_interval:
+                return
+
+            meta = self._load_meta(sitemap_url)
+            headers = {}
+            if meta and meta[2]:
+                if meta[0]:
+                    headers["If-None-Match"] = meta[0]
+                if meta[1]:
+                    headers["If-Modified-Since"] = meta[1]
+
+            try:
+                response = get_http_client().open_stream(sitemap_url, headers=headers)
+            except requests.exceptions.RequestException as e:
+                log_event(log_output, "ERROR", f"Error fetching sitemap {sitemap_url}: {e}")
+                return
+
+            with response:
+                if response.status_code == 304:
+                    self._checked_at[sitemap_url] = time.time()
+                    return
+                if response.status_code != 200:
+                    log_event(log_output, "ERROR", f"Failed to fetch sitemap ({response.status_code}): {sitemap_url}")
+                    return
+                with stage("sitemap_index_build"):
+                    if not self._build(sitemap_url, response, meta[2] if meta else None, log_output):
+                        return
+            self._checked_at[sitemap_url] = time.time()
+
+    def _build(self, sitemap_url, response, previous_signature, log_output):
+        """
+        최상위 사이트맵을 스트리밍으로 읽으면서 본문 해시(signature)를 계산하고, 트리의 URL을
+        INDEX_WRITE_BATCH개씩 짧은 트랜잭션으로 임시 키(staging)에 기록합니다.
+        최상위 본문이 이전과 같으면 하위 사이트맵은 가져오지 않고 임시 기록을 버리며,
+        바뀌었으면 다 읽은 뒤 한 번의 트랜잭션으로 기존 인덱스와 교체합니다.
+        (쓰기 트랜잭션을 사이트맵 요청 동안 잡고 있지 않으며, 교체 전까지는 기존 인덱스가 조회됨)
+        최상위 사이트맵을 끝까지 읽지 못하면 기존 인덱스를 그대로 두고 False를 반환합니다.
+        """
+        from sitemap_management import SITEMAP_CHUNK_SIZE, iter_sitemap_entries
+
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        digest = hashlib.sha1()
+        state = {"root_read": False, "unchanged": False}
+
+        def chunks():
+            for chunk in response.iter_content(SITEMAP_CHUNK_SIZE):
+                digest.update(chunk)
+                yield chunk
+
+        def on_root_read():
+            # 최상위 사이트맵은 다 읽었으므로 하위 사이트맵을 가져오기 전에 연결(호스트 슬롯)을 반환
+            response.close()
+            state["root_read"] = True
+            state["unchanged"] = digest.hexdigest() == previous_signature
+            if not state["unchanged"]:
+                log_event(log_output, "INFO", f"Building sitemap index: {sitemap_url}")
+            return not state["unchanged"]
+
+        # 같은 사이트맵을 다른 프로세스가 동시에 만들어도 섞이지 않도록 프로세스별 임시 키 사용
+        staging_key = f"{sitemap_url}\0{os.getpid()}"
+        failures = []
+        started = time.time()
+        conn = self._connect()
+        swapped = False
+        try:
+            with conn:
+                conn.execute("DELETE FROM sitemap_urls WHERE sitemap_url = ?", (staging_key,))
+            batch = []
+            for loc, source in iter_sitemap_entries(sitemap_url, log_output, chunks=chunks(), failures=failures,
+                                                    on_root_read=on_root_read):
+                batch.append((staging_key, loc, source))
+                if len(batch) >= INDEX_WRITE_BATCH:
+                    self._insert_batch(conn, batch)
+                    batch = []
+            if batch:
+                self._insert_batch(conn, batch)
+
+            if not state["root_read"]:
+                return False
+            if state["unchanged"]:
+                with conn:
+                    conn.execute(
+                        "UPDATE sitemap_meta SET etag = ?, last_modified = ? WHERE sitemap_url = ?",
+                        (etag, last_modified, sitemap_url))
+                return True
+
+            with conn:
+                conn.execute("DELETE FROM sitemap_urls WHERE sitemap_url = ?", (sitemap_url,))
+                conn.execute("UPDATE sitemap_urls SET sitemap_url = ? WHERE sitemap_url = ?", (sitemap_url, staging_key))
+                url_count = conn.execute(
+                    "SELECT COUNT(*) FROM sitemap_urls WHERE sitemap_url = ?", (sitemap_url,)).fetchone()[0]
+                # 일부 사이트맵을 읽지 못했다면 다음 확인 때 다시 만들도록 signature를 비워 둠
+                conn.execute(
+                    "INSERT OR REPLACE INTO sitemap_meta (sitemap_url, etag, last_modified, signature, url_count, built_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (sitemap_url, etag, last_modified, None if failures else digest.hexdigest(), url_count, time.time()))
+            swapped = True
+        finally:
+            if not swapped:
+                with conn:
+                    conn.execute("DELETE FROM sitemap_urls WHERE sitemap_url = ?", (staging_key,))
+            conn.close()
+
+        log_event(log_output, "INFO", f"Sitemap index built: {url_count} URLs in {time.time() - started:.1f}s ({sitemap_url})")
+        return True
+
+    @staticmethod
+    def _insert_batch(conn, rows):
+        with conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO sitemap_urls (sitemap_url, url, source_sitemap) VALUES (?, ?, ?)", rows)
+
+    def lookup(self, sitemap_url, full_url, log_output=None):
+        """
+        full_url이 sitemap_url 트리에 포함되어 있으면 해당 URL이 실제로 들어 있는 사이트맵 URL을,
+        아니면 None을 반환합니다.
+        """
+        self.ensure_fresh(sitemap_url, log_output)
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT source_sitemap FROM sitemap_urls WHERE sitemap_url = ? AND url = ?",
+                (sitemap_url, full_url)).fetchone()
+        if row:
+            log_event(log_output, "INFO", f"URL found in sitemap: {row[0]}")
+            return row[0]
+        return None
+
+    def iter_urls(self, sitemap_url, log_output=None, batch_size=1000):
+        """
+        sitemap_url 트리의 모든 URL을 URL 순서대로 하나씩 반환합니다. (사이트 전체 Audit용)
+        batch_size개씩 나눠 읽으므로 5만 개 이상인 사이트맵도 메모리에 한꺼번에 올리지 않습니다.
+        """
+        self.ensure_fresh(sitemap_url, log_output)
+        last = ""
+        while True:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    "SELECT url FROM sitemap_urls WHERE sitemap_url = ? AND url > ? ORDER BY url LIMIT ?",
+                    (sitemap_url, last, batch_size)).fetchall()
+            for (url,) in rows:
+                yield url
+            if len(rows) < batch_size:
+                return
+            last = rows[-1][0]
+
+
+_default_index = None
+_default_index_lock = threading.Lock()
+
+
+def get_sitemap_index():
+    """프로세스 전체에서 공유하는 기본 SitemapIndex를 반환합니다."""
+    global _default_index
+    with _default_index_lock:
+        if _default_index is None:
+            _default_index = SitemapIndex()
+        return _default_index
@@ -1,12 +1,26 @@
-import tkinter as tk # Add this line if log_output is used here
-import requests
-from bs4 import BeautifulSoup
+import xml.etree.ElementTree as ET
 from urllib.parse import urlparse
 import re
 import json
 import os
+import queue
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+from audit_log import log_event
+from audit_stats import stage, current_stages, bound_stages
+from http_client import get_http_client
+from sitemap_discovery import get_robots_sitemap_cache, choose_sitemap_for
+from sitemap_index import get_sitemap_index
 
 SITEMAP_FILE = "sitemap_mapping.json"
+SITEMAP_CHUNK_SIZE = 64 * 1024
+GZIP_MAGIC = b"\x1f\x8b"
+# 사이트맵 인덱스의 하위 사이트맵을 동시에 가져오는 최대 개수
+SITEMAP_FETCH_WORKERS = 8
+# 하위 사이트맵을 읽는 워커가 한 번에 넘기는 URL 항목 수
+SITEMAP_ENTRY_BATCH = 1000
 
 # 기본 매핑 데이터 (파일이 없을 경우 사용)
 default_sitemap_mapping = {
@@ -44,6 +58,8 @@ def load_sitemap_mapping():
 def save_sitemap_mapping(mapping_data):
     with open(SITEMAP_FILE, "w", encoding="utf-8") as f:
         json.dump(mapping_data, f, indent=2, ensure_ascii=False)
+    # GUI에서 매핑을 수정하면 저장하는 시점에 컴파일된 router를 버림
+    invalidate_sitemap_router()
 
 def extract_base_url(url):
     parsed = urlparse(url)
@@ -70,18 +86,76 @@ def remove_language_code(url):
         new_path = parsed.path
     return f"{parsed.scheme}://{parsed.netloc}{new_path}"
 
+# 매핑 키가 끝나는 trie 노드에 사이트맵 URL을 저장할 때 쓰는 키
+_TERMINAL = None
+
+class SitemapRouter:
+    """
+    사이트맵 매핑을 언어 코드를 제거한 키 기준의 문자 단위 trie로 한 번만 컴파일해 두고,
+    base URL과 가장 길게 일치하는 키의 사이트맵 URL을 찾습니다.
+    정규화 결과가 같은 키가 여러 개면 매핑에서 먼저 나온 키를 사용합니다.
+    """
+
+    def __init__(self, mapping):
+        self._root = {}
+        for key, sitemap in mapping.items():
+            node = self._root
+            for ch in remove_language_code(key):
+                node = node.setdefault(ch, {})
+            node.setdefault(_TERMINAL, sitemap)
+
+    def match(self, base_url):
+        node = self._root
+        best = None
+        for ch in remove_language_code(base_url):
+            if _TERMINAL in node:
+                best = node[_TERMINAL]
+            node = node.get(ch)
+            if node is None:
+                return best
+        return node.get(_TERMINAL, best)
+
+# (매핑 객체, 컴파일할 때의 버전, SitemapRouter)
+_compiled_router = None
+_router_version = 0
+_compiled_router_lock = threading.Lock()
+
+def invalidate_sitemap_router():
+    """매핑 dict를 제자리에서 수정한 뒤 호출하면 다음 조회 때 router를 다시 컴파일합니다."""
+    global _router_version
+    with _compiled_router_lock:
+        _router_version += 1
+
+def get_sitemap_router(current_sitemap_mapping):
+    """
+    같은 매핑 객체(id)이고 invalidate_sitemap_router()가 호출되지 않았으면 이전에 컴파일한 SitemapRouter를
+    재사용합니다. 매 호출마다 dict 내용을 비교하지 않으므로, 매핑을 제자리에서 수정했다면
+    invalidate_sitemap_router()를 호출해야 합니다. (save_sitemap_mapping은 자동으로 호출)
+    """
+    global _compiled_router
+    with _compiled_router_lock:
+        if _compiled_router is not None:
+            mapping, version, router = _compiled_router
+            if mapping is current_sitemap_mapping and version == _router_version:
+                return router
+        router = SitemapRouter(current_sitemap_mapping)
+        # 매핑 객체를 참조해 두므로 해제된 dict의 id가 다른 매핑에 재사용되어 잘못 일치하는 일은 없음
+        _compiled_router = (current_sitemap_mapping, _router_version, router)
+        return router
+
 def find_sitemap_url(base_url, current_sitemap_mapping, log_output):
-    normalized_base = remove_language_code(base_url)
-    for key in current_sitemap_mapping:
-        normalized_key = remove_language_code(key)
-        if normalized_base.startswith(normalized_key):
-            if log_output:
-                log_output.insert(tk.END, f"[INFO] Sitemap mapping found for {base_url}: {current_sitemap_mapping[key]}\n")
-                log_output.see(tk.END)
-            return current_sitemap_mapping[key]
-    if log_output:
-        log_output.insert(tk.END, f"[WARN] No sitemap mapping found for base URL: {base_url}\n")
-        log_output.see(tk.END)
+    sitemap_url = get_sitemap_router(current_sitemap_mapping).match(base_url)
+    if sitemap_url:
+        log_event(log_output, "INFO", f"Sitemap mapping found for {base_url}: {sitemap_url}")
+        return sitemap_url
+
+    # 매핑에 없는 도메인은 robots.txt의 Sitemap: 지시문으로 자동 탐색
+    sitemap_url = choose_sitemap_for(base_url, get_robots_sitemap_cache().sitemaps_for(base_url))
+    if sitemap_url:
+        log_event(log_output, "INFO", f"Sitemap discovered via robots.txt for {base_url}: {sitemap_url}")
+        return sitemap_url
+
+    log_event(log_output, "WARN", f"No sitemap mapping found for base URL: {base_url}")
     return None
 
 def normalize_url(url):
@@ -89,84 +163,234 @@ def normalize_url(url):
     normalized = parsed.geturl()
     return normalized
 
-def is_url_in_sitemaps(sitemap_url, full_url, visited_sitemaps=None, log_output=None):
+def _decompressed_chunks(chunks):
+    """
+    .xml.gz 사이트맵처럼 본문 자체가 gzip인 경우 조각 단위로 압축을 풉니다.
+    (Content-Encoding: gzip 전송 압축은 requests가 이미 풀어서 전달)
+    """
+    decompressor = None
+    for chunk in chunks:
+        if not chunk:
+            continue
+        if decompressor is None:
+            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS) if chunk[:2] == GZIP_MAGIC else False
+        if not decompressor:
+            yield chunk
+            continue
+        # 압축률이 높은 파일도 한 번에 풀리는 양을 제한해 메모리를 일정하게 유지
+        data = decompressor.decompress(chunk, SITEMAP_CHUNK_SIZE)
+        while data:
+            yield data
+            data = decompressor.decompress(decompressor.unconsumed_tail, SITEMAP_CHUNK_SIZE)
+    if decompressor:
+        tail = decompressor.flush()
+        if tail:
+            yield tail
+
+def iter_sitemap_locs(chunks):
+    """
+    사이트맵 XML 조각(bytes)을 순서대로 받아 ('sitemap' | 'url', loc) 쌍을 하나씩 반환합니다.
+    DOM 전체를 만들지 않고 처리한 항목은 즉시 버리므로 사이트맵 크기와 관계없이 메모리 사용량이 일정합니다.
+    <url> / <sitemap> 바로 아래의 <loc>만 사용합니다. (image:loc 등은 무시)
+    """
+    parser = ET.XMLPullParser(events=("start", "end"))
+    stack = []
+    root = None
+    current_loc = None
+
+    def drain():
+        nonlocal root, current_loc
+        for event, elem in parser.read_events():
+            tag = elem.tag.rsplit("}", 1)[-1]
+            if event == "start":
+                if root is None:
+                    root = elem
+                stack.append(tag)
+                continue
+            stack.pop()
+            if tag == "loc" and stack and stack[-1] in ("url", "sitemap"):
+                current_loc = (elem.text or "").strip()
+            elif tag in ("url", "sitemap") and len(stack) == 1:
+                if current_loc:
+                    yield tag, current_loc
+                current_loc = None
+                root.clear()
+
+    for chunk in _decompressed_chunks(chunks):
+        parser.feed(chunk)
+        yield from drain()
+    parser.close()
+    yield from drain()
+
+def _open_sitemap(sitemap_url, log_output):
+    """사이트맵을 스트리밍 모드로 요청합니다. 실패하면 로그를 남기고 None을 반환합니다."""
+    log_event(log_output, "INFO", f"Accessing sitemap: {sitemap_url}")
+    response = get_http_client().open_stream(sitemap_url)
+    if response.status_code != 200:
+        response.close()
+        log_event(log_output, "ERROR", f"Failed to fetch sitemap ({response.status_code}): {sitemap_url}")
+        return None
+    return response
+
+def _put_unless_cancelled(results, item, cancel_event):
+    """큐가 가득 차면 소비하는 쪽이 따라올 때까지 기다리고, 취소되면 False를 반환합니다."""
+    while not cancel_event.is_set():
+        try:
+            results.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+def _fetch_sitemap_entries(sitemap_url, results, cancel_event, log_output, stages=()):
+    """
+    하위 사이트맵 하나를 읽어 URL 항목을 SITEMAP_ENTRY_BATCH개씩 results 큐에 ("entries", 목록)으로 넣고,
+    끝나면 ("done", sitemap_url, 하위 사이트맵 목록)을 넣습니다. 가져오지 못했으면 목록 대신 None.
+    """
+    with bound_stages(stages):
+        nested_sitemap_urls = None
+        try:
+            nested_sitemap_urls = _read_sitemap_entries(sitemap_url, results, cancel_event, log_output)
+        finally:
+            _put_unless_cancelled(results, ("done", sitemap_url, nested_sitemap_urls), cancel_event)
+
+def _read_sitemap_entries(sitemap_url, results, cancel_event, log_output):
+    nested_sitemap_urls = []
+    batch = []
+    try:
+        response = _open_sitemap(sitemap_url, log_output)
+        if response is None:
+            return None
+        with response:
+            for kind, loc in iter_sitemap_locs(response.iter_content(SITEMAP_CHUNK_SIZE)):
+                if kind == "sitemap":
+                    nested_sitemap_urls.append(loc)
+                elif not nested_sitemap_urls:
+                    batch.append((loc, sitemap_url))
+                    if len(batch) >= SITEMAP_ENTRY_BATCH:
+                        if not _put_unless_cancelled(results, ("entries", batch), cancel_event):
+                            return None
+                        batch = []
+        if batch and not _put_unless_cancelled(results, ("entries", batch), cancel_event):
+            return None
+    except Exception as e:
+        log_event(log_output, "ERROR", f"Error fetching sitemap {sitemap_url}: {e}")
+        return None
+    return nested_sitemap_urls
+
+def iter_sitemap_entries(sitemap_url, log_output=None, visited_sitemaps=None, chunks=None, failures=None,
+                         max_workers=SITEMAP_FETCH_WORKERS, on_root_read=None):
+    """
+    사이트맵(중첩 인덱스 포함)에 등록된 모든 URL을 (loc, 해당 URL이 속한 사이트맵 URL) 형태로 순회합니다.
+    chunks(최상위 사이트맵 본문 조각의 iterable)를 넘기면 최상위 사이트맵은 다시 요청하지 않습니다.
+    on_root_read()는 최상위 사이트맵을 끝까지 읽은 뒤 하위 사이트맵을 가져오기 전에 호출되며,
+    False를 반환하면 하위 사이트맵은 가져오지 않고 순회를 끝냅니다.
+    하위 사이트맵은 최대 max_workers개까지 동시에 가져오고, 항목은 크기가 제한된 큐를 거쳐
+    이 generator를 소비하는 스레드에서만 반환되므로 호출한 쪽은 단일 스레드로 기록할 수 있습니다.
+    (여러 하위 사이트맵의 항목 순서는 섞일 수 있음)
+    가져오지 못한 사이트맵은 failures 리스트에 추가됩니다.
+    """
     if visited_sitemaps is None:
         visited_sitemaps = set()
     if sitemap_url in visited_sitemaps:
-        return None
+        return
     visited_sitemaps.add(sitemap_url)
 
+    nested_sitemap_urls = []
     try:
-        if log_output:
-            log_output.insert(tk.END, f"[INFO] Accessing sitemap: {sitemap_url}\n")
-            log_output.see(tk.END)
-        response = requests.get(sitemap_url, timeout=10)
-        if response.status_code != 200:
-            if log_output:
-                log_output.insert(tk.END, f"[ERROR] Failed to fetch sitemap ({response.status_code}): {sitemap_url}\n")
-                log_output.see(tk.END)
-            return None
+        if chunks is not None:
+            response = None
+        else:
+            response = _open_sitemap(sitemap_url, log_output)
+            if response is None:
+                if failures is not None:
+                    failures.append(sitemap_url)
+                return
+            chunks = response.iter_content(SITEMAP_CHUNK_SIZE)
+        try:
+            for kind, loc in iter_sitemap_locs(chunks):
+                if kind == "sitemap":
+                    nested_sitemap_urls.append(loc)
+                elif not nested_sitemap_urls:
+                    yield loc, sitemap_url
+        finally:
+            if response is not None:
+                response.close()
+    except Exception as e:
+        log_event(log_output, "ERROR", f"Error fetching sitemap {sitemap_url}: {e}")
+        if failures is not None:
+            failures.append(sitemap_url)
+        return
+    if on_root_read is not None and on_root_read() is False:
+        return
+    if not nested_sitemap_urls:
+        return
 
-        soup = BeautifulSoup(response.content, 'xml')
-
-        sitemap_tags = soup.find_all('sitemap')
-        if sitemap_tags:
-            for sitemap in sitemap_tags:
-                loc = sitemap.find('loc')
-                if loc:
-                    nested_sitemap_url = loc.get_text(strip=True)
-                    found_in_sitemap = is_url_in_sitemaps(nested_sitemap_url, full_url, visited_sitemaps, log_output)
-                    if found_in_sitemap:
-                        return found_in_sitemap
-            return None
+    # 워커가 앞서 나가도 메모리에 쌓이는 항목 수는 큐 크기만큼으로 제한
+    results = queue.Queue(maxsize=2 * max(1, max_workers))
+    cancel_event = threading.Event()
+    pool = ThreadPoolExecutor(max_workers=max(1, max_workers))
+    # 병렬 요청의 전송량도 호출한 쪽의 계측 단계에 집계되도록 현재 단계를 워커에 전달
+    stages = current_stages()
+    pending = 0
 
-        url_tags = soup.find_all('url')
-        loc_tags = [url.find('loc') for url in url_tags if url.find('loc')]
-        for loc in loc_tags:
-            sitemap_url_in_loc = loc.get_text(strip=True).strip()
-            if full_url == sitemap_url_in_loc:
-                if log_output:
-                    log_output.insert(tk.END, f"[INFO] URL found in sitemap: {sitemap_url}\n")
-                    log_output.see(tk.END)
-                return sitemap_url
-        return None
-    except Exception as e:
-        if log_output:
-            log_output.insert(tk.END, f"[ERROR] Error fetching sitemap {sitemap_url}: {e}\n")
-            log_output.see(tk.END)
-        return None
+    def submit(sitemap_urls):
+        nonlocal pending
+        for nested_sitemap_url in sitemap_urls:
+            if nested_sitemap_url in visited_sitemaps:
+                continue
+            visited_sitemaps.add(nested_sitemap_url)
+            pool.submit(_fetch_sitemap_entries, nested_sitemap_url, results, cancel_event, log_output, stages)
+            pending += 1
+
+    try:
+        submit(nested_sitemap_urls)
+        while pending:
+            item = results.get()
+            if item[0] == "entries":
+                yield from item[1]
+                continue
+            _, done_sitemap_url, child_sitemap_urls = item
+            pending -= 1
+            if child_sitemap_urls is None:
+                if failures is not None:
+                    failures.append(done_sitemap_url)
+            else:
+                submit(child_sitemap_urls)
+    finally:
+        # 다 읽었거나 호출한 쪽이 중단한 경우: 대기 중인 요청은 취소하고 진행 중인 워커는 멈춤
+        cancel_event.set()
+        pool.shutdown(wait=False, cancel_futures=True)
 
 def check_sitemap_inclusion(full_url, current_sitemap_mapping, log_output):
-    base_url = extract_base_url(full_url)
-    # find_sitemap_url 호출 시 log_output 전달
-    sitemap_url = find_sitemap_url(base_url, current_sitemap_mapping, log_output)
-    if not sitemap_url:
-        log_output.insert(tk.END, f"[WARN] Sitemap URL not found for {full_url}.\n", "WARN")
-        log_output.see(tk.END)
-        return {
-            "현황": "Sitemap URL 없음",
-            "Comment": "Sitemap 데이터 없음",
-            "SEO 수정안": "Sitemap 추가 필요"
-        }
-
-    # is_url_in_sitemaps 호출 시 log_output 전달
-    found_in_sitemap = is_url_in_sitemaps(sitemap_url, full_url, log_output=log_output)
-    if found_in_sitemap:
-        log_output.insert(tk.END, f"[INFO] URL included in Sitemap: {full_url}\n", "INFO")
-        log_output.see(tk.END)
-        return {
-            "현황": "Sitemap 포함",
-            "Comment": "이슈 없음",
-            "SEO 수정안": "N/A"
-        }
-    else:
-        log_output.insert(tk.END, f"[WARN] URL NOT included in Sitemap: {full_url}\n", "WARN")
-        log_output.see(tk.END)
-        return {
-            "현황": "Sitemap 미포함",
-            "Comment": "URL 추가 필요",
-            "SEO 수정안": f"{full_url} 추가 필요"
-        }
+    with stage("check_sitemap_inclusion", full_url):
+        base_url = extract_base_url(full_url)
+        # find_sitemap_url 호출 시 log_output 전달
+        sitemap_url = find_sitemap_url(base_url, current_sitemap_mapping, log_output)
+        if not sitemap_url:
+            log_event(log_output, "WARN", f"Sitemap URL not found for {full_url}.")
+            return {
+                "현황": "Sitemap URL 없음",
+                "Comment": "Sitemap 데이터 없음",
+                "SEO 수정안": "Sitemap 추가 필요"
+            }
+
+        # 사이트맵 전체를 매번 크롤링하지 않고, 디스크에 저장된 URL 인덱스에서 조회
+        found_in_sitemap = get_sitemap_index().lookup(sitemap_url, full_url, log_output)
+        if found_in_sitemap:
+            log_event(log_output, "INFO", f"URL included in Sitemap: {full_url}")
+            return {
+                "현황": "Sitemap 포함",
+                "Comment": "이슈 없음",
+                "SEO 수정안": "N/A"
+            }
+        else:
+            log_event(log_output, "WARN", f"URL NOT included in Sitemap: {full_url}")
+            return {
+                "현황": "Sitemap 미포함",
+                "Comment": "URL 추가 필요",
+                "SEO 수정안": f"{full_url} 추가 필요"
+            }
 
 # 초기 sitemap_mapping.json 파일 생성 (프로그램 최초 실행 시 필요)
 # 이 스크립트가 단독으로 실행될 때만 실행되도록 보호
@@ -1,8 +1,12 @@
 const length_check_rows = ['Title', 'Description', 'OG Title', 'OG Description'];
 
+// 데이터 기반(경량) 리포트일 때 디코딩된 Audit 데이터. 일반 리포트에서는 null
+let REPORT_DATA = null;
+
 function showTab(tabIndex) {
     document.querySelectorAll('.tab-button').forEach((tab, index) => tab.classList.toggle('active', index === tabIndex));
     document.querySelectorAll('.tab-content').forEach((content, index) => content.classList.toggle('active', index === tabIndex));
+    if (REPORT_DATA) renderDataTab(tabIndex);
 }
 
 function updateLength(field) {
@@ -94,6 +98,7 @@ function escapeHtml(text) {
 }
 
 function exportStaticReport() {
+    if (REPORT_DATA) return exportStaticDataReport();
     const staticScript = `function showTab(t){document.querySelectorAll('.tab-button').forEach((e,n)=>e.classList.toggle('active',n===t));document.querySelectorAll('.tab-content').forEach((e,n)=>e.classList.toggle('active',n===t))}document.addEventListener('DOMContentLoaded',()=>showTab(0));`;
     let staticHtml = `<!DOCTYPE html><html lang='ko'><head><meta charset='UTF-8'><title>${escapeHtml(document.title)} (Final)</title>`;
     staticHtml += `<style>${document.querySelector('style').innerHTML}</style>`;
@@ -125,6 +130,7 @@ function exportStaticReport() {
 }
 
 function exportToExcel() {
+    if (REPORT_DATA) return exportDataToExcel();
     try {
         if (typeof XLSX === 'undefined') {
             throw new Error("SheetJS 라이브러리를 찾을 수 없습니다. templates 폴더에 sheetjs.min.js 파일이 있는지 확인해주세요.");
@@ -185,7 +191,385 @@ function exportToExcel() {
     }
 }
 
+// ---------------------------------------------------------------------------
+// 데이터 기반(경량) 리포트
+// 표를 HTML로 미리 만들지 않고 #report-data의 JSON으로 탭을 열 때 렌더링합니다.
+// 이미지 표는 보이는 행만 DOM에 두고(가상 스크롤), 수정 내용은 REPORT_DATA에 저장해 내보내기에 사용합니다.
+// ---------------------------------------------------------------------------
+const VIRTUAL_OVERSCAN = 8;
+const SEO_TABLE_HEAD = "<table class='seo-table'><thead><tr><th>항목</th><th style='width:30%'>현황</th><th class='len-col'>길이</th><th style='width:22%'>Comment</th><th style='width:auto'>SEO 수정안</th><th class='len-col'>길이</th></tr></thead>";
+const ALT_TABLE_HEAD = "<table class='alt-table'><thead><tr><th style='width:25%'>Image URL</th><th>Preview</th><th style='width:20%'>Alt Text (AS-IS)</th><th class='sortable' style='width:15%'>SEO Comment <i class='sort-icon'>&#8597;</i></th><th>Alt Text (To-Be)</th></tr></thead>";
+
+async function decodeEmbeddedText(element) {
+    const raw = element.textContent.trim();
+    if (element.dataset.encoding !== 'gzip+base64') return raw;
+    const binary = atob(raw);
+    const bytes = new Uint8Array(binary.length);
+    for (let i = 0; i < binary.length; i++) bytes[i] = binary.charCodeAt(i);
+    const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('gzip'));
+    return await new Response(stream).text();
+}
+
+function isOkComment(text) {
+    const normalized = String(text).trim().toLowerCase();
+    return normalized === '이슈 없음' || normalized === 'n/a' || normalized === '';
+}
+
+// alt 행: [Image URL, Alt(AS-IS)] -> [Image URL, Alt(AS-IS), SEO Comment, Alt(To-Be)]
+function expandAltRows(tab) {
+    tab.alt.forEach(row => {
+        const hasAlt = row[1].trim() !== '';
+        row.push(hasAlt ? '이슈 없음' : '수정 필요', hasAlt ? 'N/A' : '');
+    });
+}
+
+async function initDataReport(dataElement) {
+    REPORT_DATA = JSON.parse(await decodeEmbeddedText(dataElement));
+    dataElement.textContent = '';
+    REPORT_DATA.tabs.forEach(expandAltRows);
+
+    const tabContainer = document.querySelector('.tab-container');
+    const contents = document.querySelector('.tab-contents');
+    tabContainer.innerHTML = REPORT_DATA.tabs.map((tab, i) =>
+        `<button class='tab-button' title='${escapeHtml(tab.url)}' onclick='showTab(${i})'>${escapeHtml(tab.name)}</button>`).join('');
+    contents.innerHTML = REPORT_DATA.tabs.map((tab, i) =>
+        `<div id='urlContent_${i}' class='tab-content'></div>`).join('');
+    if (REPORT_DATA.tabs.length) showTab(0);
+}
+
+// 진행 중(live) 리포트: Audit이 끝나기 전에 완료된 URL의 탭 조각(tabs/NNNNNN.js)을 불러와 입력 순서 위치에 추가
+const LIVE_POLL_MS = 2000;
+let LIVE_REPORT = null;
+
+function initLiveReport(liveElement) {
+    LIVE_REPORT = { element: liveElement, loaded: 0, progress: null };
+    REPORT_DATA = { ticket: liveElement.dataset.ticket, lengthRows: JSON.parse(liveElement.dataset.lengthRows), tabs: [] };
+    // 조각 스크립트가 호출하는 진입점
+    window.reportLive = {
+        progress: progress => { LIVE_REPORT.progress = progress; },
+        addTab: addLiveTab,
+    };
+    pollLiveReport();
+}
+
+function loadLiveScript(src) {
+    // file://에서도 동작하도록 fetch 대신 <script>로 불러옴
+    return new Promise((resolve, reject) => {
+        const script = document.createElement('script');
+        script.src = src;
+        script.onload = () => { script.remove(); resolve(); };
+        script.onerror = () => { script.remove(); reject(new Error(`${src}을(를) 불러오지 못했습니다.`)); };
+        document.head.appendChild(script);
+    });
+}
+
+async function pollLiveReport() {
+    try {
+        await loadLiveScript(`progress.js?t=${Date.now()}`);
+        const progress = LIVE_REPORT.progress;
+        while (progress && LIVE_REPORT.loaded < progress.fragments) {
+            await loadLiveScript(`tabs/${String(LIVE_REPORT.loaded + 1).padStart(6, '0')}.js`);
+            LIVE_REPORT.loaded += 1;
+        }
+    } catch (e) {
+        // 아직 기록 중인 파일은 다음 주기에 다시 시도
+        console.warn(e);
+    }
+    const progress = LIVE_REPORT.progress;
+    renderLiveProgress(progress);
+    if (!progress || !progress.finished || LIVE_REPORT.loaded < progress.fragments) {
+        setTimeout(pollLiveReport, LIVE_POLL_MS);
+    }
+}
+
+function renderLiveProgress(progress) {
+    if (!progress) return;
+    const percent = progress.total ? Math.round(progress.completed * 100 / progress.total) : 100;
+    let text = `${progress.finished ? '✅ 완료' : '⏳ 진행 중'} · ${progress.completed}/${progress.total} URL (${percent}%)`;
+    if (progress.failed) text += ` · 실패 ${progress.failed}`;
+    LIVE_REPORT.element.querySelector('.live-progress-bar span').style.width = `${percent}%`;
+    const label = LIVE_REPORT.element.querySelector('.live-progress-text');
+    label.textContent = text;
+    if (progress.report) {
+        label.insertAdjacentHTML('beforeend', ` · <a href="${escapeHtml(progress.report)}">최종 리포트 열기</a>`);
+    }
+}
+
+function addLiveTab(position, tab) {
+    expandAltRows(tab);
+    tab.position = position;
+    const tabs = REPORT_DATA.tabs;
+    const tabContainer = document.querySelector('.tab-container');
+    const contents = document.querySelector('.tab-contents');
+    const existing = tabs.findIndex(t => t.position === position);
+    if (existing >= 0) {
+        // 같은 URL을 다시 실행한 결과면 내용만 바꾸고 다시 그림
+        tabs[existing] = tab;
+        const content = contents.children[existing];
+        delete content.dataset.rendered;
+        content.innerHTML = '';
+        if (content.classList.contains('active')) renderDataTab(existing);
+        return;
+    }
+
+    let index = tabs.findIndex(t => t.position > position);
+    if (index < 0) index = tabs.length;
+    tabs.splice(index, 0, tab);
+    tabContainer.insertBefore(
+        document.createRange().createContextualFragment(
+            `<button class='tab-button' title='${escapeHtml(tab.url)}'>${escapeHtml(tab.name)}</button>`),
+        tabContainer.children[index] || null);
+    const content = document.createElement('div');
+    content.className = 'tab-content';
+    contents.insertBefore(content, contents.children[index] || null);
+    // 뒤로 밀린 탭의 번호를 다시 매김 (showTab, renderDataTab은 위치 번호를 사용)
+    for (let i = index; i < tabs.length; i++) {
+        tabContainer.children[i].setAttribute('onclick', `showTab(${i})`);
+        contents.children[i].id = `urlContent_${i}`;
+    }
+    if (!contents.querySelector('.tab-content.active')) showTab(0);
+}
+
+function seoRowHtml(row, rowIndex, lengthRows) {
+    const [factor, status, statusLength, comment, seoFix] = row;
+    const isLengthRow = lengthRows.includes(factor);
+    const commentStatus = isOkComment(comment) ? 'ok' : 'issue';
+    let html = `<tr data-row='${rowIndex}'><td class='factor-name'>${factor}</td>`;
+    if (isLengthRow) {
+        html += `<td><div class='editable-field'>${status}</div></td><td class='len-col'>${statusLength}</td>`;
+    } else if (factor === '통이미지 사용') {
+        html += `<td colspan='2'><div class='editable-field' contenteditable='true' data-col='1'>${status}</div></td>`;
+    } else {
+        html += `<td colspan='2'>${status}</td>`;
+    }
+    html += `<td class='comment-cell' data-status='${commentStatus}'><div class='editable-field' contenteditable='true' data-col='3'>${comment}</div></td>`;
+    if (isLengthRow) {
+        html += `<td class='fix-cell'><div class='editable-field' contenteditable='true' data-col='4'>${seoFix}</div></td><td class='len-col len-counter-fix'>0자</td>`;
+    } else {
+        html += `<td class='fix-cell' colspan='2'><div class='editable-field' contenteditable='true' data-col='4'>${seoFix}</div></td>`;
+    }
+    return html + '</tr>';
+}
+
+function altRowHtml(row, rowIndex) {
+    const [imageUrl, altAsIs, comment, altToBe] = row;
+    const status = comment === '수정 필요' ? 'issue' : 'ok';
+    const highlight = status === 'issue' ? ' highlight-cell' : '';
+    return `<tr class='virtual-row' data-row='${rowIndex}'>` +
+        `<td><div class='cell-clip' title='${escapeHtml(imageUrl)}'>${imageUrl}</div></td>` +
+        `<td><img src="${escapeHtml(imageUrl)}" alt="Image Preview" loading="lazy" decoding="async"></td>` +
+        `<td><div class='cell-clip'>${altAsIs}</div></td>` +
+        `<td class='comment-cell${highlight}' data-status='${status}'><div class='alt-comment-toggle'>${comment}</div></td>` +
+        `<td><div class='editable-field cell-clip' contenteditable='true'>${altToBe}</div></td></tr>`;
+}
+
+function renderDataTab(tabIndex) {
+    const content = document.getElementById(`urlContent_${tabIndex}`);
+    if (!content || content.dataset.rendered) return;
+    content.dataset.rendered = 'true';
+    const tab = REPORT_DATA.tabs[tabIndex];
+
+    content.innerHTML = '<h3>SEO QA</h3>' + SEO_TABLE_HEAD + '<tbody>' +
+        tab.seo.map((row, i) => seoRowHtml(row, i, REPORT_DATA.lengthRows)).join('') + '</tbody></table>';
+    bindDataSeoTable(content.querySelector('.seo-table'), tab);
+
+    if (tab.alt.length) {
+        content.insertAdjacentHTML('beforeend', '<h3>Image Alt QA</h3>');
+        renderVirtualAltTable(content, tab);
+    }
+}
+
+function bindDataSeoTable(table, tab) {
+    table.querySelectorAll('.editable-field[contenteditable]').forEach(field => {
+        const tr = field.closest('tr');
+        const cell = field.closest('td');
+        const row = tab.seo[Number(tr.dataset.row)];
+        const col = Number(field.dataset.col);
+        const isLengthFix = col === 4 && REPORT_DATA.lengthRows.includes(row[0]);
+        field.addEventListener('input', () => {
+            row[col] = field.innerHTML;
+            if (col === 3) handleHighlight(cell, !isOkComment(field.textContent));
+            if (isLengthFix) updateLength(field);
+        });
+        if (col === 3) handleHighlight(cell, cell.dataset.status === 'issue');
+        if (isLengthFix) updateLength(field);
+    });
+}
+
+function renderVirtualAltTable(content, tab) {
+    const scroller = document.createElement('div');
+    scroller.className = 'virtual-scroll';
+    scroller.innerHTML = ALT_TABLE_HEAD + '<tbody></tbody></table>';
+    content.appendChild(scroller);
+    const tbody = scroller.querySelector('tbody');
+    let rowHeight = 0;
+    let renderedRange = '';
+
+    const render = (force) => {
+        if (!rowHeight) {
+            // 첫 행을 그려 실제 행 높이를 측정 (CSS로 고정된 높이)
+            tbody.innerHTML = altRowHtml(tab.alt[0], 0);
+            rowHeight = tbody.firstElementChild.getBoundingClientRect().height || 64;
+        }
+        const viewport = scroller.clientHeight || 600;
+        const start = Math.max(0, Math.floor(scroller.scrollTop / rowHeight) - VIRTUAL_OVERSCAN);
+        const end = Math.min(tab.alt.length, Math.ceil((scroller.scrollTop + viewport) / rowHeight) + VIRTUAL_OVERSCAN);
+        const range = `${start}:${end}`;
+        if (!force && range === renderedRange) return;
+        renderedRange = range;
+        let html = start ? `<tr class='virtual-spacer' style='height:${start * rowHeight}px'></tr>` : '';
+        for (let i = start; i < end; i++) html += altRowHtml(tab.alt[i], i);
+        if (end < tab.alt.length) html += `<tr class='virtual-spacer' style='height:${(tab.alt.length - end) * rowHeight}px'></tr>`;
+        tbody.innerHTML = html;
+    };
+
+    let scheduled = false;
+    scroller.addEventListener('scroll', () => {
+        if (scheduled) return;
+        scheduled = true;
+        requestAnimationFrame(() => { scheduled = false; render(false); });
+    });
+
+    // 행 이벤트는 tbody에 위임 (다시 그려도 핸들러를 새로 달 필요 없음)
+    tbody.addEventListener('click', event => {
+        const toggle = event.target.closest('.alt-comment-toggle');
+        if (!toggle) return;
+        const row = tab.alt[Number(toggle.closest('tr').dataset.row)];
+        row[2] = row[2] === '이슈 없음' ? '수정 필요' : '이슈 없음';
+        toggle.textContent = row[2];
+        handleHighlight(toggle.closest('td'), row[2] === '수정 필요');
+    });
+    tbody.addEventListener('input', event => {
+        const field = event.target.closest('.editable-field');
+        if (field) tab.alt[Number(field.closest('tr').dataset.row)][3] = field.innerHTML;
+    });
+
+    const header = scroller.querySelector('th.sortable');
+    header.addEventListener('click', () => {
+        const newOrder = header.dataset.sortOrder === 'asc' ? 'desc' : 'asc';
+        header.dataset.sortOrder = newOrder;
+        tab.alt.sort((a, b) => {
+            const comparison = a[2].localeCompare(b[2], 'ko');
+            return newOrder === 'asc' ? comparison : -comparison;
+        });
+        header.querySelector('.sort-icon').innerHTML = newOrder === 'asc' ? '&#9650;' : '&#9660;';
+        render(true);
+    });
+
+    render(true);
+}
+
+function textOf(html) {
+    const div = document.createElement('div');
+    div.innerHTML = html;
+    return div.textContent.trim();
+}
+
+function exportStaticDataReport() {
+    const staticScript = `function showTab(t){document.querySelectorAll('.tab-button').forEach((e,n)=>e.classList.toggle('active',n===t));document.querySelectorAll('.tab-content').forEach((e,n)=>e.classList.toggle('active',n===t))}document.addEventListener('DOMContentLoaded',()=>showTab(0));`;
+    const parts = [`<!DOCTYPE html><html lang='ko'><head><meta charset='UTF-8'><title>${escapeHtml(document.title)} (Final)</title>`];
+    parts.push(`<style>${document.querySelector('style').innerHTML}</style>`);
+    parts.push(`<scr` + `ipt>${staticScript}</scr` + `ipt></head><body>`);
+    parts.push(`<div class='main-container'><h2>${escapeHtml(document.querySelector('h2').innerText)} (Final)</h2>`);
+    parts.push(document.querySelector('.tabs-wrapper').outerHTML);
+
+    const lengthRows = REPORT_DATA.lengthRows;
+    REPORT_DATA.tabs.forEach((tab, i) => {
+        parts.push(`<div id='urlContent_${i}' class='tab-content'><h3>SEO QA</h3>${SEO_TABLE_HEAD}<tbody>`);
+        tab.seo.forEach(([factor, status, statusLength, comment, seoFix]) => {
+            const isLengthRow = lengthRows.includes(factor);
+            const highlight = isOkComment(textOf(comment)) ? '' : ' highlight-cell';
+            parts.push(`<tr><td class='factor-name'>${factor}</td>`);
+            parts.push(isLengthRow ? `<td>${textOf(status)}</td><td class='len-col'>${statusLength}</td>` : `<td colspan='2'>${status}</td>`);
+            parts.push(`<td class='comment-cell${highlight}'>${escapeHtml(textOf(comment))}</td>`);
+            parts.push(isLengthRow
+                ? `<td class='fix-cell'>${escapeHtml(textOf(seoFix))}</td><td class='len-col'>${textOf(seoFix).length}자</td></tr>`
+                : `<td class='fix-cell' colspan='2'>${escapeHtml(textOf(seoFix))}</td></tr>`);
+        });
+        parts.push('</tbody></table>');
+        if (tab.alt.length) {
+            parts.push(`<h3>Image Alt QA</h3>${ALT_TABLE_HEAD}<tbody>`);
+            tab.alt.forEach(([imageUrl, altAsIs, comment, altToBe]) => {
+                const highlight = comment === '수정 필요' ? ' highlight-cell' : '';
+                parts.push(`<tr><td>${imageUrl}</td><td><img src="${escapeHtml(imageUrl)}" alt="Image Preview" loading="lazy"></td><td>${altAsIs}</td>` +
+                    `<td class='comment-cell${highlight}'>${comment}</td><td>${escapeHtml(textOf(altToBe))}</td></tr>`);
+            });
+            parts.push('</tbody></table>');
+        }
+        parts.push('</div>');
+    });
+
+    parts.push(`</div></body></html>`);
+    const blob = new Blob(parts, { type: 'text/html;charset=utf-8' });
+    const link = document.createElement('a');
+    link.href = URL.createObjectURL(blob);
+    link.download = (document.querySelector('h2').innerText.replace(/ /g, '_') + '_Final.html');
+    link.click();
+    URL.revokeObjectURL(link.href);
+}
+
+async function loadSheetJs() {
+    if (typeof XLSX !== 'undefined') return;
+    const source = document.getElementById('sheetjs-source');
+    if (!source) throw new Error("SheetJS 라이브러리를 찾을 수 없습니다.");
+    const script = document.createElement('script');
+    script.textContent = await decodeEmbeddedText(source);
+    document.head.appendChild(script);
+}
+
+async function exportDataToExcel() {
+    try {
+        await loadSheetJs();
+        const wb = XLSX.utils.book_new();
+        const ticketName = REPORT_DATA.ticket || 'Report';
+
+        REPORT_DATA.tabs.forEach(tab => {
+            let sheetName = tab.name;
+            if (sheetName.length > 31) {
+                sheetName = sheetName.substring(sheetName.length - 31);
+            }
+            sheetName = sheetName.replace(/[\\/*?:\\[\\]]/g, '_');
+
+            const sheetData = [["SEO QA"], ['항목', '현황', '길이', 'Comment', 'SEO 수정안', '길이']];
+            tab.seo.forEach(([factor, status, statusLength, comment, seoFix]) => {
+                const isLengthRow = REPORT_DATA.lengthRows.includes(factor);
+                const fixText = textOf(seoFix);
+                sheetData.push(isLengthRow
+                    ? [factor, textOf(status), statusLength, textOf(comment), fixText, `${fixText.length}자`]
+                    : [factor, textOf(status), textOf(comment), fixText]);
+            });
+            sheetData.push([]);
+            if (tab.alt.length) {
+                sheetData.push(["Image Alt QA"], ['Image URL', 'Alt Text (AS-IS)', 'SEO Comment', 'Alt Text (To-Be)']);
+                tab.alt.forEach(([imageUrl, altAsIs, comment, altToBe]) => sheetData.push([imageUrl, altAsIs, comment, textOf(altToBe)]));
+            }
+            XLSX.utils.book_append_sheet(wb, XLSX.utils.aoa_to_sheet(sheetData), sheetName);
+        });
+
+        const today = new Date().toISOString().slice(0, 10).replace(/-/g, '');
+        XLSX.writeFile(wb, `${ticketName}_${today}.xlsx`);
+    } catch (e) {
+        console.error(e);
+        alert("Excel 내보내기 중 오류가 발생했습니다: " + e.message);
+    }
+}
+
 document.addEventListener('DOMContentLoaded', () => {
+    const liveElement = document.getElementById('live-report');
+    if (liveElement) {
+        initLiveReport(liveElement);
+        initTabScrolling();
+        return;
+    }
+    const dataElement = document.getElementById('report-data');
+    if (dataElement) {
+        initDataReport(dataElement).catch(e => {
+            console.error(e);
+            alert("리포트 데이터를 불러오지 못했습니다: " + e.message);
+        });
+        initTabScrolling();
+        return;
+    }
     showTab(0);
     initSeoQaHandlers();
     initAltTableHandlers();
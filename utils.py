@@ -1,9 +1,12 @@
-import tkinter as tk # Add this line if log_output is used here
 import requests
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
 import re
 import json
+from datetime import date
+
+from audit_log import log_event
+from page_cache import fetch_document
+from page_rules import TRACK_TEXT, PageRule, is_hidden_style, register_rule
 
 def extract_brand_country_and_lancode(url):
     brand_mapping = {"sulwhasoo": "SWS", "laneige": "LNG", "hera": "HERA", "aestura": "AES"}
@@ -32,34 +35,63 @@ def extract_brand_country_and_lancode(url):
 
     return brand, country, lan
 
+def build_report_filename(ticket_name, url, today=None):
+    """리포트 파일 이름: SEO-audit_Report_{티켓}_{브랜드}-{국가}[_{언어}]_{yymmdd}.html"""
+    today_date = (today or date.today()).strftime("%y%m%d")
+    brand, country, lan = extract_brand_country_and_lancode(url)
+    lan_suffix = f"_{lan}" if lan else ""
+    return f"SEO-audit_Report_{ticket_name}_{brand}-{country}{lan_suffix}_{today_date}.html"
+
 def is_hidden(tag):
-    style = tag.get("style", "")
+    """BeautifulSoup 태그 자체(조상 제외)가 숨김 처리되어 있는지 여부"""
     cls = tag.get("class", [])
-    hidden_attr = tag.has_attr("hidden")
-    
-    return (
-        "display:none" in style.replace(" ", "").lower()
-        or "visibility:hidden" in style.replace(" ", "").lower()
-        or hidden_attr
-        or ("hidden" in cls if isinstance(cls, list) else False)
-    )
+    return is_hidden_style(tag.get("style", ""), cls if isinstance(cls, list) else [], tag.has_attr("hidden"))
+
+class AltSourceRule(PageRule):
+    """
+    보이는 <img>의 (src, alt)와 text/x-magento-init 스크립트 본문을 모으는 페이지 검사 규칙입니다.
+    이미지 자신뿐 아니라 조상 요소가 숨김 처리된 경우(display:none 등)도 보이지 않는 이미지로 제외합니다.
+    """
+
+    tags = ("img", "script")
+
+    def __init__(self):
+        self.images = []
+        self.gallery_scripts = []
+
+    def start(self, tag, values, hidden):
+        if tag == "img":
+            if not hidden:
+                self.images.append((values.get("data-amsrc") or values.get("src", ""), values.get("alt", "")))
+        elif values.get("type") == "text/x-magento-init":
+            return TRACK_TEXT
+        return None
+
+    def end(self, tag, text):
+        self.gallery_scripts.append(text)
+
+    def result(self):
+        return self.images, self.gallery_scripts
+
+register_rule("alt_sources", AltSourceRule)
+
+def extract_alt_sources(document):
+    """
+    페이지에서 보이는 이미지의 (src, alt) 목록과 text/x-magento-init 스크립트 본문 목록을 반환합니다.
+    다른 검사와 같은 한 번의 문서 순회(page_rules) 결과를 사용합니다.
+    """
+    return document.rule_result("alt_sources")
 
 def collect_alt_texts(url, log_output):
     alt_data_for_url = []
     page_seen_images = set()
 
     try:
-        res = requests.get(url, timeout=10)
-        res.encoding = 'utf-8'
-        soup = BeautifulSoup(res.text, "html.parser")
-        if log_output:
-            log_output.insert(tk.END, f"[INFO] Collecting Alt Texts for: {url}\n")
-            log_output.see(tk.END)
-
-        for img in soup.find_all("img"):
-            if is_hidden(img):
-                continue
-            raw_src = img.get("data-amsrc") or img.get("src", "")
+        # generate_metadata와 같은 다운로드 결과를 공유
+        images, gallery_scripts = extract_alt_sources(fetch_document(url))
+        log_event(log_output, "INFO", f"Collecting Alt Texts for: {url}")
+
+        for raw_src, alt in images:
             if not raw_src:
                 continue
             full_img_url = raw_src if raw_src.startswith("http") else urljoin(url, raw_src)
@@ -69,11 +101,10 @@ def collect_alt_texts(url, log_output):
             alt_data_for_url.append({
                 "Page URL": url,
                 "Image URL": full_img_url,
-                "Alt Text (AS-IS)": img.get("alt", "")
+                "Alt Text (AS-IS)": alt
             })
 
-        for script in soup.find_all("script", type="text/x-magento-init"):
-            txt = script.get_text()
+        for txt in gallery_scripts:
             try:
                 cfg = json.loads(txt)
             except json.JSONDecodeError:
@@ -95,12 +126,8 @@ def collect_alt_texts(url, log_output):
                         "Alt Text (AS-IS)": item.get("caption", "")
                     })
     except requests.exceptions.RequestException as e:
-        if log_output:
-            log_output.insert(tk.END, f"[ERROR] Failed to collect alt texts for {url}: {e}\n")
-            log_output.see(tk.END)
+        log_event(log_output, "ERROR", f"Failed to collect alt texts for {url}: {e}")
     except Exception as e:
-        if log_output:
-            log_output.insert(tk.END, f"[ERROR] An unexpected error occurred while collecting alt texts for {url}: {e}\n")
-            log_output.see(tk.END)
+        log_event(log_output, "ERROR", f"An unexpected error occurred while collecting alt texts for {url}: {e}")
     
     return alt_data_for_url
\ No newline at end of file